@@ -0,0 +1,71 @@
+"""
+Benchmark the per-request cost of resolving the settings, JWT manager and email sender dependencies.
+
+`rebuilt` constructs every object from scratch, as each request did before they became
+application-scoped singletons; `memoized` resolves them through the dependency getters.
+Run from the `src` directory:
+
+    python -m benchmarks.dependency_overhead --repeat 2000
+"""
+import argparse
+import os
+import statistics
+import time
+
+os.environ.setdefault("ENVIRONMENT", "testing")
+
+from config import get_settings, get_jwt_auth_manager, get_accounts_email_notificator  # noqa: E402
+from config.settings import TestingSettings  # noqa: E402
+from notifications import EmailSender  # noqa: E402
+from security.token_manager import JWTAuthManager  # noqa: E402
+
+
+def _rebuilt() -> None:
+    settings = TestingSettings()
+    JWTAuthManager(
+        secret_key_access=settings.SECRET_KEY_ACCESS,
+        secret_key_refresh=settings.SECRET_KEY_REFRESH,
+        algorithm=settings.JWT_SIGNING_ALGORITHM
+    )
+    EmailSender(
+        hostname=settings.EMAIL_HOST,
+        port=settings.EMAIL_PORT,
+        email=settings.EMAIL_HOST_USER,
+        password=settings.EMAIL_HOST_PASSWORD,
+        use_tls=settings.EMAIL_USE_TLS,
+        template_dir=settings.PATH_TO_EMAIL_TEMPLATES_DIR,
+        activation_email_template_name=settings.ACTIVATION_EMAIL_TEMPLATE_NAME,
+        activation_complete_email_template_name=settings.ACTIVATION_COMPLETE_EMAIL_TEMPLATE_NAME,
+        password_email_template_name=settings.PASSWORD_RESET_TEMPLATE_NAME,
+        password_complete_email_template_name=settings.PASSWORD_RESET_COMPLETE_TEMPLATE_NAME
+    )
+
+
+def _memoized() -> None:
+    settings = get_settings()
+    get_jwt_auth_manager(settings)
+    get_accounts_email_notificator(settings)
+
+
+def run(repeat: int) -> None:
+    print(f"{'mode':<10}{'mean us':>10}{'p95 us':>10}")
+    for name, resolve in (("rebuilt", _rebuilt), ("memoized", _memoized)):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            resolve()
+            timings.append((time.perf_counter() - start) * 1_000_000)
+        timings.sort()
+        p95 = timings[int(len(timings) * 0.95) - 1]
+        print(f"{name:<10}{statistics.mean(timings):>10.1f}{p95:>10.1f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=1000, help="How many requests are simulated")
+    args = parser.parse_args()
+    run(args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Benchmark the relationship loading strategies of the movie detail endpoint.
+
+Movies are taken from `test_data.csv` and given large crews, so the cartesian product of the
+`joined` strategy becomes visible. Run from the `src` directory:
+
+    python -m benchmarks.movie_detail_loading --actors 500 --repeat 20
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+os.environ.setdefault("ENVIRONMENT", "testing")
+
+import pandas as pd  # noqa: E402
+from sqlalchemy import event, insert  # noqa: E402
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from config import get_settings  # noqa: E402
+from database import (  # noqa: E402
+    Base,
+    MovieModel,
+    CountryModel,
+    GenreModel,
+    ActorModel,
+    LanguageModel,
+    MoviesGenresModel,
+    ActorsMoviesModel,
+    MoviesLanguagesModel
+)
+from database.loading import MovieDetailLoadingStrategyEnum, load_movie_detail  # noqa: E402
+from schemas import MovieDetailSchema  # noqa: E402
+
+
+async def _seed(session: AsyncSession, csv_path: str, actors: int, genres: int, languages: int) -> list[int]:
+    data = pd.read_csv(csv_path).drop_duplicates(subset=["names", "date_x"])
+
+    await session.execute(insert(CountryModel).values([{"code": "US"}]))
+    await session.execute(insert(GenreModel).values([{"name": f"Genre {i}"} for i in range(genres)]))
+    await session.execute(insert(ActorModel).values([{"name": f"Actor {i}"} for i in range(actors)]))
+    await session.execute(insert(LanguageModel).values([{"name": f"Language {i}"} for i in range(languages)]))
+
+    movies = [
+        {
+            "name": row.names,
+            "date": pd.to_datetime(row.date_x).date(),
+            "score": float(row.score),
+            "overview": row.overview,
+            "status": row.status.strip(),
+            "budget": float(row.budget_x),
+            "revenue": float(row.revenue),
+            "country_id": 1,
+        }
+        for row in data.itertuples()
+    ]
+    result = await session.execute(insert(MovieModel).returning(MovieModel.id), movies)
+    movie_ids = list(result.scalars().all())
+
+    for movie_id in movie_ids:
+        await session.execute(
+            insert(MoviesGenresModel),
+            [{"movie_id": movie_id, "genre_id": i + 1} for i in range(genres)]
+        )
+        await session.execute(
+            insert(ActorsMoviesModel),
+            [{"movie_id": movie_id, "actor_id": i + 1} for i in range(actors)]
+        )
+        await session.execute(
+            insert(MoviesLanguagesModel),
+            [{"movie_id": movie_id, "language_id": i + 1} for i in range(languages)]
+        )
+    await session.commit()
+    return movie_ids
+
+
+async def run(actors: int, genres: int, languages: int, repeat: int) -> None:
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    session_factory = sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)  # type: ignore
+
+    statements = []
+    event.listen(engine.sync_engine, "before_cursor_execute", lambda *args: statements.append(1))
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async with session_factory() as session:
+        movie_ids = await _seed(session, get_settings().PATH_TO_MOVIES_CSV, actors, genres, languages)
+
+    print(
+        f"{len(movie_ids)} movies, {genres} genres x {actors} actors x {languages} languages per movie "
+        f"({genres * actors * languages} joined rows vs {genres + actors + languages} selectin rows)"
+    )
+    print(f"{'strategy':<10}{'mean ms':>10}{'p95 ms':>10}{'stmts/req':>11}")
+
+    for strategy in MovieDetailLoadingStrategyEnum:
+        timings = []
+        statements.clear()
+        for _ in range(repeat):
+            for movie_id in movie_ids:
+                async with session_factory() as session:
+                    start = time.perf_counter()
+                    movie = await load_movie_detail(session, movie_id, strategy)
+                    MovieDetailSchema.model_validate(movie)
+                    timings.append((time.perf_counter() - start) * 1000)
+
+        timings.sort()
+        p95 = timings[int(len(timings) * 0.95) - 1]
+        print(
+            f"{strategy.value:<10}{statistics.mean(timings):>10.2f}{p95:>10.2f}"
+            f"{len(statements) / len(timings):>11.1f}"
+        )
+
+    await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--actors", type=int, default=300, help="Cast size per movie")
+    parser.add_argument("--genres", type=int, default=5, help="Genres per movie")
+    parser.add_argument("--languages", type=int, default=3, help="Languages per movie")
+    parser.add_argument("--repeat", type=int, default=5, help="How many times every movie is loaded")
+    args = parser.parse_args()
+    asyncio.run(run(args.actors, args.genres, args.languages, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
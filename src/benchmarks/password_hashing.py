@@ -0,0 +1,56 @@
+"""
+Benchmark the cost of the supported password hashing schemes.
+
+Reports the mean time of a single hash and verify call for bcrypt at several cost factors and,
+when argon2-cffi is installed, for argon2 with passlib's defaults. Run from the `src` directory:
+
+    python -m benchmarks.password_hashing --rounds 10 12 14 --repeat 5
+"""
+import argparse
+import statistics
+import time
+
+from passlib.context import CryptContext
+
+from security.passwords import build_password_context
+
+PASSWORD = "BenchmarkPassword123!"
+
+
+def _measure(context: CryptContext, repeat: int) -> tuple[float, float]:
+    hash_timings, verify_timings = [], []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        hashed_password = context.hash(PASSWORD)
+        hash_timings.append((time.perf_counter() - start) * 1000)
+
+        start = time.perf_counter()
+        context.verify(PASSWORD, hashed_password)
+        verify_timings.append((time.perf_counter() - start) * 1000)
+    return statistics.mean(hash_timings), statistics.mean(verify_timings)
+
+
+def run(rounds: list[int], repeat: int) -> None:
+    policies = [(f"bcrypt/{cost}", "bcrypt", cost) for cost in rounds]
+    try:
+        build_password_context("argon2")
+        policies.append(("argon2", "argon2", rounds[0]))
+    except ValueError:
+        print("argon2-cffi is not installed, skipping argon2")
+
+    print(f"{'scheme':<12}{'hash ms':>10}{'verify ms':>11}{'logins/s/core':>15}")
+    for label, schemes, cost in policies:
+        hash_ms, verify_ms = _measure(build_password_context(schemes, cost), repeat)
+        print(f"{label:<12}{hash_ms:>10.1f}{verify_ms:>11.1f}{1000 / verify_ms:>15.1f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, nargs="+", default=[10, 12, 14], help="bcrypt cost factors")
+    parser.add_argument("--repeat", type=int, default=3, help="How many times every scheme is measured")
+    args = parser.parse_args()
+    run(args.rounds, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
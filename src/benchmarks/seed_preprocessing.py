@@ -0,0 +1,129 @@
+"""
+Benchmark the CSV preprocessing stages of `CSVDatabaseSeeder` against the former row-by-row implementation.
+
+The movies of `test_data.csv` are repeated under unique names until the frame has `--rows` rows.
+The movie records and the association records are built both ways and compared; no database
+is needed. Run from the `src` directory:
+
+    python -m benchmarks.seed_preprocessing --rows 100000
+"""
+import argparse
+import os
+import tempfile
+import time
+from types import SimpleNamespace
+from typing import Callable, Dict, List, Tuple
+
+os.environ.setdefault("ENVIRONMENT", "testing")
+
+import pandas as pd  # noqa: E402
+
+from config import get_settings  # noqa: E402
+from database.populate import CSVDatabaseSeeder  # noqa: E402
+
+
+def _legacy_prepare_movies_data(data: pd.DataFrame, country_map: Dict[str, object]) -> List[Dict[str, object]]:
+    movies_data = []
+    for _, row in data.iterrows():
+        movies_data.append({
+            "name": row['names'],
+            "date": row['date_x'],
+            "score": float(row['score']),
+            "overview": row['overview'],
+            "status": row['status'],
+            "budget": float(row['budget_x']),
+            "revenue": float(row['revenue']),
+            "country_id": country_map[row['country']].id
+        })
+    return movies_data
+
+
+def _legacy_prepare_associations(
+        data: pd.DataFrame,
+        movie_ids: List[int],
+        genre_map: Dict[str, object],
+        actor_map: Dict[str, object],
+        language_map: Dict[str, object]
+) -> Tuple[List[Dict[str, int]], List[Dict[str, int]], List[Dict[str, int]]]:
+    movie_genres_data, movie_actors_data, movie_languages_data = [], [], []
+    for i, (_, row) in enumerate(data.iterrows()):
+        movie_id = movie_ids[i]
+        for genre_name in row['genre'].split(','):
+            if genre_name.strip():
+                movie_genres_data.append({"movie_id": movie_id, "genre_id": genre_map[genre_name.strip()].id})
+        for actor_name in row['crew'].split(','):
+            if actor_name.strip():
+                movie_actors_data.append({"movie_id": movie_id, "actor_id": actor_map[actor_name.strip()].id})
+        for lang_name in row['orig_lang'].split(','):
+            if lang_name.strip():
+                movie_languages_data.append({"movie_id": movie_id, "language_id": language_map[lang_name.strip()].id})
+    return movie_genres_data, movie_actors_data, movie_languages_data
+
+
+def _build_csv(path: str, rows: int) -> None:
+    sample = pd.read_csv(get_settings().PATH_TO_MOVIES_CSV)
+    repeats = -(-rows // len(sample))
+    data = pd.concat([sample] * repeats, ignore_index=True).head(rows)
+    data['names'] = data['names'] + " #" + data.index.astype(str)
+    data.to_csv(path, index=False)
+
+
+def _reference_map(values) -> Dict[str, object]:
+    return {value: SimpleNamespace(id=i) for i, value in enumerate(values, start=1)}
+
+
+def _timed(stage: Callable[[], object]) -> Tuple[object, float]:
+    start = time.perf_counter()
+    result = stage()
+    return result, time.perf_counter() - start
+
+
+def run(rows: int) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        csv_path = os.path.join(directory, "movies.csv")
+        _build_csv(csv_path, rows)
+
+        seeder = CSVDatabaseSeeder(csv_path, db_session=None)  # type: ignore[arg-type]
+        data = seeder._preprocess_csv()
+
+    split = CSVDatabaseSeeder._split_names
+    country_map = _reference_map(data['country'].unique())
+    genre_map = _reference_map(split(data['genre']).unique())
+    actor_map = _reference_map(split(data['crew']).unique())
+    language_map = _reference_map(split(data['orig_lang']).unique())
+    movie_ids = list(range(1, len(data) + 1))
+
+    stages = [
+        (
+            "movie records",
+            lambda: _legacy_prepare_movies_data(data, country_map),
+            lambda: seeder._prepare_movies_data(data, country_map),
+        ),
+        (
+            "associations",
+            lambda: _legacy_prepare_associations(data, movie_ids, genre_map, actor_map, language_map),
+            lambda: seeder._prepare_associations(data, movie_ids, genre_map, actor_map, language_map),
+        ),
+    ]
+
+    print(f"{len(data)} movies")
+    print(f"{'stage':<16}{'before rows/s':>16}{'after rows/s':>16}{'speedup':>10}")
+    for name, legacy, vectorized in stages:
+        legacy_result, legacy_seconds = _timed(legacy)
+        vectorized_result, vectorized_seconds = _timed(vectorized)
+        assert legacy_result == vectorized_result, f"{name} results differ"
+        print(
+            f"{name:<16}{len(data) / legacy_seconds:>16,.0f}{len(data) / vectorized_seconds:>16,.0f}"
+            f"{legacy_seconds / vectorized_seconds:>9.1f}x"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=50_000, help="Number of movies in the generated CSV")
+    args = parser.parse_args()
+    run(args.rows)
+
+
+if __name__ == "__main__":
+    main()
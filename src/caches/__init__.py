@@ -0,0 +1,9 @@
+from caches.interfaces import CacheInterface
+from caches.lru import LRUTTLCache
+from caches.memory import InMemoryCache
+from caches.redis import RedisCache
+from caches.counts import (
+    CountModeEnum,
+    CountTypeEnum,
+    RowCountProvider
+)
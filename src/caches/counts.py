@@ -0,0 +1,110 @@
+import enum
+from typing import Tuple
+
+from sqlalchemy import select, func, text, Table
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from caches.interfaces import CacheInterface
+
+
+class CountModeEnum(str, enum.Enum):
+    EXACT = "exact"
+    CACHED = "cached"
+    ESTIMATE = "estimate"
+
+
+class CountTypeEnum(str, enum.Enum):
+    EXACT = "exact"
+    CACHED = "cached"
+    ESTIMATED = "estimated"
+
+
+class RowCountProvider:
+    """
+    Provides row counts for list endpoints without running `COUNT(*)` on every request.
+
+    Exact counts are stored in the shared cache backend with a TTL, and write paths invalidate
+    them explicitly. On PostgreSQL the planner estimate from `pg_class.reltuples` can be used instead.
+    """
+
+    def __init__(self, cache: CacheInterface, ttl_seconds: int):
+        """
+        Initialize the provider.
+
+        Args:
+            cache (CacheInterface): The cache backend holding the counts.
+            ttl_seconds (int): How long an exact count stays valid. `0` disables caching.
+        """
+        self._cache = cache
+        self._ttl_seconds = ttl_seconds
+
+    @staticmethod
+    def _key(table: Table) -> str:
+        return f"counts:{table.name}"
+
+    async def count(
+            self,
+            db: AsyncSession,
+            table: Table,
+            mode: CountModeEnum = CountModeEnum.CACHED,
+            use_cached: bool = True,
+            store: bool = True
+    ) -> Tuple[int, CountTypeEnum]:
+        """
+        Return the number of rows in the table and how that number was obtained.
+
+        `ESTIMATE` falls back to the cached count when the database has no planner estimate
+        (SQLite, or a PostgreSQL table that has never been analyzed).
+
+        Args:
+            db (AsyncSession): The database session used for the query.
+            table (Table): The table to count.
+            mode (CountModeEnum): Requested counting mode.
+            use_cached (bool): Whether a cached count may be returned, e.g. `False` when the
+                client must read its own writes.
+            store (bool): Whether the exact count may be cached, e.g. `False` when it was read
+                from a replica that may lag behind the primary.
+
+        Returns:
+            Tuple[int, CountTypeEnum]: The row count and its type.
+        """
+        if mode == CountModeEnum.ESTIMATE:
+            estimate = await self._estimate(db, table)
+            if estimate is not None:
+                return estimate, CountTypeEnum.ESTIMATED
+            mode = CountModeEnum.CACHED
+
+        if mode == CountModeEnum.CACHED and use_cached and self._ttl_seconds > 0:
+            cached = await self._cache.get(self._key(table))
+            if cached is not None:
+                return int(cached), CountTypeEnum.CACHED
+
+        result = await db.execute(select(func.count()).select_from(table))
+        total = result.scalar() or 0
+
+        if store and self._ttl_seconds > 0:
+            await self._cache.set(self._key(table), str(total).encode(), self._ttl_seconds)
+        return total, CountTypeEnum.EXACT
+
+    async def invalidate(self, table: Table) -> None:
+        """
+        Drop the cached count of the table, e.g. after a row was inserted or deleted.
+
+        Args:
+            table (Table): The table whose count changed.
+        """
+        await self._cache.delete(self._key(table))
+
+    @staticmethod
+    async def _estimate(db: AsyncSession, table: Table) -> int | None:
+        if db.bind is None or db.bind.dialect.name != "postgresql":
+            return None
+
+        result = await db.execute(
+            text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table_name)"),
+            {"table_name": table.name}
+        )
+        estimate = result.scalar()
+        if estimate is None or estimate <= 0:
+            return None
+        return int(estimate)
@@ -0,0 +1,50 @@
+from abc import ABC, abstractmethod
+from typing import Dict, Optional
+
+
+class CacheInterface(ABC):
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[bytes]:
+        """
+        Return the cached value for the key, or None on a miss.
+
+        :param key: The cache key.
+        :return: The cached bytes or None.
+        """
+        pass
+
+    @abstractmethod
+    async def set(self, key: str, value: bytes, ttl_seconds: Optional[int] = None) -> None:
+        """
+        Store a value under the key.
+
+        :param key: The cache key.
+        :param value: The value to store.
+        :param ttl_seconds: Time to live of the entry; None uses the backend default.
+        """
+        pass
+
+    @abstractmethod
+    async def delete(self, *keys: str) -> None:
+        """
+        Invalidate the keys in this process and in every other worker sharing the cache.
+
+        :param keys: The cache keys to invalidate.
+        """
+        pass
+
+    @abstractmethod
+    def stats(self) -> Dict[str, int]:
+        """
+        Return the hit, miss, eviction and expiration counters of this worker.
+
+        :return: A dict with `hits`, `misses`, `evictions`, `expirations`, `size` and `max_size`.
+        """
+        pass
+
+    async def close(self) -> None:
+        """
+        Release connections and background tasks held by the cache.
+        """
+        return None
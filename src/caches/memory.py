@@ -0,0 +1,36 @@
+from typing import Dict, Optional
+
+from caches.interfaces import CacheInterface
+from caches.lru import LRUTTLCache
+
+
+class InMemoryCache(CacheInterface):
+    """
+    A process-local cache backend.
+
+    Suitable for a single worker and for local development; with several workers every process
+    holds its own copy, so use `RedisCache` there.
+    """
+
+    def __init__(self, max_size: int, default_ttl_seconds: int = 0):
+        """
+        Initialize the cache.
+
+        Args:
+            max_size (int): Maximum number of entries (0 disables the cache).
+            default_ttl_seconds (int): Default time to live of an entry (0 means no expiry).
+        """
+        self._entries = LRUTTLCache(max_size=max_size, ttl_seconds=default_ttl_seconds)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return self._entries.get(key)
+
+    async def set(self, key: str, value: bytes, ttl_seconds: Optional[int] = None) -> None:
+        self._entries.set(key, value, ttl_seconds)
+
+    async def delete(self, *keys: str) -> None:
+        for key in keys:
+            self._entries.delete(key)
+
+    def stats(self) -> Dict[str, int]:
+        return self._entries.stats()
@@ -0,0 +1,197 @@
+import asyncio
+import logging
+from typing import Dict, Optional
+
+from redis.asyncio import BlockingConnectionPool, ConnectionPool, Redis
+from redis.backoff import ExponentialBackoff
+from redis.exceptions import ConnectionError as RedisConnectionError, RedisError
+from redis.retry import Retry
+
+from caches.interfaces import CacheInterface
+from caches.lru import LRUTTLCache
+
+
+class RedisCache(CacheInterface):
+    """
+    A cache backend shared by all workers through a Redis server, using the `redis.asyncio` client.
+
+    Values live on the server, so every worker sees the same data. Each worker also keeps a small
+    near cache of recently read values; `delete` removes the keys on the server and publishes them
+    on an invalidation channel that every worker subscribes to, so the near caches of the other
+    workers are purged as well. The near cache is cleared whenever the subscription is
+    re-established, and its TTL bounds staleness if a message is lost.
+
+    Commands use RESP2 and run over a bounded, blocking connection pool. The client drops a connection whose
+    command failed, timed out or was cancelled, and retries a command once, after a short backoff,
+    if its pooled connection turned out to be broken.
+
+    Cache failures never fail a request: errors are logged and treated as misses.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        db: int = 0,
+        password: Optional[str] = None,
+        key_prefix: str = "theater",
+        default_ttl_seconds: int = 0,
+        local_max_size: int = 1024,
+        local_ttl_seconds: int = 5,
+        connect_timeout_seconds: float = 1.0,
+        command_timeout_seconds: float = 1.0,
+        pool_max_size: int = 8,
+    ):
+        """
+        Initialize the client. Connections are opened lazily on first use.
+
+        Args:
+            host (str): Server host.
+            port (int): Server port.
+            db (int): Logical database number.
+            password (Optional[str]): Password for AUTH, if required.
+            key_prefix (str): Namespace prepended to every key.
+            default_ttl_seconds (int): Default time to live of an entry (0 means no expiry).
+            local_max_size (int): Size of the per-worker near cache (0 disables it).
+            local_ttl_seconds (int): Time to live of near-cache entries.
+            connect_timeout_seconds (float): Timeout for opening a connection.
+            command_timeout_seconds (float): Timeout for a command's reply, and for waiting for a
+                free connection when all `pool_max_size` are in use.
+            pool_max_size (int): Maximum number of connections used for commands at once.
+        """
+        self._key_prefix = key_prefix
+        self._default_ttl_seconds = default_ttl_seconds
+        self._channel = f"{key_prefix}:cache:invalidate"
+        self._local_ttl_seconds = local_ttl_seconds
+
+        connection_options = dict(
+            host=host,
+            port=port,
+            db=db,
+            password=password,
+            socket_connect_timeout=connect_timeout_seconds,
+            retry=Retry(ExponentialBackoff(cap=1.0, base=0.05), retries=1, supported_errors=(RedisConnectionError,)),
+            protocol=2,
+        )
+        self._client = Redis(
+            connection_pool=BlockingConnectionPool(
+                max_connections=max(1, pool_max_size),
+                timeout=command_timeout_seconds,
+                socket_timeout=command_timeout_seconds,
+                **connection_options
+            )
+        )
+        # The subscription holds its connection for good, so it gets its own pool.
+        self._subscriber = Redis(connection_pool=ConnectionPool(max_connections=1, **connection_options))
+
+        self._local = LRUTTLCache(max_size=local_max_size, ttl_seconds=local_ttl_seconds)
+        self._hits = 0
+        self._misses = 0
+        self._listener: Optional[asyncio.Task] = None
+        self._subscribed = False
+
+    def _key(self, key: str) -> str:
+        return f"{self._key_prefix}:{key}"
+
+    def _ensure_listener(self) -> None:
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.get_running_loop().create_task(self._listen_for_invalidations())
+
+    async def _listen_for_invalidations(self) -> None:
+        """
+        Subscribe to the invalidation channel and purge the near cache for every published key.
+
+        The client resubscribes by itself after a dropped connection; messages published in between
+        are lost, so the near cache is cleared when a resubscription is confirmed. If reconnecting
+        fails, the near cache is cleared and the subscription is recreated with a capped backoff.
+        """
+        backoff = 0.1
+        while True:
+            pubsub = self._subscriber.pubsub()
+            try:
+                await pubsub.subscribe(self._channel)
+                async for message in pubsub.listen():
+                    if message["type"] == "subscribe":
+                        if self._subscribed:
+                            self._local.clear()
+                        self._subscribed = True
+                        backoff = 0.1
+                    elif message["type"] == "message":
+                        self._local.delete(message["data"].decode())
+            except (RedisError, OSError) as error:
+                logging.warning(f"Cache invalidation listener disconnected: {error}")
+                self._local.clear()
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 5.0)
+            finally:
+                await pubsub.aclose()
+
+    async def get(self, key: str) -> Optional[bytes]:
+        self._ensure_listener()
+
+        value = self._local.get(key)
+        if value is not None:
+            self._hits += 1
+            return value
+
+        try:
+            value = await self._client.get(self._key(key))
+        except RedisError as error:
+            logging.warning(f"Cache GET {key!r} failed: {error!r}")
+            value = None
+
+        if value is None:
+            self._misses += 1
+            return None
+
+        self._hits += 1
+        self._local.set(key, value)
+        return value
+
+    async def set(self, key: str, value: bytes, ttl_seconds: Optional[int] = None) -> None:
+        ttl_seconds = self._default_ttl_seconds if ttl_seconds is None else ttl_seconds
+
+        try:
+            await self._client.set(self._key(key), value, ex=ttl_seconds or None)
+        except RedisError as error:
+            logging.warning(f"Cache SET {key!r} failed: {error!r}")
+            return
+        self._local.set(key, value, min(ttl_seconds, self._local_ttl_seconds) if ttl_seconds else None)
+
+    async def delete(self, *keys: str) -> None:
+        if not keys:
+            return
+
+        for key in keys:
+            self._local.delete(key)
+
+        try:
+            async with self._client.pipeline(transaction=False) as pipeline:
+                pipeline.delete(*(self._key(key) for key in keys))
+                for key in keys:
+                    pipeline.publish(self._channel, key)
+                await pipeline.execute()
+        except RedisError as error:
+            logging.error(f"Cache invalidation of {keys!r} failed: {error!r}")
+
+    def stats(self) -> Dict[str, int]:
+        local_stats = self._local.stats()
+        return {
+            "hits": self._hits,
+            "misses": self._misses,
+            "evictions": local_stats["evictions"],
+            "expirations": local_stats["expirations"],
+            "size": local_stats["size"],
+            "max_size": local_stats["max_size"],
+        }
+
+    async def close(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+        await self._subscriber.aclose(close_connection_pool=True)
+        await self._client.aclose(close_connection_pool=True)
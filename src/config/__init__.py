@@ -3,5 +3,14 @@ from config.dependencies import (
     get_settings,
     get_jwt_auth_manager,
     get_accounts_email_notificator,
-    get_s3_storage_client
+    get_smtp_email_sender,
+    get_email_outbox_worker,
+    get_s3_storage_client,
+    get_cache,
+    get_movie_count_provider,
+    get_password_hasher,
+    get_avatar_pipeline,
+    init_dependencies,
+    close_dependencies,
+    reload_dependencies
 )
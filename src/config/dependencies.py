@@ -1,14 +1,47 @@
+import asyncio
 import os
+from functools import lru_cache, wraps
+from typing import TYPE_CHECKING, Callable, List, Set, Tuple, TypeVar
 
 from fastapi import Depends
 
+from caches import CacheInterface, InMemoryCache, RedisCache, RowCountProvider
 from config.settings import TestingSettings, Settings, BaseAppSettings
 from notifications import EmailSenderInterface, EmailSender
-from security.interfaces import JWTAuthManagerInterface
+from security.hashing import PasswordHasher
+from security.interfaces import JWTAuthManagerInterface, PasswordHasherInterface
 from security.token_manager import JWTAuthManager
-from storages import S3StorageInterface, S3StorageClient
+from storages import AvatarPipeline, S3StorageInterface, S3StorageClient
 
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncEngine
 
+    from notifications.outbox import EmailOutboxWorker
+
+T = TypeVar("T")
+
+_built_services: List[object] = []
+_draining: Set[asyncio.Task] = set()
+
+
+def _application_scoped(factory: Callable[..., T]) -> Callable[..., T]:
+    """
+    Cache a service factory like `lru_cache` and record every instance it builds.
+
+    `close_dependencies` releases exactly the recorded instances, so a service that was never
+    used is not built only to be torn down.
+    """
+    @lru_cache
+    @wraps(factory)
+    def build(*args) -> T:
+        service = factory(*args)
+        _built_services.append(service)
+        return service
+
+    return build
+
+
+@lru_cache
 def get_settings() -> BaseAppSettings:
     """
     Retrieve the application settings based on the current environment.
@@ -17,6 +50,8 @@ def get_settings() -> BaseAppSettings:
     and returns a corresponding settings instance. If the environment is 'testing', it returns an instance
     of TestingSettings; otherwise, it returns an instance of Settings.
 
+    The instance is built once per process; use `reload_dependencies` to re-read the environment.
+
     Returns:
         BaseAppSettings: The settings instance appropriate for the current environment.
     """
@@ -26,6 +61,15 @@ def get_settings() -> BaseAppSettings:
     return Settings()
 
 
+@lru_cache
+def _get_jwt_auth_manager(secret_key_access: str, secret_key_refresh: str, algorithm: str) -> JWTAuthManagerInterface:
+    return JWTAuthManager(
+        secret_key_access=secret_key_access,
+        secret_key_refresh=secret_key_refresh,
+        algorithm=algorithm
+    )
+
+
 def get_jwt_auth_manager(settings: BaseAppSettings = Depends(get_settings)) -> JWTAuthManagerInterface:
     """
     Create and return a JWT authentication manager instance.
@@ -40,43 +84,174 @@ def get_jwt_auth_manager(settings: BaseAppSettings = Depends(get_settings)) -> J
 
     Returns:
         JWTAuthManagerInterface: An instance of JWTAuthManager configured with
-        the appropriate secret keys and algorithm.
+        the appropriate secret keys and algorithm, shared by all requests.
     """
-    return JWTAuthManager(
-        secret_key_access=settings.SECRET_KEY_ACCESS,
-        secret_key_refresh=settings.SECRET_KEY_REFRESH,
-        algorithm=settings.JWT_SIGNING_ALGORITHM
+    return _get_jwt_auth_manager(
+        settings.SECRET_KEY_ACCESS,
+        settings.SECRET_KEY_REFRESH,
+        settings.JWT_SIGNING_ALGORITHM
     )
 
 
-def get_accounts_email_notificator(
+@_application_scoped
+def _get_email_sender(
+    hostname: str,
+    port: int,
+    email: str,
+    password: str,
+    use_tls: bool,
+    template_dir: str,
+    activation_email_template_name: str,
+    activation_complete_email_template_name: str,
+    password_email_template_name: str,
+    password_complete_email_template_name: str,
+    pool_max_size: int,
+    pool_idle_timeout_seconds: int,
+    template_bytecode_cache_dir: str
+) -> EmailSenderInterface:
+    return EmailSender(
+        hostname=hostname,
+        port=port,
+        email=email,
+        password=password,
+        use_tls=use_tls,
+        template_dir=template_dir,
+        activation_email_template_name=activation_email_template_name,
+        activation_complete_email_template_name=activation_complete_email_template_name,
+        password_email_template_name=password_email_template_name,
+        password_complete_email_template_name=password_complete_email_template_name,
+        pool_max_size=pool_max_size,
+        pool_idle_timeout_seconds=pool_idle_timeout_seconds,
+        template_bytecode_cache_dir=template_bytecode_cache_dir or None
+    )
+
+
+def get_smtp_email_sender(
     settings: BaseAppSettings = Depends(get_settings)
 ) -> EmailSenderInterface:
     """
-    Retrieve an instance of the EmailSenderInterface configured with the application settings.
+    Retrieve an instance of the EmailSenderInterface that delivers messages over SMTP.
 
     This function creates an EmailSender using the provided settings, which include details such as the email host,
     port, credentials, TLS usage, and the directory and filenames for email templates. This allows the application
-    to send various email notifications (e.g., activation, password reset) as required.
+    to send various email notifications (e.g., activation, password reset) as required. The sender keeps up to
+    `EMAIL_POOL_MAX_SIZE` SMTP connections open for `EMAIL_POOL_IDLE_TIMEOUT_SECONDS` between messages.
+    The templates are compiled once, optionally through the `EMAIL_TEMPLATES_BYTECODE_CACHE_DIR` cache.
 
     Args:
         settings (BaseAppSettings, optional): The application settings,
         provided via dependency injection from `get_settings`.
 
     Returns:
-        EmailSenderInterface: An instance of EmailSender configured with the appropriate email settings.
+        EmailSenderInterface: An instance of EmailSender configured with the appropriate email settings,
+        shared by all requests.
     """
-    return EmailSender(
-        hostname=settings.EMAIL_HOST,
-        port=settings.EMAIL_PORT,
-        email=settings.EMAIL_HOST_USER,
-        password=settings.EMAIL_HOST_PASSWORD,
-        use_tls=settings.EMAIL_USE_TLS,
-        template_dir=settings.PATH_TO_EMAIL_TEMPLATES_DIR,
-        activation_email_template_name=settings.ACTIVATION_EMAIL_TEMPLATE_NAME,
-        activation_complete_email_template_name=settings.ACTIVATION_COMPLETE_EMAIL_TEMPLATE_NAME,
-        password_email_template_name=settings.PASSWORD_RESET_TEMPLATE_NAME,
-        password_complete_email_template_name=settings.PASSWORD_RESET_COMPLETE_TEMPLATE_NAME
+    return _get_email_sender(
+        settings.EMAIL_HOST,
+        settings.EMAIL_PORT,
+        settings.EMAIL_HOST_USER,
+        settings.EMAIL_HOST_PASSWORD,
+        settings.EMAIL_USE_TLS,
+        settings.PATH_TO_EMAIL_TEMPLATES_DIR,
+        settings.ACTIVATION_EMAIL_TEMPLATE_NAME,
+        settings.ACTIVATION_COMPLETE_EMAIL_TEMPLATE_NAME,
+        settings.PASSWORD_RESET_TEMPLATE_NAME,
+        settings.PASSWORD_RESET_COMPLETE_TEMPLATE_NAME,
+        settings.EMAIL_POOL_MAX_SIZE,
+        settings.EMAIL_POOL_IDLE_TIMEOUT_SECONDS,
+        settings.EMAIL_TEMPLATES_BYTECODE_CACHE_DIR
+    )
+
+
+def get_accounts_email_notificator(
+    settings: BaseAppSettings = Depends(get_settings)
+) -> EmailSenderInterface:
+    """
+    Retrieve the sender that delivers the account emails sent without the outbox.
+
+    With `EMAIL_OUTBOX_ENABLED` the account endpoints store their emails in the email outbox
+    within their own transaction instead (see `routes.accounts.get_account_email_sender`).
+
+    Args:
+        settings (BaseAppSettings, optional): The application settings,
+        provided via dependency injection from `get_settings`.
+
+    Returns:
+        EmailSenderInterface: The SMTP sender, shared by all requests.
+    """
+    return get_smtp_email_sender(settings)
+
+
+@_application_scoped
+def _get_email_outbox_worker(
+    sender: EmailSenderInterface,
+    batch_size: int,
+    poll_interval_seconds: float,
+    max_attempts: int,
+    retry_backoff_seconds: float,
+    lease_seconds: float
+) -> "EmailOutboxWorker":
+    from database import get_db_contextmanager
+    from notifications.outbox import EmailOutboxWorker
+
+    return EmailOutboxWorker(
+        sender=sender,
+        session_factory=get_db_contextmanager,
+        batch_size=batch_size,
+        poll_interval_seconds=poll_interval_seconds,
+        max_attempts=max_attempts,
+        retry_backoff_seconds=retry_backoff_seconds,
+        lease_seconds=lease_seconds
+    )
+
+
+def get_email_outbox_worker(settings: BaseAppSettings = Depends(get_settings)) -> "EmailOutboxWorker":
+    """
+    Retrieve the worker that delivers the email outbox over the pooled SMTP sender.
+
+    Args:
+        settings (BaseAppSettings, optional): The application settings,
+        provided via dependency injection from `get_settings`.
+
+    Returns:
+        EmailOutboxWorker: The process-wide outbox worker.
+    """
+    return _get_email_outbox_worker(
+        get_smtp_email_sender(settings),
+        settings.EMAIL_OUTBOX_BATCH_SIZE,
+        settings.EMAIL_OUTBOX_POLL_INTERVAL_SECONDS,
+        settings.EMAIL_OUTBOX_MAX_ATTEMPTS,
+        settings.EMAIL_OUTBOX_RETRY_BACKOFF_SECONDS,
+        settings.EMAIL_OUTBOX_LEASE_SECONDS
+    )
+
+
+@_application_scoped
+def _get_s3_storage_client(
+    endpoint_url: str,
+    access_key: str,
+    secret_key: str,
+    bucket_name: str,
+    max_pool_connections: int,
+    keepalive_timeout_seconds: int,
+    multipart_threshold: int,
+    multipart_part_size: int,
+    public_endpoint_url: str,
+    presigned_get_expires_in: int,
+    presigned_get_cache_size: int
+) -> S3StorageClient:
+    return S3StorageClient(
+        endpoint_url=endpoint_url,
+        access_key=access_key,
+        secret_key=secret_key,
+        bucket_name=bucket_name,
+        max_pool_connections=max_pool_connections,
+        keepalive_timeout_seconds=keepalive_timeout_seconds,
+        multipart_threshold=multipart_threshold,
+        multipart_part_size=multipart_part_size,
+        public_endpoint_url=public_endpoint_url or None,
+        presigned_get_expires_in=presigned_get_expires_in,
+        presigned_get_cache_size=presigned_get_cache_size
     )
 
 
@@ -88,7 +263,9 @@ def get_s3_storage_client(
 
     This function instantiates an S3StorageClient using the provided settings, which include the S3 endpoint URL,
     access credentials, and the bucket name. The returned client can be used to interact with an S3-compatible
-    storage service for file uploads and URL generation.
+    storage service for file uploads and URL generation. It is shared by all requests and keeps up to
+    `S3_MAX_POOL_CONNECTIONS` connections alive for `S3_KEEPALIVE_TIMEOUT_SECONDS`. With
+    `S3_PRESIGNED_GET_EXPIRE_SECONDS` set, file URLs are presigned GET URLs, memoized per file.
 
     Args:
         settings (BaseAppSettings, optional): The application settings,
@@ -97,9 +274,277 @@ def get_s3_storage_client(
     Returns:
         S3StorageInterface: An instance of S3StorageClient configured with the appropriate S3 storage settings.
     """
-    return S3StorageClient(
-        endpoint_url=settings.S3_STORAGE_ENDPOINT,
-        access_key=settings.S3_STORAGE_ACCESS_KEY,
-        secret_key=settings.S3_STORAGE_SECRET_KEY,
-        bucket_name=settings.S3_BUCKET_NAME
+    return _get_s3_storage_client(
+        settings.S3_STORAGE_ENDPOINT,
+        settings.S3_STORAGE_ACCESS_KEY,
+        settings.S3_STORAGE_SECRET_KEY,
+        settings.S3_BUCKET_NAME,
+        settings.S3_MAX_POOL_CONNECTIONS,
+        settings.S3_KEEPALIVE_TIMEOUT_SECONDS,
+        settings.S3_MULTIPART_THRESHOLD_BYTES,
+        settings.S3_MULTIPART_PART_SIZE_BYTES,
+        settings.S3_STORAGE_PUBLIC_ENDPOINT,
+        settings.S3_PRESIGNED_GET_EXPIRE_SECONDS,
+        settings.S3_PRESIGNED_GET_CACHE_SIZE
+    )
+
+
+@_application_scoped
+def _get_cache(
+    backend: str,
+    max_size: int,
+    key_prefix: str,
+    redis_host: str,
+    redis_port: int,
+    redis_db: int,
+    redis_password: str,
+    local_ttl_seconds: int,
+    redis_pool_max_size: int,
+    redis_command_timeout_seconds: float
+) -> CacheInterface:
+    if backend == "redis":
+        return RedisCache(
+            host=redis_host,
+            port=redis_port,
+            db=redis_db,
+            password=redis_password or None,
+            key_prefix=key_prefix,
+            local_max_size=max_size,
+            local_ttl_seconds=local_ttl_seconds,
+            command_timeout_seconds=redis_command_timeout_seconds,
+            pool_max_size=redis_pool_max_size
+        )
+    return InMemoryCache(max_size=max_size)
+
+
+def get_cache(settings: BaseAppSettings = Depends(get_settings)) -> CacheInterface:
+    """
+    Retrieve the process-wide cache backend selected by `CACHE_BACKEND`.
+
+    `memory` keeps entries in this worker only (bounded by `CACHE_MAX_SIZE`); `redis` stores them
+    on a Redis server shared by all workers, keeps a near cache of `CACHE_MAX_SIZE`
+    entries per worker and broadcasts invalidations to the other workers.
+
+    Args:
+        settings (BaseAppSettings, optional): The application settings,
+        provided via dependency injection from `get_settings`.
+
+    Returns:
+        CacheInterface: The shared cache backend.
+    """
+    return _get_cache(
+        settings.CACHE_BACKEND,
+        settings.CACHE_MAX_SIZE,
+        settings.CACHE_KEY_PREFIX,
+        settings.REDIS_HOST,
+        settings.REDIS_PORT,
+        settings.REDIS_DB,
+        settings.REDIS_PASSWORD,
+        settings.CACHE_LOCAL_TTL_SECONDS,
+        settings.REDIS_POOL_MAX_SIZE,
+        settings.REDIS_COMMAND_TIMEOUT_SECONDS
+    )
+
+
+def get_movie_count_provider(
+    settings: BaseAppSettings = Depends(get_settings),
+    cache: CacheInterface = Depends(get_cache)
+) -> RowCountProvider:
+    """
+    Retrieve the row count provider used by the movie list endpoint.
+
+    Exact counts are stored in the shared cache for `MOVIE_COUNT_CACHE_TTL_SECONDS`.
+
+    Args:
+        settings (BaseAppSettings, optional): The application settings,
+        provided via dependency injection from `get_settings`.
+        cache (CacheInterface, optional): The cache backend, provided via `get_cache`.
+
+    Returns:
+        RowCountProvider: A row count provider backed by the shared cache.
+    """
+    return RowCountProvider(cache=cache, ttl_seconds=settings.MOVIE_COUNT_CACHE_TTL_SECONDS)
+
+
+@_application_scoped
+def _get_password_hasher(
+    executor: str,
+    max_workers: int,
+    max_queue_size: int,
+    schemes: str,
+    bcrypt_rounds: int
+) -> PasswordHasherInterface:
+    return PasswordHasher(
+        max_workers=max_workers,
+        max_queue_size=max_queue_size,
+        executor=executor,
+        schemes=schemes,
+        bcrypt_rounds=bcrypt_rounds
+    )
+
+
+def get_password_hasher(settings: BaseAppSettings = Depends(get_settings)) -> PasswordHasherInterface:
+    """
+    Retrieve the process-wide password hashing service.
+
+    Hashing and verification run in a `PASSWORD_HASHER_EXECUTOR` pool of `PASSWORD_HASHER_MAX_WORKERS`
+    workers, with at most `PASSWORD_HASHER_MAX_QUEUE_SIZE` jobs waiting for a free worker. New hashes
+    use the first of `PASSWORD_HASH_SCHEMES` and, for bcrypt, a cost of `PASSWORD_BCRYPT_ROUNDS`.
+
+    Args:
+        settings (BaseAppSettings, optional): The application settings,
+        provided via dependency injection from `get_settings`.
+
+    Returns:
+        PasswordHasherInterface: The shared password hasher.
+    """
+    return _get_password_hasher(
+        settings.PASSWORD_HASHER_EXECUTOR,
+        settings.PASSWORD_HASHER_MAX_WORKERS,
+        settings.PASSWORD_HASHER_MAX_QUEUE_SIZE,
+        settings.PASSWORD_HASH_SCHEMES,
+        settings.PASSWORD_BCRYPT_ROUNDS
+    )
+
+
+@_application_scoped
+def _get_avatar_pipeline(
+    max_workers: int,
+    max_pixels: int,
+    normalize: bool,
+    full_size: int,
+    thumbnail_size: int,
+    jpeg_quality: int
+) -> AvatarPipeline:
+    return AvatarPipeline(
+        max_workers=max_workers,
+        max_pixels=max_pixels,
+        variants=(("full", full_size), ("thumbnail", thumbnail_size)),
+        normalize=normalize,
+        jpeg_quality=jpeg_quality
+    )
+
+
+def get_avatar_pipeline(settings: BaseAppSettings = Depends(get_settings)) -> AvatarPipeline:
+    """
+    Retrieve the process-wide avatar pipeline.
+
+    Avatars are checked against `AVATAR_MAX_PIXELS` and, if `AVATAR_NORMALIZE` is set, re-encoded
+    at `AVATAR_FULL_SIZE` and `AVATAR_THUMBNAIL_SIZE` in a pool of `AVATAR_PIPELINE_MAX_WORKERS` threads.
+
+    Args:
+        settings (BaseAppSettings, optional): The application settings,
+        provided via dependency injection from `get_settings`.
+
+    Returns:
+        AvatarPipeline: The shared avatar pipeline.
+    """
+    return _get_avatar_pipeline(
+        settings.AVATAR_PIPELINE_MAX_WORKERS,
+        settings.AVATAR_MAX_PIXELS,
+        settings.AVATAR_NORMALIZE,
+        settings.AVATAR_FULL_SIZE,
+        settings.AVATAR_THUMBNAIL_SIZE,
+        settings.AVATAR_JPEG_QUALITY
+    )
+
+
+async def init_dependencies() -> None:
+    """
+    Build the settings and the application-scoped services up front.
+
+    Called from the application lifespan so the first request does not pay for their construction,
+    nor the first email for pre-rendering its template. Every getter also builds its singleton lazily,
+    so the application works without a lifespan.
+    """
+    from database import get_db_engine
+
+    settings = get_settings()
+    get_db_engine()
+    get_jwt_auth_manager(settings)
+    email_sender = get_smtp_email_sender(settings)
+    if isinstance(email_sender, EmailSender):
+        await email_sender.prepare_templates()
+    get_cache(settings)
+    get_password_hasher(settings)
+    get_avatar_pipeline(settings)
+    await get_s3_storage_client(settings).open()
+    if settings.EMAIL_OUTBOX_ENABLED:
+        get_email_outbox_worker(settings).start()
+
+
+def _detach_dependencies() -> Tuple[List[object], List["AsyncEngine"]]:
+    from database import detach_db_engine
+
+    services = list(reversed(_built_services))
+    _built_services.clear()
+    for factory in (
+        _get_jwt_auth_manager,
+        _get_email_sender,
+        _get_email_outbox_worker,
+        _get_s3_storage_client,
+        _get_cache,
+        _get_password_hasher,
+        _get_avatar_pipeline,
+        get_settings
+    ):
+        factory.cache_clear()
+    return services, detach_db_engine()
+
+
+async def _release(services: List[object], engines: List["AsyncEngine"], wait: bool) -> None:
+    from notifications.outbox import EmailOutboxWorker
+
+    for service in services:
+        if isinstance(service, EmailOutboxWorker):
+            await service.stop()
+        elif isinstance(service, (PasswordHasher, AvatarPipeline)):
+            await asyncio.to_thread(service.shutdown, wait)
+        else:
+            await service.close()
+    for engine in engines:
+        await engine.dispose()
+
+
+async def _drain(services: List[object], engines: List["AsyncEngine"], grace_seconds: float) -> None:
+    try:
+        await asyncio.sleep(grace_seconds)
+    finally:
+        await _release(services, engines, wait=True)
+
+
+async def close_dependencies() -> None:
+    """
+    Release the resources held by the application-scoped services that were built and forget all singletons.
+
+    Services still draining after a reload are released right away.
+    """
+    for task in list(_draining):
+        task.cancel()
+    await asyncio.gather(*_draining, return_exceptions=True)
+    await _release(*_detach_dependencies(), wait=False)
+
+
+async def reload_dependencies() -> None:
+    """
+    Re-read the settings from the environment and rebuild the application-scoped services.
+
+    The new services are in place before the old ones are released. Requests already holding an
+    old service keep using it: the old outbox worker is stopped at once, but the other services
+    are released `DEPENDENCIES_RELOAD_GRACE_SECONDS` later, in the background, letting their
+    queued jobs finish.
+    """
+    from notifications.outbox import EmailOutboxWorker
+
+    services, engines = _detach_dependencies()
+    await init_dependencies()
+
+    for service in services:
+        if isinstance(service, EmailOutboxWorker):
+            await service.stop()
+
+    task = asyncio.get_running_loop().create_task(
+        _drain(services, engines, get_settings().DEPENDENCIES_RELOAD_GRACE_SECONDS)
     )
+    _draining.add(task)
+    task.add_done_callback(_draining.discard)
@@ -9,14 +9,43 @@ class BaseAppSettings(BaseSettings):
     BASE_DIR: Path = Path(__file__).parent.parent
     PATH_TO_DB: str = str(BASE_DIR / "database" / "source" / "theater.db")
     PATH_TO_MOVIES_CSV: str = str(BASE_DIR / "database" / "seed_data" / "imdb_movies.csv")
+    MOVIES_CSV_CHUNK_SIZE: int = int(os.getenv("MOVIES_CSV_CHUNK_SIZE", 0))
+    MOVIES_CSV_INCREMENTAL: bool = os.getenv("MOVIES_CSV_INCREMENTAL", "False").lower() == "true"
 
     PATH_TO_EMAIL_TEMPLATES_DIR: str = str(BASE_DIR / "notifications" / "templates")
     ACTIVATION_EMAIL_TEMPLATE_NAME: str = "activation_request.html"
     ACTIVATION_COMPLETE_EMAIL_TEMPLATE_NAME: str = "activation_complete.html"
     PASSWORD_RESET_TEMPLATE_NAME: str = "password_reset_request.html"
     PASSWORD_RESET_COMPLETE_TEMPLATE_NAME: str = "password_reset_complete.html"
+    EMAIL_TEMPLATES_BYTECODE_CACHE_DIR: str = os.getenv("EMAIL_TEMPLATES_BYTECODE_CACHE_DIR", "")
 
     LOGIN_TIME_DAYS: int = 7
+    ACCOUNTS_BASE_URL: str = os.getenv("ACCOUNTS_BASE_URL", "http://127.0.0.1:8000/api/v1/accounts")
+
+    PASSWORD_HASH_SCHEMES: str = os.getenv("PASSWORD_HASH_SCHEMES", "bcrypt")
+    PASSWORD_BCRYPT_ROUNDS: int = int(os.getenv("PASSWORD_BCRYPT_ROUNDS", 14))
+    PASSWORD_HASHER_EXECUTOR: str = os.getenv("PASSWORD_HASHER_EXECUTOR", "thread")
+    PASSWORD_HASHER_MAX_WORKERS: int = int(os.getenv("PASSWORD_HASHER_MAX_WORKERS", os.cpu_count() or 1))
+    PASSWORD_HASHER_MAX_QUEUE_SIZE: int = int(os.getenv("PASSWORD_HASHER_MAX_QUEUE_SIZE", 32))
+
+    DEPENDENCIES_RELOAD_GRACE_SECONDS: float = float(os.getenv("DEPENDENCIES_RELOAD_GRACE_SECONDS", 30))
+
+    DATABASE_READ_YOUR_WRITES_SECONDS: float = float(os.getenv("DATABASE_READ_YOUR_WRITES_SECONDS", 5))
+
+    MOVIE_COUNT_CACHE_TTL_SECONDS: int = int(os.getenv("MOVIE_COUNT_CACHE_TTL_SECONDS", 30))
+    MOVIE_DETAIL_LOADING_STRATEGY: str = os.getenv("MOVIE_DETAIL_LOADING_STRATEGY", "selectin")
+    MOVIE_DETAIL_CACHE_TTL_SECONDS: int = int(os.getenv("MOVIE_DETAIL_CACHE_TTL_SECONDS", 60))
+
+    CACHE_BACKEND: str = os.getenv("CACHE_BACKEND", "memory")
+    CACHE_MAX_SIZE: int = int(os.getenv("CACHE_MAX_SIZE", 1024))
+    CACHE_LOCAL_TTL_SECONDS: int = int(os.getenv("CACHE_LOCAL_TTL_SECONDS", 5))
+    CACHE_KEY_PREFIX: str = os.getenv("CACHE_KEY_PREFIX", "theater")
+    REDIS_HOST: str = os.getenv("REDIS_HOST", "redis-theater")
+    REDIS_PORT: int = int(os.getenv("REDIS_PORT", 6379))
+    REDIS_DB: int = int(os.getenv("REDIS_DB", 0))
+    REDIS_PASSWORD: str = os.getenv("REDIS_PASSWORD", "")
+    REDIS_POOL_MAX_SIZE: int = int(os.getenv("REDIS_POOL_MAX_SIZE", 8))
+    REDIS_COMMAND_TIMEOUT_SECONDS: float = float(os.getenv("REDIS_COMMAND_TIMEOUT_SECONDS", 1))
 
     EMAIL_HOST: str = os.getenv("EMAIL_HOST", "host")
     EMAIL_PORT: int = int(os.getenv("EMAIL_PORT", 25))
@@ -24,12 +53,35 @@ class BaseAppSettings(BaseSettings):
     EMAIL_HOST_PASSWORD: str = os.getenv("EMAIL_HOST_PASSWORD", "test_password")
     EMAIL_USE_TLS: bool = os.getenv("EMAIL_USE_TLS", "False").lower() == "true"
     MAILHOG_API_PORT: int = os.getenv("MAILHOG_API_PORT", 8025)
+    EMAIL_POOL_MAX_SIZE: int = int(os.getenv("EMAIL_POOL_MAX_SIZE", 4))
+    EMAIL_POOL_IDLE_TIMEOUT_SECONDS: int = int(os.getenv("EMAIL_POOL_IDLE_TIMEOUT_SECONDS", 30))
+    EMAIL_OUTBOX_ENABLED: bool = os.getenv("EMAIL_OUTBOX_ENABLED", "True").lower() == "true"
+    EMAIL_OUTBOX_BATCH_SIZE: int = int(os.getenv("EMAIL_OUTBOX_BATCH_SIZE", 50))
+    EMAIL_OUTBOX_POLL_INTERVAL_SECONDS: float = float(os.getenv("EMAIL_OUTBOX_POLL_INTERVAL_SECONDS", 1))
+    EMAIL_OUTBOX_MAX_ATTEMPTS: int = int(os.getenv("EMAIL_OUTBOX_MAX_ATTEMPTS", 5))
+    EMAIL_OUTBOX_RETRY_BACKOFF_SECONDS: float = float(os.getenv("EMAIL_OUTBOX_RETRY_BACKOFF_SECONDS", 5))
+    EMAIL_OUTBOX_LEASE_SECONDS: float = float(os.getenv("EMAIL_OUTBOX_LEASE_SECONDS", 60))
 
     S3_STORAGE_HOST: str = os.getenv("MINIO_HOST", "minio-theater")
     S3_STORAGE_PORT: int = os.getenv("MINIO_PORT", 9000)
     S3_STORAGE_ACCESS_KEY: str = os.getenv("MINIO_ROOT_USER", "minioadmin")
     S3_STORAGE_SECRET_KEY: str = os.getenv("MINIO_ROOT_PASSWORD", "some_password")
     S3_BUCKET_NAME: str = os.getenv("MINIO_STORAGE", "theater-storage")
+    S3_STORAGE_PUBLIC_ENDPOINT: str = os.getenv("MINIO_PUBLIC_ENDPOINT", "")
+    S3_PRESIGNED_GET_EXPIRE_SECONDS: int = int(os.getenv("S3_PRESIGNED_GET_EXPIRE_SECONDS", 0))
+    S3_PRESIGNED_GET_CACHE_SIZE: int = int(os.getenv("S3_PRESIGNED_GET_CACHE_SIZE", 10_000))
+    S3_MAX_POOL_CONNECTIONS: int = int(os.getenv("S3_MAX_POOL_CONNECTIONS", 10))
+    S3_KEEPALIVE_TIMEOUT_SECONDS: int = int(os.getenv("S3_KEEPALIVE_TIMEOUT_SECONDS", 15))
+    S3_MULTIPART_THRESHOLD_BYTES: int = int(os.getenv("S3_MULTIPART_THRESHOLD_BYTES", 8 * 1024 * 1024))
+    S3_MULTIPART_PART_SIZE_BYTES: int = int(os.getenv("S3_MULTIPART_PART_SIZE_BYTES", 8 * 1024 * 1024))
+
+    AVATAR_PIPELINE_MAX_WORKERS: int = int(os.getenv("AVATAR_PIPELINE_MAX_WORKERS", 2))
+    AVATAR_MAX_PIXELS: int = int(os.getenv("AVATAR_MAX_PIXELS", 4096 * 4096))
+    AVATAR_NORMALIZE: bool = os.getenv("AVATAR_NORMALIZE", "True").lower() == "true"
+    AVATAR_FULL_SIZE: int = int(os.getenv("AVATAR_FULL_SIZE", 1024))
+    AVATAR_THUMBNAIL_SIZE: int = int(os.getenv("AVATAR_THUMBNAIL_SIZE", 128))
+    AVATAR_JPEG_QUALITY: int = int(os.getenv("AVATAR_JPEG_QUALITY", 85))
+    AVATAR_UPLOAD_URL_EXPIRE_SECONDS: int = int(os.getenv("AVATAR_UPLOAD_URL_EXPIRE_SECONDS", 300))
 
     @property
     def S3_STORAGE_ENDPOINT(self) -> str:
@@ -42,6 +94,13 @@ class Settings(BaseAppSettings):
     POSTGRES_HOST: str = os.getenv("POSTGRES_HOST", "test_host")
     POSTGRES_DB_PORT: int = int(os.getenv("POSTGRES_DB_PORT", 5432))
     POSTGRES_DB: str = os.getenv("POSTGRES_DB", "test_db")
+    POSTGRES_POOL_SIZE: int = int(os.getenv("POSTGRES_POOL_SIZE", 5))
+    POSTGRES_MAX_OVERFLOW: int = int(os.getenv("POSTGRES_MAX_OVERFLOW", 10))
+    POSTGRES_POOL_RECYCLE_SECONDS: int = int(os.getenv("POSTGRES_POOL_RECYCLE_SECONDS", 1800))
+    POSTGRES_POOL_TIMEOUT_SECONDS: float = float(os.getenv("POSTGRES_POOL_TIMEOUT_SECONDS", 30))
+    POSTGRES_STATEMENT_CACHE_SIZE: int = int(os.getenv("POSTGRES_STATEMENT_CACHE_SIZE", 100))
+    POSTGRES_REPLICA_HOSTS: str = os.getenv("POSTGRES_REPLICA_HOSTS", "")
+    POSTGRES_REPLICA_RETRY_SECONDS: float = float(os.getenv("POSTGRES_REPLICA_RETRY_SECONDS", 30))
 
     SECRET_KEY_ACCESS: str = os.getenv("SECRET_KEY_ACCESS", os.urandom(32))
     SECRET_KEY_REFRESH: str = os.getenv("SECRET_KEY_REFRESH", os.urandom(32))
@@ -52,6 +111,10 @@ class TestingSettings(BaseAppSettings):
     SECRET_KEY_ACCESS: str = "SECRET_KEY_ACCESS"
     SECRET_KEY_REFRESH: str = "SECRET_KEY_REFRESH"
     JWT_SIGNING_ALGORITHM: str = "HS256"
+    MOVIE_COUNT_CACHE_TTL_SECONDS: int = 0
+    CACHE_BACKEND: str = "memory"
+    CACHE_MAX_SIZE: int = 0
+    EMAIL_OUTBOX_ENABLED: bool = False
 
     def model_post_init(self, __context: dict[str, Any] | None = None) -> None:
         object.__setattr__(self, 'PATH_TO_DB', ":memory:")
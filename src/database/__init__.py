@@ -20,6 +20,11 @@ from database.models.movies import (
     ActorsMoviesModel,
     MoviesLanguagesModel
 )
+from database.models.notifications import (
+    EmailOutboxModel,
+    EmailOutboxStatusEnum
+)
+from database.models.imports import MovieImportCheckpointModel
 from database.session_sqlite import reset_sqlite_database as reset_database
 from database.validators import accounts as accounts_validators
 
@@ -28,10 +33,18 @@ environment = os.getenv("ENVIRONMENT", "developing")
 if environment == "testing":
     from database.session_sqlite import (
         get_sqlite_db_contextmanager as get_db_contextmanager,
-        get_sqlite_db as get_db
+        get_sqlite_db as get_db,
+        get_sqlite_read_db as get_read_db,
+        get_sqlite_engine as get_db_engine,
+        dispose_sqlite_engine as dispose_db_engine,
+        detach_sqlite_engine as detach_db_engine
     )
 else:
     from database.session_postgresql import (
         get_postgresql_db_contextmanager as get_db_contextmanager,
-        get_postgresql_db as get_db
+        get_postgresql_db as get_db,
+        get_postgresql_read_db as get_read_db,
+        get_postgresql_engine as get_db_engine,
+        dispose_postgresql_engine as dispose_db_engine,
+        detach_postgresql_engine as detach_db_engine
     )
@@ -0,0 +1,75 @@
+from typing import Dict, Iterable, List
+
+from sqlalchemy import insert, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+BULK_CHUNK_SIZE = 1000
+
+
+def _insert_ignoring_conflicts(db_session: AsyncSession, model, unique_field: str):
+    """
+    Build an INSERT for the model that skips rows violating the unique field.
+
+    PostgreSQL and SQLite get `ON CONFLICT (unique_field) DO NOTHING`; other dialects
+    get a plain INSERT and rely on the preceding lookup.
+    """
+    dialect_name = db_session.bind.dialect.name if db_session.bind is not None else ""
+    if dialect_name == "postgresql":
+        return postgresql.insert(model).on_conflict_do_nothing(index_elements=[unique_field])
+    if dialect_name == "sqlite":
+        return sqlite.insert(model).on_conflict_do_nothing(index_elements=[unique_field])
+    return insert(model)
+
+
+async def get_or_create_bulk(
+        db_session: AsyncSession,
+        model,
+        items: Iterable[str],
+        unique_field: str,
+        chunk_size: int = BULK_CHUNK_SIZE
+) -> Dict[str, object]:
+    """
+    Resolve reference rows (genres, actors, countries, ...) by their unique field in a set-based way.
+
+    Existing rows are fetched with one `IN (...)` query per chunk. Missing values are inserted
+    with one multi-row `INSERT ... ON CONFLICT DO NOTHING ... RETURNING` per chunk, so no
+    second SELECT is needed for the new ids. Values that lost an insert race to a concurrent
+    transaction are not returned by the INSERT and are picked up by a final lookup.
+
+    :param db_session: The async session to run the statements in.
+    :param model: The SQLAlchemy model class (e.g., GenreModel).
+    :param items: The values of the unique field to resolve (duplicates are ignored).
+    :param unique_field: The name of the unique field (e.g., "name").
+    :param chunk_size: Maximum number of values per statement.
+    :return: A dict mapping each value to its model instance.
+    """
+    unique_items: List[str] = list(dict.fromkeys(items))
+    column = getattr(model, unique_field)
+    resolved: Dict[str, object] = {}
+
+    for i in range(0, len(unique_items), chunk_size):
+        chunk = unique_items[i: i + chunk_size]
+        result = await db_session.execute(select(model).where(column.in_(chunk)))
+        for obj in result.scalars().all():
+            resolved[getattr(obj, unique_field)] = obj
+
+    missing = [item for item in unique_items if item not in resolved]
+
+    for i in range(0, len(missing), chunk_size):
+        chunk = missing[i: i + chunk_size]
+        stmt = _insert_ignoring_conflicts(db_session, model, unique_field)
+        result = await db_session.execute(
+            stmt.values([{unique_field: item} for item in chunk]).returning(model)
+        )
+        for obj in result.scalars().all():
+            resolved[getattr(obj, unique_field)] = obj
+
+    raced = [item for item in missing if item not in resolved]
+    for i in range(0, len(raced), chunk_size):
+        chunk = raced[i: i + chunk_size]
+        result = await db_session.execute(select(model).where(column.in_(chunk)))
+        for obj in result.scalars().all():
+            resolved[getattr(obj, unique_field)] = obj
+
+    return resolved
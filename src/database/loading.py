@@ -0,0 +1,126 @@
+import enum
+import json
+from typing import Any, Dict, Optional, Union
+
+from sqlalchemy import select, func, literal_column
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, selectinload
+
+from database.models.movies import (
+    MovieModel,
+    CountryModel,
+    GenreModel,
+    ActorModel,
+    LanguageModel,
+    MoviesGenresModel,
+    ActorsMoviesModel,
+    MoviesLanguagesModel
+)
+
+
+class MovieDetailLoadingStrategyEnum(str, enum.Enum):
+    JOINED = "joined"
+    SELECTIN = "selectin"
+    JSON = "json"
+
+
+def _json_collection(dialect_name: str, model, association, foreign_key: str):
+    """
+    Build a correlated scalar subquery that aggregates one movie collection into a JSON array.
+    """
+    if dialect_name == "postgresql":
+        aggregated = func.coalesce(
+            func.json_agg(func.json_build_object("id", model.id, "name", model.name)),
+            literal_column("'[]'::json")
+        )
+    else:
+        aggregated = func.json_group_array(func.json_object("id", model.id, "name", model.name))
+
+    return (
+        select(aggregated)
+        .select_from(model)
+        .join(association, getattr(association.c, foreign_key) == model.id)
+        .where(association.c.movie_id == MovieModel.id)
+        .scalar_subquery()
+    )
+
+
+def _decode_json(value: Any) -> list:
+    if value is None:
+        return []
+    if isinstance(value, (str, bytes)):
+        return json.loads(value)
+    return value
+
+
+async def _load_movie_detail_as_json(db: AsyncSession, movie_id: int) -> Optional[Dict[str, Any]]:
+    dialect_name = db.bind.dialect.name if db.bind is not None else ""
+    stmt = (
+        select(
+            MovieModel,
+            CountryModel,
+            _json_collection(dialect_name, GenreModel, MoviesGenresModel, "genre_id").label("genres"),
+            _json_collection(dialect_name, ActorModel, ActorsMoviesModel, "actor_id").label("actors"),
+            _json_collection(dialect_name, LanguageModel, MoviesLanguagesModel, "language_id").label("languages"),
+        )
+        .join(CountryModel, MovieModel.country_id == CountryModel.id)
+        .where(MovieModel.id == movie_id)
+    )
+    row = (await db.execute(stmt)).first()
+    if row is None:
+        return None
+
+    movie, country, genres, actors, languages = row
+    movie_data: Dict[str, Any] = {
+        column.key: getattr(movie, column.key) for column in MovieModel.__mapper__.column_attrs
+    }
+    movie_data["country"] = {"id": country.id, "code": country.code, "name": country.name}
+    movie_data["genres"] = _decode_json(genres)
+    movie_data["actors"] = _decode_json(actors)
+    movie_data["languages"] = _decode_json(languages)
+    return movie_data
+
+
+async def load_movie_detail(
+        db: AsyncSession,
+        movie_id: int,
+        strategy: Union[MovieDetailLoadingStrategyEnum, str] = MovieDetailLoadingStrategyEnum.SELECTIN
+) -> Optional[Union[MovieModel, Dict[str, Any]]]:
+    """
+    Load a movie with its country, genres, actors and languages.
+
+    - `JOINED` joins all three collections in one statement; the result has
+      genres x actors x languages rows that SQLAlchemy de-duplicates in Python.
+    - `SELECTIN` joins the country and loads every collection with its own `IN` query,
+      so the number of rows fetched is the sum of the collection sizes.
+    - `JSON` runs a single statement in which every collection is aggregated into a JSON
+      array by the database (`json_agg` on PostgreSQL, `json_group_array` on SQLite).
+
+    :param db: The async SQLAlchemy session.
+    :param movie_id: The id of the movie to load.
+    :param strategy: The relationship loading strategy (enum member or its value).
+    :return: A `MovieModel` (`JOINED`/`SELECTIN`), a plain dict (`JSON`), or None if not found.
+    :raises ValueError: If the strategy name is unknown.
+    """
+    strategy = MovieDetailLoadingStrategyEnum(strategy)
+    if strategy == MovieDetailLoadingStrategyEnum.JSON:
+        return await _load_movie_detail_as_json(db, movie_id)
+
+    if strategy == MovieDetailLoadingStrategyEnum.JOINED:
+        options = (
+            joinedload(MovieModel.country),
+            joinedload(MovieModel.genres),
+            joinedload(MovieModel.actors),
+            joinedload(MovieModel.languages),
+        )
+    else:
+        options = (
+            joinedload(MovieModel.country),
+            selectinload(MovieModel.genres),
+            selectinload(MovieModel.actors),
+            selectinload(MovieModel.languages),
+        )
+
+    stmt = select(MovieModel).options(*options).where(MovieModel.id == movie_id)
+    result = await db.execute(stmt)
+    return result.unique().scalars().first()
@@ -1,10 +1,13 @@
 from logging.config import fileConfig
 
 from alembic import context
+from sqlalchemy import create_engine
+from sqlalchemy.pool import NullPool
 
-from database.models import movies, accounts # noqa: F401
+from config import get_settings
+from database.models import movies, accounts, notifications, imports # noqa: F401
 from database.models.base import Base
-from database.session_postgresql import sync_postgresql_engine
+from database.session_postgresql import postgresql_database_url
 
 
 # this is the Alembic Config object, which provides
@@ -40,7 +43,7 @@ def run_migrations_offline() -> None:
     script output.
 
     """
-    connectable = sync_postgresql_engine
+    connectable = create_engine(postgresql_database_url(get_settings(), driver="postgresql"), poolclass=NullPool)
 
     with connectable.connect() as connection:
         context.configure(
@@ -61,7 +64,7 @@ def run_migrations_online() -> None:
     and associate a connection with the context.
 
     """
-    connectable = sync_postgresql_engine
+    connectable = create_engine(postgresql_database_url(get_settings(), driver="postgresql"), poolclass=NullPool)
 
     with connectable.connect() as connection:
         context.configure(
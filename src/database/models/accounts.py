@@ -23,6 +23,7 @@ from sqlalchemy.orm import (
 
 from database import Base
 from database.validators import accounts as validators
+from security.interfaces import PasswordHasherInterface
 from security.passwords import hash_password, verify_password
 from security.utils import generate_secure_token
 
@@ -121,12 +122,29 @@ class UserModel(Base):
         validators.validate_password_strength(raw_password)
         self._hashed_password = hash_password(raw_password)
 
+    @property
+    def hashed_password(self) -> str:
+        return self._hashed_password
+
     def verify_password(self, raw_password: str) -> bool:
         """
         Verify the provided password against the stored hashed password.
         """
         return verify_password(raw_password, self._hashed_password)
 
+    async def set_password_async(self, raw_password: str, hasher: PasswordHasherInterface) -> None:
+        """
+        Validate the password strength and hash it in the hasher's worker pool.
+        """
+        validators.validate_password_strength(raw_password)
+        self._hashed_password = await hasher.hash(raw_password)
+
+    async def verify_password_async(self, raw_password: str, hasher: PasswordHasherInterface) -> bool:
+        """
+        Verify the provided password in the hasher's worker pool.
+        """
+        return await hasher.verify(raw_password, self._hashed_password)
+
     @validates("email")
     def validate_email(self, key, value):
         return validators.validate_email(value.lower())
@@ -0,0 +1,87 @@
+import time
+from typing import Dict, Optional, Union
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, PoolProxiedConnection
+
+
+class PoolMetrics:
+    """
+    Counters describing how connections were taken from a pool.
+
+    The counters outlive the pool they were collected from, so they keep counting across
+    `engine.dispose()`, which replaces the pool.
+    """
+
+    def __init__(self):
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self.overflow_max = 0
+
+    def record_checkout(self, wait_seconds: float, overflow: int) -> None:
+        self.checkouts += 1
+        self.wait_seconds_total += wait_seconds
+        self.wait_seconds_max = max(self.wait_seconds_max, wait_seconds)
+        self.overflow_max = max(self.overflow_max, overflow)
+
+    def record_timeout(self, wait_seconds: float) -> None:
+        self.timeouts += 1
+        self.wait_seconds_total += wait_seconds
+        self.wait_seconds_max = max(self.wait_seconds_max, wait_seconds)
+
+    def stats(self) -> Dict[str, Union[int, float]]:
+        """
+        Return the counters together with the average checkout wait.
+        """
+        attempts = self.checkouts + self.timeouts
+        return {
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "overflow_max": self.overflow_max,
+            "wait_seconds_total": self.wait_seconds_total,
+            "wait_seconds_max": self.wait_seconds_max,
+            "wait_seconds_avg": self.wait_seconds_total / attempts if attempts else 0.0,
+        }
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """
+    The default pool of async engines, recording checkouts, overflow and the time spent waiting for a connection.
+
+    The wait covers everything `connect()` does before handing out a connection: waiting for a free
+    one, opening an overflow connection and the pre-ping.
+    """
+
+    def __init__(self, *args, metrics: Optional[PoolMetrics] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = metrics or PoolMetrics()
+
+    def connect(self) -> PoolProxiedConnection:
+        started = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            self.metrics.record_timeout(time.perf_counter() - started)
+            raise
+        self.metrics.record_checkout(time.perf_counter() - started, max(self.overflow(), 0))
+        return connection
+
+    def recreate(self) -> "InstrumentedAsyncQueuePool":
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+    def stats(self) -> Dict[str, Union[int, float]]:
+        """
+        Return the current pool occupancy together with the checkout counters.
+        """
+        return {
+            "size": self.size(),
+            "max_overflow": self._max_overflow,
+            "checked_in": self.checkedin(),
+            "checked_out": self.checkedout(),
+            "overflow": max(self.overflow(), 0),
+            **self.metrics.stats(),
+        }
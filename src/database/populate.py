@@ -1,9 +1,14 @@
 import asyncio
+import hashlib
 import math
-from typing import List, Dict, Tuple
+import os
+import time
+from typing import Any, AsyncContextManager, Callable, Iterator, List, Dict, Optional, Sequence, Set, Tuple
 
+import numpy as np
 import pandas as pd
-from sqlalchemy import insert, select, func
+from sqlalchemy import delete, insert, or_, select, func, text, tuple_
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import SQLAlchemyError
 from tqdm import tqdm
@@ -17,11 +22,15 @@ from database import (
     ActorsMoviesModel,
     LanguageModel,
     MoviesLanguagesModel,
-    MovieModel, UserGroupModel, UserGroupEnum
+    MovieModel, UserGroupModel, UserGroupEnum,
+    MovieImportCheckpointModel
 )
 from database import get_db_contextmanager
+from database.bulk import get_or_create_bulk
 
 CHUNK_SIZE = 1000
+STREAMING_CHUNK_SIZE = 10_000
+MOVIE_UPDATABLE_FIELDS = ("score", "overview", "status", "budget", "revenue", "country_id")
 
 
 class CSVDatabaseSeeder:
@@ -29,15 +38,23 @@ class CSVDatabaseSeeder:
     A class responsible for seeding the database from a CSV file using asynchronous SQLAlchemy.
     """
 
-    def __init__(self, csv_file_path: str, db_session: AsyncSession) -> None:
+    def __init__(
+            self,
+            csv_file_path: str,
+            db_session: AsyncSession,
+            session_factory: Optional[Callable[[], AsyncContextManager[AsyncSession]]] = None
+    ) -> None:
         """
         Initialize the seeder with the path to the CSV file and an async database session.
 
         :param csv_file_path: The path to the CSV file containing movie data.
         :param db_session: An instance of AsyncSession for performing database operations.
+        :param session_factory: Opens additional sessions (e.g., `get_db_contextmanager`). When given,
+                                the reference data is resolved concurrently, one session per dimension.
         """
         self._csv_file_path = csv_file_path
         self._db_session = db_session
+        self._session_factory = session_factory
 
     async def is_db_populated(self) -> bool:
         """
@@ -51,14 +68,32 @@ class CSVDatabaseSeeder:
 
     def _preprocess_csv(self) -> pd.DataFrame:
         """
-        Load the CSV, remove duplicates, convert relevant columns to strings, and clean up data.
+        Load the CSV, convert relevant columns to strings, clean up data, and remove duplicates.
+        Duplicates are detected on the cleaned (names, date) pair, so spelling variants of the same
+        date cannot reach the unique (name, date) constraint twice.
         Saves the cleaned CSV back to the same path, then returns the Pandas DataFrame.
 
         :return: A Pandas DataFrame containing cleaned movie data.
         """
         data = pd.read_csv(self._csv_file_path)
+        data = self._clean_frame(data)
         data = data.drop_duplicates(subset=['names', 'date_x'], keep='first')
 
+        print("Preprocessing CSV file...")
+        data.to_csv(self._csv_file_path, index=False)
+        print(f"CSV file saved to {self._csv_file_path}")
+        return data
+
+    @staticmethod
+    def _clean_frame(data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Convert relevant columns to strings and clean up the data of a (part of the) CSV.
+
+        Every step only looks at one row at a time, so chunks of the CSV can be cleaned independently.
+
+        :param data: The raw movie data.
+        :return: The cleaned DataFrame.
+        """
         for col in ['crew', 'genre', 'country', 'orig_lang', 'status']:
             data[col] = data[col].fillna('Unknown').astype(str)
 
@@ -74,12 +109,79 @@ class CSVDatabaseSeeder:
         data['date_x'] = data['date_x'].dt.date
         data['orig_lang'] = data['orig_lang'].str.replace(r'\s+', '', regex=True)
         data['status'] = data['status'].str.strip()
-
-        print("Preprocessing CSV file...")
-        data.to_csv(self._csv_file_path, index=False)
-        print(f"CSV file saved to {self._csv_file_path}")
         return data
 
+    @staticmethod
+    def _movie_keys(data: pd.DataFrame) -> pd.Series:
+        """
+        Hash the (names, date) pair of every raw CSV row, with the date parsed as `_clean_frame` does.
+
+        Hashing the parsed date rather than the raw `date_x` string makes whitespace or other
+        spelling variants of the same date collide, as they would on the unique (name, date) pair.
+
+        :param data: The raw movie data.
+        :return: A 64-bit hash per row.
+        """
+        dates = pd.to_datetime(data['date_x'].astype(str).str.strip(), format='%Y-%m-%d', errors='raise')
+        return pd.util.hash_pandas_object(
+            pd.DataFrame({'names': data['names'].to_numpy(), 'date': dates.to_numpy()}),
+            index=False
+        )
+
+    def _iter_csv_chunks(
+            self,
+            chunk_size: int,
+            seen_keys: Set[int],
+            skip_rows: int = 0
+    ) -> Iterator[Tuple[int, pd.DataFrame]]:
+        """
+        Read the CSV in chunks, dropping the rows whose (names, date) pair was already seen, and clean them.
+
+        Instead of the pairs themselves, `seen_keys` keeps a 64-bit hash of each pair (see
+        `_movie_keys`), so the deduplication state stays small; two different movies colliding
+        on a 64-bit hash is not a practical concern for a movie catalog.
+
+        The first `skip_rows` rows are read but not returned: their pairs are only added to
+        `seen_keys`, so a resumed run keeps the first occurrence of a movie exactly like an
+        uninterrupted one.
+
+        :param chunk_size: The number of CSV rows per chunk.
+        :param seen_keys: The hashes of the pairs already seen; updated in place.
+        :param skip_rows: The number of data rows to skip at the start of the file, e.g. when resuming.
+        :return: An iterator over the number of CSV rows read past `skip_rows` and the cleaned,
+                 deduplicated chunk, which may be empty.
+        """
+        position = 0
+        for chunk in pd.read_csv(self._csv_file_path, chunksize=chunk_size):
+            keys = self._movie_keys(chunk)
+            new_rows = ~keys.duplicated().to_numpy() & np.array(
+                [key not in seen_keys for key in keys.tolist()], dtype=bool
+            )
+            seen_keys.update(keys[new_rows].tolist())
+
+            skipped = min(max(skip_rows - position, 0), len(chunk))
+            position += len(chunk)
+            if skipped == len(chunk):
+                continue
+            new_rows[:skipped] = False
+
+            data = chunk[new_rows].copy()
+            yield len(chunk) - skipped, self._clean_frame(data) if not data.empty else data
+
+    @staticmethod
+    def _split_names(column: pd.Series) -> pd.Series:
+        """
+        Split a column of comma-separated names into one stripped, non-empty name per entry.
+
+        The result is indexed by the position of the source row, so it can be used to pick
+        the matching movie ids from an array.
+
+        :param column: A column of comma-separated names (e.g., "Drama,Action").
+        :return: A Series of names indexed by row position, in the order they appear.
+        """
+        names = column.reset_index(drop=True).str.split(',').explode().str.strip()
+        return names[names.notna() & (names != '')]
+
     async def _seed_user_groups(self) -> None:
         """
         Seed the UserGroupModel table with default user groups if none exist.
@@ -111,48 +213,119 @@ class CSVDatabaseSeeder:
         If some items are not found, they are created in bulk. Returns a dictionary
         mapping the item string to the corresponding model instance.
 
+        Delegates to `database.bulk.get_or_create_bulk`, which the API shares.
+
         :param model: The SQLAlchemy model class (e.g., GenreModel).
         :param items: A list of string values to create or retrieve (e.g., ["Comedy", "Action"]).
         :param unique_field: The field name that should be unique (e.g., "name").
         :return: A dict mapping each item to its model instance.
         """
-        existing_dict: Dict[str, object] = {}
+        if self._session_factory is None:
+            return await get_or_create_bulk(self._db_session, model, items, unique_field, chunk_size=CHUNK_SIZE)
 
-        if items:
-            for i in range(0, len(items), CHUNK_SIZE):
-                chunk = items[i: i + CHUNK_SIZE]
-                result = await self._db_session.execute(
-                    select(model).where(getattr(model, unique_field).in_(chunk))
-                )
-                existing_in_chunk = result.scalars().all()
-                for obj in existing_in_chunk:
-                    key = getattr(obj, unique_field)
-                    existing_dict[key] = obj
-
-        new_items = [item for item in items if item not in existing_dict]
-        new_records = [{unique_field: item} for item in new_items]
-
-        if new_records:
-            for i in range(0, len(new_records), CHUNK_SIZE):
-                chunk = new_records[i: i + CHUNK_SIZE]
-                await self._db_session.execute(insert(model).values(chunk))
-                await self._db_session.flush()
-
-            for i in range(0, len(new_items), CHUNK_SIZE):
-                chunk = new_items[i: i + CHUNK_SIZE]
-                result_new = await self._db_session.execute(
-                    select(model).where(getattr(model, unique_field).in_(chunk))
-                )
-                inserted_in_chunk = result_new.scalars().all()
-                for obj in inserted_in_chunk:
-                    key = getattr(obj, unique_field)
-                    existing_dict[key] = obj
+        async with self._session_factory() as session:
+            resolved = await get_or_create_bulk(session, model, items, unique_field, chunk_size=CHUNK_SIZE)
+            await session.commit()
+            return resolved
 
-        return existing_dict
+    def _is_postgresql(self) -> bool:
+        """
+        Tell whether the session is bound to PostgreSQL, which enables the COPY fast path.
+        """
+        bind = self._db_session.bind
+        return bind is not None and bind.dialect.name == "postgresql"
+
+    @staticmethod
+    def _report_throughput(table_name: str, rows: int, seconds: float, method: str) -> None:
+        rate = rows / seconds if seconds > 0 else float("inf")
+        print(f"Inserted {rows} rows into {table_name} via {method} in {seconds:.2f}s ({rate:,.0f} rows/s)")
+
+    async def _copy_records(self, table, table_name: str, data_list: List[Dict[str, Any]]) -> None:
+        """
+        Stream rows into a table with the binary COPY protocol of asyncpg, inside the session's transaction.
+
+        Values go through the bind processors of the table's columns first (e.g. enum members
+        are sent by name), as they would be for an INSERT.
+
+        :param table: The SQLAlchemy table whose columns describe the rows.
+        :param table_name: The table to copy into; may be a staging table with extra columns.
+        :param data_list: A list of dictionaries, where each dict represents a row to insert.
+        """
+        columns: Sequence[str] = list(data_list[0])
+        connection = await self._db_session.connection()
+        dialect = connection.dialect
+        processors = [
+            table.c[column].type.bind_processor(dialect) if column in table.c else None
+            for column in columns
+        ]
+        records = [
+            tuple(
+                processor(row[column]) if processor else row[column]
+                for column, processor in zip(columns, processors)
+            )
+            for row in data_list
+        ]
+
+        raw_connection = await connection.get_raw_connection()
+        await raw_connection.driver_connection.copy_records_to_table(
+            table_name,
+            records=records,
+            columns=columns
+        )
+
+    async def _insert_movies(self, movies_data: List[Dict[str, object]]) -> List[int]:
+        """
+        Insert the movies and return their ids in the order of `movies_data`.
+
+        On PostgreSQL the rows are copied into a temporary staging table, moved into `movies`
+        with one `INSERT ... SELECT`, and their ids are resolved by joining the staging table
+        with `movies` on the unique (name, date) pair. Elsewhere a multi-row INSERT ... RETURNING is used.
+
+        :param movies_data: A list of dictionaries, each representing a new movie record.
+        :return: The ids of the inserted movies.
+        """
+        if not movies_data:
+            return []
+
+        start = time.perf_counter()
+        if not self._is_postgresql():
+            result = await self._db_session.execute(
+                insert(MovieModel).returning(MovieModel.id, sort_by_parameter_order=True),
+                movies_data
+            )
+            movie_ids = list(result.scalars().all())
+            self._report_throughput(MovieModel.__tablename__, len(movie_ids), time.perf_counter() - start, "INSERT")
+            return movie_ids
+
+        columns = ", ".join(movies_data[0])
+        await self._db_session.execute(text(
+            f"CREATE TEMPORARY TABLE movies_staging ON COMMIT DROP AS "
+            f"SELECT {columns} FROM movies WITH NO DATA"
+        ))
+        await self._db_session.execute(text("ALTER TABLE movies_staging ADD COLUMN row_position integer"))
+        await self._copy_records(
+            MovieModel.__table__,
+            "movies_staging",
+            [{**movie, "row_position": position} for position, movie in enumerate(movies_data)]
+        )
+        await self._db_session.execute(text(
+            f"INSERT INTO movies ({columns}) SELECT {columns} FROM movies_staging"
+        ))
+        result = await self._db_session.execute(text(
+            "SELECT movies.id FROM movies_staging "
+            "JOIN movies ON movies.name = movies_staging.name AND movies.date = movies_staging.date "
+            "ORDER BY movies_staging.row_position"
+        ))
+        movie_ids = list(result.scalars().all())
+        self._report_throughput(MovieModel.__tablename__, len(movie_ids), time.perf_counter() - start, "COPY")
+        return movie_ids
 
     async def _bulk_insert(self, table, data_list: List[Dict[str, int]]) -> None:
         """
-        Insert data_list into the given table in chunks, displaying progress via tqdm.
+        Insert data_list into the given table, reporting the throughput.
+
+        On PostgreSQL the rows are streamed with COPY; elsewhere they are inserted in chunks
+        of multi-row INSERT statements, displaying progress via tqdm.
 
         :param table: The SQLAlchemy table or model to insert into.
         :param data_list: A list of dictionaries, where each dict represents a row to insert.
@@ -161,17 +334,24 @@ class CSVDatabaseSeeder:
         if total_records == 0:
             return
 
-        num_chunks = math.ceil(total_records / CHUNK_SIZE)
         table_name = getattr(table, '__tablename__', str(table))
+        start = time.perf_counter()
 
+        if self._is_postgresql():
+            await self._copy_records(getattr(table, '__table__', table), table_name, data_list)
+            self._report_throughput(table_name, total_records, time.perf_counter() - start, "COPY")
+            return
+
+        num_chunks = math.ceil(total_records / CHUNK_SIZE)
         for chunk_index in tqdm(range(num_chunks), desc=f"Inserting into {table_name}"):
-            start = chunk_index * CHUNK_SIZE
-            end = start + CHUNK_SIZE
-            chunk = data_list[start:end]
+            start_index = chunk_index * CHUNK_SIZE
+            end_index = start_index + CHUNK_SIZE
+            chunk = data_list[start_index:end_index]
             if chunk:
                 await self._db_session.execute(insert(table).values(chunk))
 
         await self._db_session.flush()
+        self._report_throughput(table_name, total_records, time.perf_counter() - start, "INSERT")
 
     async def _prepare_reference_data(
             self,
@@ -181,32 +361,35 @@ class CSVDatabaseSeeder:
         Gather unique values for countries, genres, actors, and languages from the DataFrame.
         Then call _get_or_create_bulk for each to ensure they exist in the database.
 
+        With a session factory the four dimensions are resolved concurrently, each on its own
+        connection and committed on its own, so this step takes about as long as the largest
+        dimension. The rows stay even if the movies fail to insert later, which is harmless
+        since resolving them again finds them.
+
         :param data: The preprocessed Pandas DataFrame containing movie info.
         :return: A tuple of four dictionaries:
                  (country_map, genre_map, actor_map, language_map).
         """
         countries = list(data['country'].unique())
-        genres = {
-            genre.strip()
-            for genres_ in data['genre'].dropna() for genre in genres_.split(',')
-            if genre.strip()
-        }
-        actors = {
-            actor.strip()
-            for crew in data['crew'].dropna() for actor in crew.split(',')
-            if actor.strip()
-        }
-        languages = {
-            lang.strip()
-            for langs in data['orig_lang'].dropna() for lang in langs.split(',')
-            if lang.strip()
-        }
-
-        country_map = await self._get_or_create_bulk(CountryModel, countries, 'code')
-        genre_map = await self._get_or_create_bulk(GenreModel, list(genres), 'name')
-        actor_map = await self._get_or_create_bulk(ActorModel, list(actors), 'name')
-        language_map = await self._get_or_create_bulk(LanguageModel, list(languages), 'name')
+        genres = list(self._split_names(data['genre']).unique())
+        actors = list(self._split_names(data['crew']).unique())
+        languages = list(self._split_names(data['orig_lang']).unique())
+
+        dimensions = (
+            (CountryModel, countries, 'code'),
+            (GenreModel, genres, 'name'),
+            (ActorModel, actors, 'name'),
+            (LanguageModel, languages, 'name'),
+        )
+
+        start = time.perf_counter()
+        if self._session_factory is None:
+            maps = [await self._get_or_create_bulk(*dimension) for dimension in dimensions]
+        else:
+            maps = await asyncio.gather(*(self._get_or_create_bulk(*dimension) for dimension in dimensions))
+        print(f"Resolved reference data in {time.perf_counter() - start:.2f}s")
 
+        country_map, genre_map, actor_map, language_map = maps
         return country_map, genre_map, actor_map, language_map
 
     def _prepare_movies_data(
@@ -221,21 +404,18 @@ class CSVDatabaseSeeder:
         :param country_map: A mapping of country codes to CountryModel instances.
         :return: A list of dictionaries, each representing a new movie record.
         """
-        movies_data: List[Dict[str, object]] = []
-        for _, row in tqdm(data.iterrows(), total=data.shape[0], desc="Processing movies"):
-            country = country_map[row['country']]
-            movie = {
-                "name": row['names'],
-                "date": row['date_x'],
-                "score": float(row['score']),
-                "overview": row['overview'],
-                "status": row['status'],
-                "budget": float(row['budget_x']),
-                "revenue": float(row['revenue']),
-                "country_id": country.id
-            }
-            movies_data.append(movie)
-        return movies_data
+        country_ids = {code: country.id for code, country in country_map.items()}
+        movies = pd.DataFrame({
+            "name": data['names'],
+            "date": data['date_x'],
+            "score": data['score'].astype(float),
+            "overview": data['overview'],
+            "status": data['status'],
+            "budget": data['budget_x'].astype(float),
+            "revenue": data['revenue'].astype(float),
+            "country_id": data['country'].map(country_ids),
+        })
+        return movies.to_dict('records')
 
     def _prepare_associations(
             self,
@@ -258,32 +438,177 @@ class CSVDatabaseSeeder:
                  (movie_genres_data, movie_actors_data, movie_languages_data),
                  each containing dictionaries for bulk insertion.
         """
-        movie_genres_data: List[Dict[str, int]] = []
-        movie_actors_data: List[Dict[str, int]] = []
-        movie_languages_data: List[Dict[str, int]] = []
+        movie_ids_array = np.asarray(movie_ids)
+
+        def associate(column: str, name_map: Dict[str, object], foreign_key: str) -> List[Dict[str, int]]:
+            names = self._split_names(data[column])
+            ids = {name: instance.id for name, instance in name_map.items()}
+            movie_id_column = movie_ids_array[names.index.to_numpy()].tolist()
+            foreign_id_column = names.map(ids).to_numpy().tolist()
+            return [
+                {"movie_id": movie_id, foreign_key: foreign_id}
+                for movie_id, foreign_id in zip(movie_id_column, foreign_id_column)
+            ]
+
+        return (
+            associate('genre', genre_map, 'genre_id'),
+            associate('crew', actor_map, 'actor_id'),
+            associate('orig_lang', language_map, 'language_id'),
+        )
+
+    async def _seed_frame(self, data: pd.DataFrame) -> None:
+        """
+        Insert the movies of a cleaned DataFrame together with their reference data and associations.
+
+        :param data: The cleaned movie data.
+        """
+        country_map, genre_map, actor_map, language_map = await self._prepare_reference_data(data)
+
+        movies_data = self._prepare_movies_data(data, country_map)
 
-        for i, (_, row) in enumerate(tqdm(data.iterrows(), total=data.shape[0], desc="Processing associations")):
-            movie_id = movie_ids[i]
+        movie_ids = await self._insert_movies(movies_data)
 
-            for genre_name in row['genre'].split(','):
-                genre_name = genre_name.strip()
-                if genre_name:
-                    genre = genre_map[genre_name]
-                    movie_genres_data.append({"movie_id": movie_id, "genre_id": genre.id})
+        movie_genres_data, movie_actors_data, movie_languages_data = self._prepare_associations(
+            data, movie_ids, genre_map, actor_map, language_map
+        )
 
-            for actor_name in row['crew'].split(','):
-                actor_name = actor_name.strip()
-                if actor_name:
-                    actor = actor_map[actor_name]
-                    movie_actors_data.append({"movie_id": movie_id, "actor_id": actor.id})
+        await self._bulk_insert(MoviesGenresModel, movie_genres_data)
+        await self._bulk_insert(ActorsMoviesModel, movie_actors_data)
+        await self._bulk_insert(MoviesLanguagesModel, movie_languages_data)
+
+    def _file_fingerprint(self) -> str:
+        """
+        Return the SHA-256 of the CSV file, read in blocks so large files are not loaded at once.
+        """
+        digest = hashlib.sha256()
+        with open(self._csv_file_path, "rb") as csv_file:
+            for block in iter(lambda: csv_file.read(1024 * 1024), b""):
+                digest.update(block)
+        return digest.hexdigest()
 
-            for lang_name in row['orig_lang'].split(','):
-                lang_name = lang_name.strip()
-                if lang_name:
-                    language = language_map[lang_name]
-                    movie_languages_data.append({"movie_id": movie_id, "language_id": language.id})
+    async def _load_checkpoint(self) -> MovieImportCheckpointModel:
+        """
+        Fetch the import checkpoint of the CSV file, starting over if the file changed since it was written.
 
-        return movie_genres_data, movie_actors_data, movie_languages_data
+        :return: The checkpoint, added to the session.
+        """
+        source = os.path.abspath(self._csv_file_path)
+        fingerprint = self._file_fingerprint()
+
+        checkpoint = await self._db_session.scalar(
+            select(MovieImportCheckpointModel).where(MovieImportCheckpointModel.source == source)
+        )
+        if checkpoint is None:
+            checkpoint = MovieImportCheckpointModel(
+                source=source,
+                fingerprint=fingerprint,
+                rows_committed=0,
+                completed=False
+            )
+            self._db_session.add(checkpoint)
+        elif checkpoint.fingerprint != fingerprint:
+            checkpoint.fingerprint = fingerprint
+            checkpoint.rows_committed = 0
+            checkpoint.completed = False
+
+        await self._db_session.flush()
+        return checkpoint
+
+    def _upsert_statement(self, rows: List[Dict[str, object]]):
+        """
+        Build an INSERT of movie rows that updates the existing movie with the same (name, date),
+        touching it only if one of its fields changed.
+        """
+        bind = self._db_session.bind
+        dialect_insert = postgresql.insert if bind is not None and bind.dialect.name == "postgresql" else sqlite.insert
+        statement = dialect_insert(MovieModel).values(rows)
+        return statement.on_conflict_do_update(
+            index_elements=[MovieModel.name, MovieModel.date],
+            set_={field: statement.excluded[field] for field in MOVIE_UPDATABLE_FIELDS},
+            where=or_(*(
+                getattr(MovieModel, field).is_distinct_from(statement.excluded[field])
+                for field in MOVIE_UPDATABLE_FIELDS
+            ))
+        )
+
+    async def _upsert_movies(self, movies_data: List[Dict[str, object]]) -> List[int]:
+        """
+        Insert new movies and update changed ones on the `unique_movie_constraint` (name, date).
+
+        :param movies_data: A list of dictionaries, each representing a movie record.
+        :return: The ids of the movies, in the order of `movies_data`.
+        """
+        movie_ids: Dict[Tuple[str, object], int] = {}
+        for start in range(0, len(movies_data), CHUNK_SIZE):
+            chunk = movies_data[start:start + CHUNK_SIZE]
+            await self._db_session.execute(self._upsert_statement(chunk))
+
+            result = await self._db_session.execute(
+                select(MovieModel.id, MovieModel.name, MovieModel.date).where(
+                    tuple_(MovieModel.name, MovieModel.date).in_([(movie["name"], movie["date"]) for movie in chunk])
+                )
+            )
+            movie_ids.update({(name, date): movie_id for movie_id, name, date in result.tuples()})
+
+        return [movie_ids[(movie["name"], movie["date"])] for movie in movies_data]
+
+    async def _sync_associations(
+            self,
+            table,
+            movie_ids: List[int],
+            data_list: List[Dict[str, int]]
+    ) -> Tuple[int, int]:
+        """
+        Make the associations of the given movies match data_list, writing only the differences.
+
+        :param table: The association table (e.g., MoviesGenresModel).
+        :param movie_ids: The movies whose associations are replaced.
+        :param data_list: The wanted rows of these movies.
+        :return: The number of rows added and removed.
+        """
+        movie_column = table.c.movie_id
+        other_column = next(column for column in table.c if column.name != "movie_id")
+
+        wanted = {(row["movie_id"], row[other_column.name]) for row in data_list}
+        existing = set()
+        for start in range(0, len(movie_ids), CHUNK_SIZE):
+            result = await self._db_session.execute(
+                select(movie_column, other_column).where(movie_column.in_(movie_ids[start:start + CHUNK_SIZE]))
+            )
+            existing.update(result.tuples())
+
+        stale = sorted(existing - wanted)
+        for start in range(0, len(stale), CHUNK_SIZE):
+            await self._db_session.execute(
+                delete(table).where(tuple_(movie_column, other_column).in_(stale[start:start + CHUNK_SIZE]))
+            )
+
+        missing = sorted(wanted - existing)
+        await self._bulk_insert(
+            table,
+            [{"movie_id": movie_id, other_column.name: other_id} for movie_id, other_id in missing]
+        )
+        return len(missing), len(stale)
+
+    async def _import_frame(self, data: pd.DataFrame) -> Tuple[int, int]:
+        """
+        Upsert the movies of a cleaned DataFrame and bring their associations up to date.
+
+        :param data: The cleaned movie data.
+        :return: The number of association rows added and removed.
+        """
+        country_map, genre_map, actor_map, language_map = await self._prepare_reference_data(data)
+
+        movies_data = self._prepare_movies_data(data, country_map)
+        movie_ids = await self._upsert_movies(movies_data)
+
+        associations = self._prepare_associations(data, movie_ids, genre_map, actor_map, language_map)
+        added = removed = 0
+        for table, data_list in zip((MoviesGenresModel, ActorsMoviesModel, MoviesLanguagesModel), associations):
+            table_added, table_removed = await self._sync_associations(table, movie_ids, data_list)
+            added += table_added
+            removed += table_removed
+        return added, removed
 
     async def seed(self) -> None:
         """
@@ -299,26 +624,47 @@ class CSVDatabaseSeeder:
             await self._seed_user_groups()
 
             data = self._preprocess_csv()
+            await self._seed_frame(data)
 
-            country_map, genre_map, actor_map, language_map = await self._prepare_reference_data(data)
+            await self._db_session.commit()
+            print("Seeding completed.")
 
-            movies_data = self._prepare_movies_data(data, country_map)
+        except SQLAlchemyError as e:
+            print(f"An error occurred: {e}")
+            raise
+        except Exception as e:
+            print(f"Unexpected error: {e}")
+            raise
 
-            result = await self._db_session.execute(
-                insert(MovieModel).returning(MovieModel.id),
-                movies_data
-            )
-            movie_ids = list(result.scalars().all())
+    async def seed_streaming(self, chunk_size: int = STREAMING_CHUNK_SIZE) -> None:
+        """
+        Seed the database from the CSV chunk by chunk, so memory use does not grow with the file size.
 
-            movie_genres_data, movie_actors_data, movie_languages_data = self._prepare_associations(
-                data, movie_ids, genre_map, actor_map, language_map
-            )
+        Each chunk is deduplicated against the rows seen so far, its reference data is resolved,
+        and its movies and associations are inserted and committed before the next chunk is read.
+        Unlike `seed`, the CSV file is left untouched. An interrupted run leaves the committed
+        chunks in place.
 
-            await self._bulk_insert(MoviesGenresModel, movie_genres_data)
-            await self._bulk_insert(ActorsMoviesModel, movie_actors_data)
-            await self._bulk_insert(MoviesLanguagesModel, movie_languages_data)
+        :param chunk_size: The number of CSV rows per chunk.
+        """
+        try:
+            if self._db_session.in_transaction():
+                print("Rolling back existing transaction.")
+                await self._db_session.rollback()
 
+            await self._seed_user_groups()
             await self._db_session.commit()
+
+            seen_keys: Set[int] = set()
+            movies = 0
+            for chunk_index, (_, data) in enumerate(self._iter_csv_chunks(chunk_size, seen_keys), start=1):
+                if data.empty:
+                    continue
+                await self._seed_frame(data)
+                await self._db_session.commit()
+                movies += len(data)
+                print(f"Chunk {chunk_index} committed, {movies} movies seeded so far.")
+
             print("Seeding completed.")
 
         except SQLAlchemyError as e:
@@ -328,19 +674,81 @@ class CSVDatabaseSeeder:
             print(f"Unexpected error: {e}")
             raise
 
+    async def import_incremental(self, chunk_size: int = STREAMING_CHUNK_SIZE) -> None:
+        """
+        Apply the CSV to an already populated database, e.g. a daily catalog delta.
+
+        Movies are upserted on their (name, date) pair and only changed movies are updated; the
+        genre, actor and language associations of every movie in the file are diffed against the
+        database and only the differences are written. Each chunk is committed together with a
+        checkpoint of the CSV rows consumed, so an interrupted import resumes after the last
+        committed chunk. Importing a file again once it completed is a no-op; a changed file
+        (by content) starts from the beginning.
+
+        :param chunk_size: The number of CSV rows per chunk.
+        """
+        try:
+            if self._db_session.in_transaction():
+                print("Rolling back existing transaction.")
+                await self._db_session.rollback()
+
+            await self._seed_user_groups()
+            checkpoint = await self._load_checkpoint()
+            await self._db_session.commit()
+
+            if checkpoint.completed:
+                print(f"{checkpoint.source} was already imported. Skipping import.")
+                return
+            if checkpoint.rows_committed:
+                print(f"Resuming import of {checkpoint.source} after {checkpoint.rows_committed} rows.")
+
+            seen_keys: Set[int] = set()
+            for rows_read, data in self._iter_csv_chunks(chunk_size, seen_keys, checkpoint.rows_committed):
+                added = removed = 0
+                if not data.empty:
+                    added, removed = await self._import_frame(data)
+                checkpoint.rows_committed += rows_read
+                await self._db_session.commit()
+                print(
+                    f"Imported {checkpoint.rows_committed} rows: {len(data)} movies upserted, "
+                    f"{added} associations added, {removed} removed."
+                )
+
+            checkpoint.completed = True
+            await self._db_session.commit()
+            print("Import completed.")
+
+        except SQLAlchemyError as e:
+            print(f"An error occurred: {e}")
+            raise
+        except Exception as e:
+            print(f"Unexpected error: {e}")
+            raise
+
 
 async def main() -> None:
     """
     The main async entry point for running the database seeder.
     Checks if the database is already populated, and if not, performs the seeding process.
+    With `MOVIES_CSV_CHUNK_SIZE` set, the CSV is streamed in chunks of that many rows.
+    With `MOVIES_CSV_INCREMENTAL` set, the CSV is imported incrementally even into a populated database.
     """
     settings = get_settings()
     async with get_db_contextmanager() as db_session:
-        seeder = CSVDatabaseSeeder(settings.PATH_TO_MOVIES_CSV, db_session)
+        seeder = CSVDatabaseSeeder(settings.PATH_TO_MOVIES_CSV, db_session, session_factory=get_db_contextmanager)
 
-        if not await seeder.is_db_populated():
+        if settings.MOVIES_CSV_INCREMENTAL:
+            try:
+                await seeder.import_incremental(settings.MOVIES_CSV_CHUNK_SIZE or STREAMING_CHUNK_SIZE)
+                print("Database import completed successfully.")
+            except Exception as e:
+                print(f"Failed to import into the database: {e}")
+        elif not await seeder.is_db_populated():
             try:
-                await seeder.seed()
+                if settings.MOVIES_CSV_CHUNK_SIZE:
+                    await seeder.seed_streaming(settings.MOVIES_CSV_CHUNK_SIZE)
+                else:
+                    await seeder.seed()
                 print("Database seeding completed successfully.")
             except Exception as e:
                 print(f"Failed to seed the database: {e}")
@@ -0,0 +1,144 @@
+import asyncio
+import logging
+import time
+from typing import Callable, Dict, List, Sequence
+
+from fastapi import Request, Response
+from sqlalchemy import event
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+READ_YOUR_WRITES_COOKIE = "read_primary_until"
+READ_REPLICA_SESSION_INFO_KEY = "read_replica"
+
+logger = logging.getLogger(__name__)
+
+
+def track_writes(session: AsyncSession, response: Response, window_seconds: float) -> None:
+    """
+    Pin the client's reads to the primary for a while after the session commits.
+
+    A commit sets a cookie holding the time until which `get_read_db` must not use a replica,
+    so the client reads its own writes even if the replicas lag behind.
+
+    :param session: The primary session of the request.
+    :param response: The response the cookie is set on.
+    :param window_seconds: How long the reads stay on the primary. `0` disables the pinning.
+    :return: None
+    """
+    if window_seconds <= 0:
+        return
+
+    def pin_reads_to_primary(_) -> None:
+        response.set_cookie(
+            READ_YOUR_WRITES_COOKIE,
+            f"{time.time() + window_seconds:.3f}",
+            max_age=max(int(window_seconds), 1),
+            httponly=True,
+            samesite="lax"
+        )
+
+    event.listen(session.sync_session, "after_commit", pin_reads_to_primary)
+
+
+def reads_own_writes(request: Request) -> bool:
+    """
+    Tell whether the client wrote recently enough that its reads must go to the primary.
+
+    :param request: The incoming request.
+    :return: True if the read-your-writes cookie has not expired yet.
+    """
+    try:
+        return float(request.cookies.get(READ_YOUR_WRITES_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+
+def reads_from_replica(session: AsyncSession) -> bool:
+    """
+    Tell whether the session was opened on a read replica, whose data may lag behind the primary.
+
+    Rows read from a replica must not be stored in the shared caches: a write invalidates the
+    cached entry, and a lagging replica would refill it with the data from before the write.
+
+    :param session: The session provided by `get_read_db`.
+    :return: True if the session is bound to a replica.
+    """
+    return session.info.get(READ_REPLICA_SESSION_INFO_KEY, False)
+
+
+class ReadReplicaRouter:
+    """
+    Spread read-only sessions over replica engines, falling back to the primary.
+
+    Replicas are tried in round-robin order. A replica that fails to hand out a connection is
+    skipped for `retry_seconds` before it is tried again; when no replica is available the
+    session is opened on the primary.
+    """
+
+    def __init__(self, primary: AsyncEngine, replicas: Sequence[AsyncEngine] = (), retry_seconds: float = 30.0):
+        """
+        Initialize the router.
+
+        :param primary: The engine of the primary database.
+        :param replicas: The engines of the read-only replicas.
+        :param retry_seconds: How long a failed replica is left out of the rotation.
+        """
+        self.primary = primary
+        self.replicas = list(replicas)
+        self._retry_seconds = retry_seconds
+        self._next = 0
+        self._unavailable_until: Dict[int, float] = {}
+
+    def _candidates(self) -> List[AsyncEngine]:
+        if not self.replicas:
+            return []
+
+        start = self._next
+        self._next = (self._next + 1) % len(self.replicas)
+        now = time.monotonic()
+        return [
+            replica
+            for replica in self.replicas[start:] + self.replicas[:start]
+            if self._unavailable_until.get(id(replica), 0.0) <= now
+        ]
+
+    async def open_session(
+            self,
+            session_factory: Callable[..., AsyncSession],
+            use_primary: bool = False
+    ) -> AsyncSession:
+        """
+        Open a session on the next available replica, or on the primary.
+
+        Replica sessions are connected right away, so an unreachable replica is detected here
+        rather than in the middle of the request.
+
+        :param session_factory: Builds a session for the engine passed as `bind`.
+        :param use_primary: Skip the replicas, e.g. to read the client's own writes.
+        :return: A session bound to the chosen engine.
+        """
+        if not use_primary:
+            for replica in self._candidates():
+                session = session_factory(bind=replica)
+                try:
+                    await session.connection()
+                except (DBAPIError, OSError, asyncio.TimeoutError) as error:
+                    await session.close()
+                    self._unavailable_until[id(replica)] = time.monotonic() + self._retry_seconds
+                    logger.warning("Read replica %s is unavailable: %s", replica.url, error)
+                    continue
+                self._unavailable_until.pop(id(replica), None)
+                session.info[READ_REPLICA_SESSION_INFO_KEY] = True
+                return session
+
+        return session_factory(bind=self.primary)
+
+    async def dispose(self) -> None:
+        """
+        Close the pooled connections of the replicas. The primary is owned by the caller.
+
+        :return: None
+        """
+        for replica in self.replicas:
+            await replica.dispose()
@@ -1,39 +1,162 @@
 from contextlib import asynccontextmanager
-from typing import AsyncGenerator
+from functools import lru_cache
+from typing import AsyncGenerator, List, Optional
 
-from sqlalchemy import create_engine
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from fastapi import Request, Response
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine, AsyncSession
 from sqlalchemy.orm import sessionmaker
 
-from config import get_settings
+from config import get_settings, BaseAppSettings
+from database.pool import InstrumentedAsyncQueuePool
+from database.routing import ReadReplicaRouter, reads_own_writes, track_writes
 
-settings = get_settings()
 
-POSTGRESQL_DATABASE_URL = (f"postgresql+asyncpg://{settings.POSTGRES_USER}:{settings.POSTGRES_PASSWORD}@"
-                           f"{settings.POSTGRES_HOST}:{settings.POSTGRES_DB_PORT}/{settings.POSTGRES_DB}")
-postgresql_engine = create_async_engine(POSTGRESQL_DATABASE_URL, echo=False)
-AsyncPostgresqlSessionLocal = sessionmaker(  # type: ignore
-    bind=postgresql_engine,
-    class_=AsyncSession,
-    autocommit=False,
-    autoflush=False,
-    expire_on_commit=False,
-)
+def postgresql_database_url(
+        settings: BaseAppSettings,
+        driver: str = "postgresql+asyncpg",
+        address: Optional[str] = None
+) -> str:
+    """
+    Build the URL of the PostgreSQL database for the given driver.
+
+    :param settings: The application settings holding the connection parameters.
+    :param driver: The SQLAlchemy driver name, e.g. "postgresql" for a synchronous engine.
+    :param address: A "host[:port]" to connect to instead of the primary, e.g. a read replica.
+    :return: The database URL.
+    """
+    address = address or f"{settings.POSTGRES_HOST}:{settings.POSTGRES_DB_PORT}"
+    return f"{driver}://{settings.POSTGRES_USER}:{settings.POSTGRES_PASSWORD}@{address}/{settings.POSTGRES_DB}"
+
+
+def _create_postgresql_engine(settings: BaseAppSettings, address: Optional[str] = None) -> AsyncEngine:
+    return create_async_engine(
+        postgresql_database_url(settings, address=address),
+        echo=False,
+        poolclass=InstrumentedAsyncQueuePool,
+        pool_size=settings.POSTGRES_POOL_SIZE,
+        max_overflow=settings.POSTGRES_MAX_OVERFLOW,
+        pool_recycle=settings.POSTGRES_POOL_RECYCLE_SECONDS,
+        pool_timeout=settings.POSTGRES_POOL_TIMEOUT_SECONDS,
+        pool_pre_ping=True,
+        connect_args={
+            "statement_cache_size": settings.POSTGRES_STATEMENT_CACHE_SIZE,
+            "prepared_statement_cache_size": settings.POSTGRES_STATEMENT_CACHE_SIZE,
+        },
+    )
 
-sync_database_url = POSTGRESQL_DATABASE_URL.replace("postgresql+asyncpg", "postgresql")
-sync_postgresql_engine = create_engine(sync_database_url, echo=False)
+
+@lru_cache
+def get_postgresql_engine() -> AsyncEngine:
+    """
+    Return the process-wide PostgreSQL engine, creating it on first use.
+
+    The engine is created by the application lifespan rather than at import time, so importing
+    the models (e.g. from Alembic or the seeder) does not build a pool. Connections are checked
+    with a ping before being handed out and replaced after `POSTGRES_POOL_RECYCLE_SECONDS`.
+    The pool keeps `POSTGRES_POOL_SIZE` connections, opens up to `POSTGRES_MAX_OVERFLOW` more
+    under load and fails a checkout after waiting `POSTGRES_POOL_TIMEOUT_SECONDS`.
+    `POSTGRES_STATEMENT_CACHE_SIZE` bounds the prepared statements kept per connection
+    (set it to 0 behind a transaction-mode PgBouncer).
+
+    :return: The shared AsyncEngine instance.
+    """
+    return _create_postgresql_engine(get_settings())
 
 
-async def get_postgresql_db() -> AsyncGenerator[AsyncSession, None]:
+@lru_cache
+def get_postgresql_read_router() -> ReadReplicaRouter:
+    """
+    Return the process-wide router over the `POSTGRES_REPLICA_HOSTS` replicas, creating their engines on first use.
+
+    The replicas share the credentials, database name and pool settings of the primary.
+    A replica that cannot be reached is left out for `POSTGRES_REPLICA_RETRY_SECONDS`.
+
+    :return: The shared ReadReplicaRouter instance.
+    """
+    settings = get_settings()
+    return ReadReplicaRouter(
+        primary=get_postgresql_engine(),
+        replicas=[
+            _create_postgresql_engine(settings, address.strip())
+            for address in settings.POSTGRES_REPLICA_HOSTS.split(",")
+            if address.strip()
+        ],
+        retry_seconds=settings.POSTGRES_REPLICA_RETRY_SECONDS
+    )
+
+
+@lru_cache
+def _get_postgresql_sessionmaker() -> sessionmaker:
+    return sessionmaker(  # type: ignore
+        bind=get_postgresql_engine(),
+        class_=AsyncSession,
+        autocommit=False,
+        autoflush=False,
+        expire_on_commit=False,
+    )
+
+
+def detach_postgresql_engine() -> List[AsyncEngine]:
+    """
+    Forget the engines, so the next use creates them from the current settings.
+
+    The detached engines keep serving the sessions that are still open on them; the caller
+    disposes of them once those sessions are done.
+
+    :return: The primary and replica engines built so far.
+    """
+    engines = []
+    if get_postgresql_read_router.cache_info().currsize:
+        engines.extend(get_postgresql_read_router().replicas)
+    if get_postgresql_engine.cache_info().currsize:
+        engines.append(get_postgresql_engine())
+    get_postgresql_read_router.cache_clear()
+    _get_postgresql_sessionmaker.cache_clear()
+    get_postgresql_engine.cache_clear()
+    return engines
+
+
+async def dispose_postgresql_engine() -> None:
+    """
+    Close every pooled connection and forget the engine, so the next use creates it from the current settings.
+
+    :return: None
+    """
+    for engine in detach_postgresql_engine():
+        await engine.dispose()
+
+
+async def get_postgresql_db(response: Response) -> AsyncGenerator[AsyncSession, None]:
     """
     Provide an asynchronous database session.
 
-    This function returns an async generator yielding a new database session.
-    It ensures that the session is properly closed after use.
+    This function returns an async generator yielding a new database session on the primary.
+    It ensures that the session is properly closed after use. A commit pins the client's reads
+    to the primary for `DATABASE_READ_YOUR_WRITES_SECONDS`.
+
+    :param response: The response of the current request.
+    :return: An asynchronous generator yielding an AsyncSession instance.
+    """
+    async with _get_postgresql_sessionmaker()() as session:
+        track_writes(session, response, get_settings().DATABASE_READ_YOUR_WRITES_SECONDS)
+        yield session
+
+
+async def get_postgresql_read_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Provide an asynchronous database session for read-only handlers.
+
+    The session is opened on a read replica chosen by `get_postgresql_read_router`, or on the
+    primary if no replica is available or the client has just written.
 
+    :param request: The incoming request.
     :return: An asynchronous generator yielding an AsyncSession instance.
     """
-    async with AsyncPostgresqlSessionLocal() as session:
+    session = await get_postgresql_read_router().open_session(
+        _get_postgresql_sessionmaker(),
+        use_primary=reads_own_writes(request)
+    )
+    async with session:
         yield session
 
 
@@ -47,5 +170,5 @@ async def get_postgresql_db_contextmanager() -> AsyncGenerator[AsyncSession, Non
 
     :return: An asynchronous generator yielding an AsyncSession instance.
     """
-    async with AsyncPostgresqlSessionLocal() as session:
+    async with _get_postgresql_sessionmaker()() as session:
         yield session
@@ -1,11 +1,13 @@
 from contextlib import asynccontextmanager
-from typing import AsyncGenerator
+from typing import AsyncGenerator, List
 
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from fastapi import Request, Response
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine, AsyncSession
 from sqlalchemy.orm import sessionmaker
 
 from config import get_settings
 from database import Base
+from database.routing import ReadReplicaRouter, reads_own_writes, track_writes
 
 settings = get_settings()
 
@@ -16,18 +18,64 @@ AsyncSQLiteSessionLocal = sessionmaker(  # type: ignore
     class_=AsyncSession,
     expire_on_commit=False
 )
+sqlite_read_router = ReadReplicaRouter(primary=sqlite_engine)
 
 
-async def get_sqlite_db() -> AsyncGenerator[AsyncSession, None]:
+def get_sqlite_engine() -> AsyncEngine:
+    """
+    Return the SQLite engine.
+
+    :return: The shared AsyncEngine instance.
+    """
+    return sqlite_engine
+
+
+def detach_sqlite_engine() -> List[AsyncEngine]:
+    """
+    Keep the SQLite engine, see `dispose_sqlite_engine`.
+
+    :return: No engine to dispose of.
+    """
+    return []
+
+
+async def dispose_sqlite_engine() -> None:
+    """
+    Keep the SQLite engine open.
+
+    The in-memory database lives in the engine's single connection, so disposing of it on
+    a settings reload would drop all data.
+
+    :return: None
+    """
+
+
+async def get_sqlite_db(response: Response) -> AsyncGenerator[AsyncSession, None]:
     """
     Provide an asynchronous database session.
 
     This function returns an async generator yielding a new database session.
     It ensures that the session is properly closed after use.
 
+    :param response: The response of the current request.
     :return: An asynchronous generator yielding an AsyncSession instance.
     """
     async with AsyncSQLiteSessionLocal() as session:
+        track_writes(session, response, settings.DATABASE_READ_YOUR_WRITES_SECONDS)
+        yield session
+
+
+async def get_sqlite_read_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Provide an asynchronous database session for read-only handlers.
+
+    SQLite has no replicas, so the session is always opened on the single database.
+
+    :param request: The incoming request.
+    :return: An asynchronous generator yielding an AsyncSession instance.
+    """
+    session = await sqlite_read_router.open_session(AsyncSQLiteSessionLocal, use_primary=reads_own_writes(request))
+    async with session:
         yield session
 
 
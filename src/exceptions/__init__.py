@@ -1,7 +1,8 @@
 from exceptions.security import (
     BaseSecurityError,
     InvalidTokenError,
-    TokenExpiredError
+    TokenExpiredError,
+    PasswordHasherBusyError
 )
 from exceptions.email import BaseEmailError
 from exceptions.storage import (
@@ -9,6 +10,7 @@ from exceptions.storage import (
     S3ConnectionError,
     S3BucketNotFoundError,
     S3FileUploadError,
+    S3FileDeleteError,
     S3FileNotFoundError,
     S3PermissionError
 )
@@ -19,3 +19,10 @@ class InvalidTokenError(BaseSecurityError):
 
     def __init__(self, message="Invalid token."):
         super().__init__(message)
+
+
+class PasswordHasherBusyError(BaseSecurityError):
+    """Raised when the password hashing queue is full."""
+
+    def __init__(self, message="Password hashing queue is full."):
+        super().__init__(message)
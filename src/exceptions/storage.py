@@ -28,6 +28,13 @@ class S3FileUploadError(BaseS3Error):
         super().__init__(message)
 
 
+class S3FileDeleteError(BaseS3Error):
+    """Raised when a file delete operation fails."""
+
+    def __init__(self, message="Failed to delete file from S3."):
+        super().__init__(message)
+
+
 class S3FileNotFoundError(BaseS3Error):
     """Raised when the requested file is not found in S3 storage."""
 
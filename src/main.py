@@ -1,14 +1,47 @@
+import asyncio
+import logging
+import signal
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 
+from config import init_dependencies, close_dependencies, reload_dependencies
 from routes import (
     movie_router,
     accounts_router,
-    profiles_router
+    profiles_router,
+    database_router
 )
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Build the application-scoped services on startup and release them on shutdown.
+
+    Sending SIGHUP to a worker re-reads the settings and rebuilds the services in that worker.
+    """
+    await init_dependencies()
+
+    loop = asyncio.get_running_loop()
+    try:
+        loop.add_signal_handler(signal.SIGHUP, lambda: loop.create_task(reload_dependencies()))
+    except (AttributeError, NotImplementedError, RuntimeError):
+        logging.info("SIGHUP is not available, settings can only be reloaded by a restart.")
+
+    yield
+
+    try:
+        loop.remove_signal_handler(signal.SIGHUP)
+    except (AttributeError, NotImplementedError, RuntimeError):
+        pass
+    await close_dependencies()
+
+
 app = FastAPI(
     title="Movies homework",
-    description="Description of project"
+    description="Description of project",
+    lifespan=lifespan
 )
 
 api_version_prefix = "/api/v1"
@@ -16,3 +49,4 @@ api_version_prefix = "/api/v1"
 app.include_router(accounts_router, prefix=f"{api_version_prefix}/accounts", tags=["accounts"])
 app.include_router(profiles_router, prefix=f"{api_version_prefix}/profiles", tags=["profiles"])
 app.include_router(movie_router, prefix=f"{api_version_prefix}/theater", tags=["theater"])
+app.include_router(database_router, prefix=f"{api_version_prefix}/database", tags=["database"])
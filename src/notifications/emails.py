@@ -1,12 +1,158 @@
+import asyncio
 import logging
+import time
+from collections import deque
+from contextlib import asynccontextmanager
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
+from typing import AsyncIterator, Awaitable, Callable, Deque, Optional, Tuple
 
 import aiosmtplib
-from jinja2 import Environment, FileSystemLoader
+from fastapi import BackgroundTasks
 
 from exceptions import BaseEmailError
 from notifications.interfaces import EmailSenderInterface
+from notifications.rendering import PrerenderedTemplate, create_template_environment
+
+
+class SMTPConnectionPool:
+    """
+    A bounded pool of authenticated SMTP connections.
+
+    Connections are opened (connect, STARTTLS, LOGIN) on demand, up to `max_size` at once, and put
+    back after each message instead of being closed with QUIT. A connection idle for longer than
+    `idle_timeout_seconds` is closed; any other idle connection is checked with NOOP before reuse
+    and replaced if the server has dropped it. Connections are bound to the event loop that opened
+    them, so a connection put back from another loop is discarded instead of reused.
+    """
+
+    def __init__(
+        self,
+        hostname: str,
+        port: int,
+        username: str,
+        password: str,
+        use_tls: bool,
+        max_size: int = 4,
+        idle_timeout_seconds: float = 30,
+        timeout_seconds: float = 30,
+    ):
+        """
+        Initialize the pool. No connection is opened until the first message.
+
+        Args:
+            hostname (str): SMTP server host.
+            port (int): SMTP server port.
+            username (str): Login user.
+            password (str): Login password.
+            use_tls (bool): Whether to upgrade the connection with STARTTLS.
+            max_size (int): Maximum number of open connections.
+            idle_timeout_seconds (float): How long an unused connection is kept open.
+            timeout_seconds (float): Timeout of every SMTP command.
+        """
+        self._hostname = hostname
+        self._port = port
+        self._username = username
+        self._password = password
+        self._use_tls = use_tls
+        self._max_size = max(1, max_size)
+        self._idle_timeout_seconds = idle_timeout_seconds
+        self._timeout_seconds = timeout_seconds
+
+        self._semaphore = asyncio.Semaphore(self._max_size)
+        self._semaphore_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._idle: Deque[Tuple[aiosmtplib.SMTP, float, asyncio.AbstractEventLoop]] = deque()
+
+    @property
+    def idle_size(self) -> int:
+        """
+        Number of open connections waiting in the pool.
+        """
+        return len(self._idle)
+
+    async def _connect(self) -> aiosmtplib.SMTP:
+        smtp = aiosmtplib.SMTP(
+            hostname=self._hostname,
+            port=self._port,
+            start_tls=self._use_tls,
+            timeout=self._timeout_seconds
+        )
+        await smtp.connect()
+        try:
+            await smtp.login(self._username, self._password)
+        except BaseException:
+            smtp.close()
+            raise
+        return smtp
+
+    @staticmethod
+    async def _close_quietly(smtp: aiosmtplib.SMTP) -> None:
+        try:
+            if smtp.is_connected:
+                await smtp.quit()
+        except Exception:
+            smtp.close()
+
+    @staticmethod
+    def _discard(smtp: aiosmtplib.SMTP) -> None:
+        try:
+            smtp.close()
+        except RuntimeError:
+            # The loop that opened the connection is already closed, and its transport with it.
+            pass
+
+    async def _get_connection(self) -> aiosmtplib.SMTP:
+        loop = asyncio.get_running_loop()
+        while self._idle:
+            smtp, released_at, owner_loop = self._idle.pop()
+            if owner_loop is not loop:
+                self._discard(smtp)
+                continue
+            if time.monotonic() - released_at > self._idle_timeout_seconds:
+                await self._close_quietly(smtp)
+                continue
+            try:
+                await smtp.noop()
+            except Exception:
+                smtp.close()
+                continue
+            return smtp
+        return await self._connect()
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(self._max_size)
+            self._semaphore_loop = loop
+        return self._semaphore
+
+    @asynccontextmanager
+    async def connection(self) -> AsyncIterator[aiosmtplib.SMTP]:
+        """
+        Borrow a healthy connection, waiting while `max_size` connections are in use.
+
+        The connection goes back to the pool unless the body raised, in which case it is closed.
+        """
+        async with self._get_semaphore():
+            smtp = await self._get_connection()
+            try:
+                yield smtp
+            except BaseException:
+                smtp.close()
+                raise
+            self._idle.append((smtp, time.monotonic(), asyncio.get_running_loop()))
+
+    async def close(self) -> None:
+        """
+        Close every idle connection.
+        """
+        loop = asyncio.get_running_loop()
+        while self._idle:
+            smtp, _, owner_loop = self._idle.pop()
+            if owner_loop is loop:
+                await self._close_quietly(smtp)
+            else:
+                self._discard(smtp)
 
 
 class EmailSender(EmailSenderInterface):
@@ -23,6 +169,9 @@ class EmailSender(EmailSenderInterface):
         activation_complete_email_template_name: str,
         password_email_template_name: str,
         password_complete_email_template_name: str,
+        pool_max_size: int = 4,
+        pool_idle_timeout_seconds: float = 30,
+        template_bytecode_cache_dir: Optional[str] = None,
     ):
         self._hostname = hostname
         self._port = port
@@ -34,11 +183,38 @@ class EmailSender(EmailSenderInterface):
         self._password_email_template_name = password_email_template_name
         self._password_complete_email_template_name = password_complete_email_template_name
 
-        self._env = Environment(loader=FileSystemLoader(template_dir))
+        self._env = create_template_environment(template_dir, template_bytecode_cache_dir)
+        template_variables = {
+            activation_email_template_name: ("email", "activation_link"),
+            activation_complete_email_template_name: ("email", "login_link"),
+            password_email_template_name: ("email", "reset_link"),
+            password_complete_email_template_name: ("email", "login_link"),
+        }
+        self._templates = {
+            name: PrerenderedTemplate(self._env.get_template(name), variables)
+            for name, variables in template_variables.items()
+        }
+        self._pool = SMTPConnectionPool(
+            hostname=hostname,
+            port=port,
+            username=email,
+            password=password,
+            use_tls=use_tls,
+            max_size=pool_max_size,
+            idle_timeout_seconds=pool_idle_timeout_seconds
+        )
+
+    async def prepare_templates(self) -> None:
+        """
+        Pre-render the static parts of every email template, so no email pays for it when it is sent.
+        """
+        await asyncio.gather(*(template.prepare() for template in self._templates.values()))
 
     async def _send_email(self, recipient: str, subject: str, html_content: str) -> None:
         """
-        Asynchronously send an email with the given subject and HTML content.
+        Asynchronously send an email with the given subject and HTML content over a pooled connection.
+
+        A connection the server dropped between the health check and the send is replaced once.
 
         Args:
             recipient (str): The recipient's email address.
@@ -55,13 +231,12 @@ class EmailSender(EmailSenderInterface):
         message.attach(MIMEText(html_content, "html"))
 
         try:
-            smtp = aiosmtplib.SMTP(hostname=self._hostname, port=self._port, start_tls=self._use_tls)
-            await smtp.connect()
-            if self._use_tls:
-                await smtp.starttls()
-            await smtp.login(self._email, self._password)
-            await smtp.sendmail(self._email, [recipient], message.as_string())
-            await smtp.quit()
+            try:
+                async with self._pool.connection() as smtp:
+                    await smtp.sendmail(self._email, [recipient], message.as_string())
+            except aiosmtplib.SMTPServerDisconnected:
+                async with self._pool.connection() as smtp:
+                    await smtp.sendmail(self._email, [recipient], message.as_string())
         except aiosmtplib.SMTPException as error:
             logging.error(f"Failed to send email to {recipient}: {error}")
             raise BaseEmailError(f"Failed to send email to {recipient}: {error}")
@@ -74,8 +249,8 @@ class EmailSender(EmailSenderInterface):
             email (str): The recipient's email address.
             activation_link (str): The activation link to be included in the email.
         """
-        template = self._env.get_template(self._activation_email_template_name)
-        html_content = template.render(email=email, activation_link=activation_link)
+        template = self._templates[self._activation_email_template_name]
+        html_content = await template.render(email=email, activation_link=activation_link)
         subject = "Account Activation"
         await self._send_email(email, subject, html_content)
 
@@ -87,8 +262,8 @@ class EmailSender(EmailSenderInterface):
             email (str): The recipient's email address.
             login_link (str): The login link to be included in the email.
         """
-        template = self._env.get_template(self._activation_complete_email_template_name)
-        html_content = template.render(email=email, login_link=login_link)
+        template = self._templates[self._activation_complete_email_template_name]
+        html_content = await template.render(email=email, login_link=login_link)
         subject = "Account Activated Successfully"
         await self._send_email(email, subject, html_content)
 
@@ -100,8 +275,8 @@ class EmailSender(EmailSenderInterface):
             email (str): The recipient's email address.
             reset_link (str): The reset link to be included in the email.
         """
-        template = self._env.get_template(self._password_email_template_name)
-        html_content = template.render(email=email, reset_link=reset_link)
+        template = self._templates[self._password_email_template_name]
+        html_content = await template.render(email=email, reset_link=reset_link)
         subject = "Password Reset Request"
         await self._send_email(email, subject, html_content)
 
@@ -113,7 +288,57 @@ class EmailSender(EmailSenderInterface):
             email (str): The recipient's email address.
             login_link (str): The login link to be included in the email.
         """
-        template = self._env.get_template(self._password_complete_email_template_name)
-        html_content = template.render(email=email, login_link=login_link)
+        template = self._templates[self._password_complete_email_template_name]
+        html_content = await template.render(email=email, login_link=login_link)
         subject = "Your Password Has Been Successfully Reset"
         await self._send_email(email, subject, html_content)
+
+    async def close(self) -> None:
+        """
+        Close the pooled SMTP connections.
+        """
+        await self._pool.close()
+
+
+class BackgroundEmailSender(EmailSenderInterface):
+    """
+    Hands every message to another sender in a background task of the current request.
+
+    FastAPI runs the background tasks only after a successful response, so a message requested
+    before the endpoint's commit is not sent if the commit or the endpoint fails. A delivery error
+    is logged instead of failing a request whose changes are already committed.
+    """
+
+    def __init__(self, sender: EmailSenderInterface, background_tasks: BackgroundTasks):
+        """
+        Initialize the sender.
+
+        Args:
+            sender (EmailSenderInterface): The sender that delivers the messages.
+            background_tasks (BackgroundTasks): The background tasks of the current request.
+        """
+        self._sender = sender
+        self._background_tasks = background_tasks
+
+    @staticmethod
+    async def _send_quietly(send: Callable[..., Awaitable[None]], email: str, link: str) -> None:
+        try:
+            await send(email, link)
+        except BaseEmailError as error:
+            logging.error(f"Failed to send email to {email}: {error}")
+
+    async def send_activation_email(self, email: str, activation_link: str) -> None:
+        self._background_tasks.add_task(self._send_quietly, self._sender.send_activation_email, email, activation_link)
+
+    async def send_activation_complete_email(self, email: str, login_link: str) -> None:
+        self._background_tasks.add_task(
+            self._send_quietly, self._sender.send_activation_complete_email, email, login_link
+        )
+
+    async def send_password_reset_email(self, email: str, reset_link: str) -> None:
+        self._background_tasks.add_task(self._send_quietly, self._sender.send_password_reset_email, email, reset_link)
+
+    async def send_password_reset_complete_email(self, email: str, login_link: str) -> None:
+        self._background_tasks.add_task(
+            self._send_quietly, self._sender.send_password_reset_complete_email, email, login_link
+        )
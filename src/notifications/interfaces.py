@@ -46,3 +46,9 @@ class EmailSenderInterface(ABC):
             login_link (str): The login link to include in the email.
         """
         pass
+
+    async def close(self) -> None:
+        """
+        Release any resources held by the sender, such as open connections.
+        """
+        pass
@@ -0,0 +1,249 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import AsyncContextManager, Callable, Dict, List, Optional
+
+from sqlalchemy import func, select, update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database import EmailOutboxModel, EmailOutboxStatusEnum
+from exceptions import BaseEmailError
+from notifications.interfaces import EmailSenderInterface
+
+SessionFactory = Callable[[], AsyncContextManager[AsyncSession]]
+
+
+class OutboxEmailSender(EmailSenderInterface):
+    """
+    An email sender that stores every message in the `email_outbox` table instead of sending it.
+
+    The row is only added to the given session: it is written by the caller's own commit, together
+    with the change that triggered the email, and discarded with it on rollback. `EmailOutboxWorker`
+    delivers it later.
+    """
+
+    def __init__(self, db: AsyncSession):
+        """
+        Initialize the sender.
+
+        Args:
+            db (AsyncSession): The session of the transaction the messages belong to.
+        """
+        self._db = db
+
+    async def _enqueue(self, kind: str, recipient: str, **payload: str) -> None:
+        """
+        Add a message to the outbox in the caller's transaction.
+        """
+        self._db.add(EmailOutboxModel(kind=kind, recipient=recipient, payload=payload))
+
+    async def send_activation_email(self, email: str, activation_link: str) -> None:
+        await self._enqueue("activation", email, activation_link=activation_link)
+
+    async def send_activation_complete_email(self, email: str, login_link: str) -> None:
+        await self._enqueue("activation_complete", email, login_link=login_link)
+
+    async def send_password_reset_email(self, email: str, reset_link: str) -> None:
+        await self._enqueue("password_reset", email, reset_link=reset_link)
+
+    async def send_password_reset_complete_email(self, email: str, login_link: str) -> None:
+        await self._enqueue("password_reset_complete", email, login_link=login_link)
+
+
+class EmailOutboxWorker:
+    """
+    Delivers the messages stored by `OutboxEmailSender`.
+
+    Every poll claims up to `batch_size` due messages and sends them concurrently through
+    `sender`, whose connection pool bounds the SMTP concurrency. A failed message is retried
+    after `retry_backoff_seconds * 2 ** (attempts - 1)` seconds and marked as failed once it
+    has been attempted `max_attempts` times.
+
+    Claiming a message counts an attempt and moves its `next_attempt_at` forward by
+    `lease_seconds` in a short transaction of its own; the messages are sent after that
+    transaction has committed, so no row lock or transaction is held while talking to SMTP.
+    If the worker dies before recording the outcome, the message becomes due again once its
+    lease has expired.
+    """
+
+    def __init__(
+        self,
+        sender: EmailSenderInterface,
+        session_factory: SessionFactory,
+        batch_size: int = 50,
+        poll_interval_seconds: float = 1,
+        max_attempts: int = 5,
+        retry_backoff_seconds: float = 5,
+        lease_seconds: float = 60,
+    ):
+        """
+        Initialize the worker.
+
+        Args:
+            sender (EmailSenderInterface): The sender that actually delivers the messages.
+            session_factory (SessionFactory): Opens a database session, e.g. `get_db_contextmanager`.
+            batch_size (int): Maximum number of messages claimed per poll.
+            poll_interval_seconds (float): Pause between polls when the outbox is drained.
+            max_attempts (int): Number of attempts before a message is marked as failed.
+            retry_backoff_seconds (float): Delay before the first retry; doubled on every further attempt.
+            lease_seconds (float): How long a claimed message is reserved for this worker.
+        """
+        self._sender = sender
+        self._session_factory = session_factory
+        self._batch_size = batch_size
+        self._poll_interval_seconds = poll_interval_seconds
+        self._max_attempts = max_attempts
+        self._retry_backoff_seconds = retry_backoff_seconds
+        self._lease_seconds = lease_seconds
+        self._task: Optional[asyncio.Task] = None
+
+    async def _deliver(self, message: EmailOutboxModel) -> None:
+        if message.kind == "activation":
+            await self._sender.send_activation_email(message.recipient, **message.payload)
+        elif message.kind == "activation_complete":
+            await self._sender.send_activation_complete_email(message.recipient, **message.payload)
+        elif message.kind == "password_reset":
+            await self._sender.send_password_reset_email(message.recipient, **message.payload)
+        elif message.kind == "password_reset_complete":
+            await self._sender.send_password_reset_complete_email(message.recipient, **message.payload)
+        else:
+            raise BaseEmailError(f"Unknown email kind: {message.kind}")
+
+    async def _claim_batch(self) -> List[EmailOutboxModel]:
+        """
+        Reserve up to `batch_size` due messages for this worker and commit the reservation.
+
+        On PostgreSQL the rows are selected with `FOR UPDATE SKIP LOCKED`, so concurrent workers
+        claim disjoint batches; the lock is released by the commit right after the update.
+        """
+        async with self._session_factory() as db:
+            now = datetime.now(timezone.utc)
+            stmt = (
+                select(EmailOutboxModel)
+                .where(
+                    EmailOutboxModel.status == EmailOutboxStatusEnum.PENDING,
+                    EmailOutboxModel.next_attempt_at <= now
+                )
+                .order_by(EmailOutboxModel.next_attempt_at, EmailOutboxModel.id)
+                .limit(self._batch_size)
+                .with_for_update(skip_locked=True)
+            )
+            messages = list((await db.execute(stmt)).scalars().all())
+            if not messages:
+                await db.rollback()
+                return []
+
+            lease_until = now + timedelta(seconds=self._lease_seconds)
+            for message in messages:
+                message.attempts += 1
+                message.next_attempt_at = lease_until
+            await db.commit()
+            return messages
+
+    async def _record_outcomes(self, messages: List[EmailOutboxModel], results: List[object]) -> None:
+        """
+        Store the outcome of every claimed message.
+
+        An outcome is only written while the attempt counter still matches this worker's claim,
+        so a message whose lease expired and that was claimed again is left to its new owner.
+        """
+        async with self._session_factory() as db:
+            now = datetime.now(timezone.utc)
+            for message, result in zip(messages, results):
+                if not isinstance(result, Exception):
+                    values = {"status": EmailOutboxStatusEnum.SENT, "sent_at": now, "last_error": None}
+                elif message.attempts >= self._max_attempts:
+                    values = {"status": EmailOutboxStatusEnum.FAILED, "last_error": str(result)}
+                    logging.error(f"Giving up on email {message.id} to {message.recipient}: {result}")
+                else:
+                    delay = self._retry_backoff_seconds * 2 ** (message.attempts - 1)
+                    values = {"next_attempt_at": now + timedelta(seconds=delay), "last_error": str(result)}
+
+                await db.execute(
+                    update(EmailOutboxModel)
+                    .where(
+                        EmailOutboxModel.id == message.id,
+                        EmailOutboxModel.status == EmailOutboxStatusEnum.PENDING,
+                        EmailOutboxModel.attempts == message.attempts
+                    )
+                    .values(**values)
+                )
+            await db.commit()
+
+    async def dispatch_batch(self) -> int:
+        """
+        Claim one batch of due messages, send them and record the outcome of each.
+
+        Returns:
+            int: The number of messages attempted.
+        """
+        messages = await self._claim_batch()
+        if not messages:
+            return 0
+
+        results = await asyncio.gather(
+            *(self._deliver(message) for message in messages),
+            return_exceptions=True
+        )
+        await self._record_outcomes(messages, results)
+        return len(messages)
+
+    async def stats(self) -> Dict[str, Optional[float]]:
+        """
+        Report the queue depth of the outbox.
+
+        Returns:
+            Dict[str, Optional[float]]: Message counts per status and the age in seconds of the
+            oldest pending message (None if there is none).
+        """
+        async with self._session_factory() as db:
+            result = await db.execute(
+                select(EmailOutboxModel.status, func.count())
+                .group_by(EmailOutboxModel.status)
+            )
+            counts = {status.value: 0 for status in EmailOutboxStatusEnum}
+            counts.update({status.value: count for status, count in result.all()})
+
+            oldest = await db.scalar(
+                select(func.min(EmailOutboxModel.created_at))
+                .where(EmailOutboxModel.status == EmailOutboxStatusEnum.PENDING)
+            )
+
+        oldest_pending_age_seconds = None
+        if oldest is not None:
+            oldest = oldest if oldest.tzinfo else oldest.replace(tzinfo=timezone.utc)
+            oldest_pending_age_seconds = max(0.0, (datetime.now(timezone.utc) - oldest).total_seconds())
+        return {**counts, "oldest_pending_age_seconds": oldest_pending_age_seconds}
+
+    async def run(self) -> None:
+        """
+        Drain the outbox until cancelled, pausing only when no message is due.
+        """
+        while True:
+            try:
+                dispatched = await self.dispatch_batch()
+            except SQLAlchemyError as error:
+                logging.error(f"Email outbox dispatch failed: {error}")
+                dispatched = 0
+            if dispatched < self._batch_size:
+                await asyncio.sleep(self._poll_interval_seconds)
+
+    def start(self) -> None:
+        """
+        Start `run` as a background task of the running event loop.
+        """
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self.run())
+
+    async def stop(self) -> None:
+        """
+        Cancel the background task, letting the batch in flight be retried later.
+        """
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
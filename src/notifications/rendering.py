@@ -0,0 +1,101 @@
+from typing import Dict, List, Optional, Tuple
+
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, Template
+
+
+def create_template_environment(template_dir: str, bytecode_cache_dir: Optional[str] = None) -> Environment:
+    """
+    Create the Jinja environment used for email templates.
+
+    Templates are never re-checked on disk once loaded, rendering is async, and compiled templates
+    can be shared between processes and restarts through a bytecode cache directory.
+
+    Args:
+        template_dir (str): Directory containing the templates.
+        bytecode_cache_dir (Optional[str]): Directory for compiled templates, or None to disable the cache.
+
+    Returns:
+        Environment: The configured Jinja environment.
+    """
+    return Environment(
+        loader=FileSystemLoader(template_dir),
+        auto_reload=False,
+        enable_async=True,
+        bytecode_cache=FileSystemBytecodeCache(bytecode_cache_dir) if bytecode_cache_dir else None,
+    )
+
+
+class PrerenderedTemplate:
+    """
+    A compiled template whose static parts are rendered once.
+
+    The template is rendered with a unique marker for every variable and the output is split at the
+    markers, so rendering only joins the static chunks with the values. Jinja's own rendering is kept
+    as a fallback when the template does more with a variable than print it (filters, conditions,
+    loops, autoescaping), which is detected by comparing both paths on sample values.
+    """
+
+    _MARKER = "\x00{}\x00"
+
+    def __init__(self, template: Template, variables: Tuple[str, ...]):
+        """
+        Wrap a compiled template; its static parts are rendered by `prepare` or on first use.
+
+        Args:
+            template (Template): The compiled template, from an async environment.
+            variables (Tuple[str, ...]): Names of the variables the template is rendered with.
+        """
+        self._template = template
+        self._variables = variables
+        self._chunks: Optional[List[str]] = None
+        self._order: List[str] = []
+        self._prepared = False
+
+    @property
+    def is_prerendered(self) -> bool:
+        """
+        Whether rendering skips Jinja.
+        """
+        return self._chunks is not None
+
+    async def prepare(self) -> None:
+        """
+        Render the static parts and verify them against a regular render.
+        """
+        markers = {name: self._MARKER.format(name) for name in self._variables}
+        output = await self._template.render_async(**markers)
+
+        chunks, order, rest = [], [], output
+        while True:
+            positions = [(rest.find(marker), name) for name, marker in markers.items() if marker in rest]
+            if not positions:
+                chunks.append(rest)
+                break
+            position, name = min(positions)
+            chunks.append(rest[:position])
+            order.append(name)
+            rest = rest[position + len(markers[name]):]
+
+        self._chunks, self._order = chunks, order
+        samples = {name: f"<{name} & sample>" for name in self._variables}
+        if self._join(samples) != await self._template.render_async(**samples):
+            self._chunks, self._order = None, []
+        self._prepared = True
+
+    def _join(self, values: Dict[str, str]) -> str:
+        parts = [self._chunks[0]]
+        for name, chunk in zip(self._order, self._chunks[1:]):
+            parts.append(str(values[name]))
+            parts.append(chunk)
+        return "".join(parts)
+
+    async def render(self, **values: str) -> str:
+        """
+        Render the template with the given variable values, pre-rendering it first unless `prepare`
+        has already run.
+        """
+        if not self._prepared:
+            await self.prepare()
+        if self._chunks is None:
+            return await self._template.render_async(**values)
+        return self._join(values)
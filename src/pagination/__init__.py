@@ -0,0 +1,5 @@
+from pagination.cursors import (
+    CursorDirectionEnum,
+    encode_cursor,
+    decode_cursor
+)
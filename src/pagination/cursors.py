@@ -0,0 +1,54 @@
+import base64
+import binascii
+import enum
+import json
+from typing import Any, Dict, Tuple
+
+
+class CursorDirectionEnum(str, enum.Enum):
+    NEXT = "next"
+    PREV = "prev"
+
+
+def encode_cursor(key: Dict[str, Any], direction: CursorDirectionEnum) -> str:
+    """
+    Encode a keyset position into an opaque, URL-safe cursor string.
+
+    The key holds the values of the sort columns for the boundary row (e.g. ``{"id": 42}``),
+    so the cursor keeps working once more sort orders are added.
+
+    Args:
+        key (Dict[str, Any]): Sort column values of the last (or first) row on the page.
+        direction (CursorDirectionEnum): Whether the cursor points to the next or the previous page.
+
+    Returns:
+        str: The encoded cursor.
+    """
+    payload = json.dumps({"k": key, "d": direction.value}, separators=(",", ":"), sort_keys=True)
+    return base64.urlsafe_b64encode(payload.encode()).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[Dict[str, Any], CursorDirectionEnum]:
+    """
+    Decode a cursor produced by `encode_cursor`.
+
+    Args:
+        cursor (str): The opaque cursor received from the client.
+
+    Returns:
+        Tuple[Dict[str, Any], CursorDirectionEnum]: The keyset position and the paging direction.
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        key = payload["k"]
+        direction = CursorDirectionEnum(payload["d"])
+    except (binascii.Error, UnicodeDecodeError, ValueError, KeyError, TypeError):
+        raise ValueError("Invalid cursor.")
+
+    if not isinstance(key, dict) or not key:
+        raise ValueError("Invalid cursor.")
+    return key, direction
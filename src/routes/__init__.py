@@ -1,3 +1,4 @@
 from routes.movies import router as movie_router
 from routes.accounts import router as accounts_router
 from routes.profiles import router as profiles_router
+from routes.database import router as database_router
@@ -1,15 +1,25 @@
+import logging
 from datetime import datetime, timezone
 from typing import cast
+from urllib.parse import urlencode
 
-from fastapi import APIRouter, Depends, status, HTTPException
-from sqlalchemy import select, delete
+from fastapi import APIRouter, BackgroundTasks, Depends, status, HTTPException
+from sqlalchemy import select, delete, update
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload
 
-from config import get_jwt_auth_manager, get_settings, BaseAppSettings, get_accounts_email_notificator
+from config import (
+    get_jwt_auth_manager,
+    get_settings,
+    BaseAppSettings,
+    get_accounts_email_notificator,
+    get_email_outbox_worker,
+    get_password_hasher
+)
 from database import (
     get_db,
+    get_db_contextmanager,
     UserModel,
     UserGroupModel,
     UserGroupEnum,
@@ -17,8 +27,9 @@ from database import (
     PasswordResetTokenModel,
     RefreshTokenModel
 )
-from exceptions import BaseSecurityError
-from notifications import EmailSenderInterface
+from exceptions import BaseSecurityError, PasswordHasherBusyError
+from notifications import BackgroundEmailSender, EmailSenderInterface
+from notifications.outbox import EmailOutboxWorker, OutboxEmailSender
 from schemas import (
     UserRegistrationRequestSchema,
     UserRegistrationResponseSchema,
@@ -29,12 +40,105 @@ from schemas import (
     UserLoginResponseSchema,
     UserLoginRequestSchema,
     TokenRefreshRequestSchema,
-    TokenRefreshResponseSchema
+    TokenRefreshResponseSchema,
+    EmailOutboxStatsSchema
 )
-from security.interfaces import JWTAuthManagerInterface
+from security.dependencies import ADMIN_AUTH_RESPONSES, get_current_admin_user
+from security.interfaces import JWTAuthManagerInterface, PasswordHasherInterface
 
 router = APIRouter()
 
+PASSWORD_HASHER_BUSY_RESPONSE = {
+    "description": "Service Unavailable - Too many password hashing requests are queued.",
+    "content": {
+        "application/json": {
+            "example": {
+                "detail": "Server is busy. Please try again later."
+            }
+        }
+    },
+}
+
+
+def password_hasher_busy_exception() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Server is busy. Please try again later.",
+        headers={"Retry-After": "1"}
+    )
+
+
+def build_account_link(settings: BaseAppSettings, path: str, **params: str) -> str:
+    """
+    Build an absolute link to an account endpoint for use in emails.
+    """
+    link = f"{settings.ACCOUNTS_BASE_URL.rstrip('/')}/{path}"
+    return f"{link}?{urlencode(params)}" if params else link
+
+
+def get_account_email_sender(
+        background_tasks: BackgroundTasks,
+        db: AsyncSession = Depends(get_db),
+        settings: BaseAppSettings = Depends(get_settings),
+        email_sender: EmailSenderInterface = Depends(get_accounts_email_notificator),
+) -> EmailSenderInterface:
+    """
+    Provide the sender the account endpoints call right before committing their changes.
+
+    With `EMAIL_OUTBOX_ENABLED` the message is added to the email outbox in the request's own
+    session, so it is committed together with the user or token it refers to. Otherwise it is
+    handed to `email_sender` once the response has succeeded, and a delivery error is logged.
+
+    Args:
+        background_tasks (BackgroundTasks): The background tasks of the request.
+        db (AsyncSession): The session of the request.
+        settings (BaseAppSettings): The application settings.
+        email_sender (EmailSenderInterface): The sender delivering the emails without the outbox.
+
+    Returns:
+        EmailSenderInterface: The sender bound to the request.
+    """
+    if settings.EMAIL_OUTBOX_ENABLED:
+        return OutboxEmailSender(db)
+    return BackgroundEmailSender(email_sender, background_tasks)
+
+
+async def rehash_password(
+        user_id: int,
+        old_hashed_password: str,
+        raw_password: str,
+        hasher: PasswordHasherInterface
+) -> None:
+    """
+    Replace a stored password hash made with an outdated scheme or cost.
+
+    Runs as a background task after a successful login. The update only applies while the stored
+    hash is still `old_hashed_password`, so a password changed in the meantime is never overwritten.
+    If the hasher is busy, the rehash is skipped and retried on the next login.
+
+    Args:
+        user_id (int): The ID of the user.
+        old_hashed_password (str): The hash that was verified at login.
+        raw_password (str): The plain-text password that was verified at login.
+        hasher (PasswordHasherInterface): The password hasher configured with the current policy.
+    """
+    try:
+        new_hashed_password = await hasher.hash(raw_password)
+    except PasswordHasherBusyError:
+        return
+
+    async with get_db_contextmanager() as db:
+        try:
+            await db.execute(
+                update(UserModel)
+                .where(UserModel.id == user_id, UserModel._hashed_password == old_hashed_password)
+                .values({UserModel._hashed_password: new_hashed_password})
+            )
+            await db.commit()
+        except SQLAlchemyError as e:
+            await db.rollback()
+            logging.error(f"Failed to rehash the password of user {user_id}: {e}")
+
 
 @router.post(
     "/register/",
@@ -63,22 +167,30 @@ router = APIRouter()
                 }
             },
         },
+        503: PASSWORD_HASHER_BUSY_RESPONSE,
     }
 )
 async def register_user(
         user_data: UserRegistrationRequestSchema,
         db: AsyncSession = Depends(get_db),
+        settings: BaseAppSettings = Depends(get_settings),
+        hasher: PasswordHasherInterface = Depends(get_password_hasher),
+        email_sender: EmailSenderInterface = Depends(get_account_email_sender),
 ) -> UserRegistrationResponseSchema:
     """
     Endpoint for user registration.
 
     Registers a new user, hashes their password, and assigns them to the default user group.
+    An activation email with the activation link is then sent to the user.
     If a user with the same email already exists, an HTTP 409 error is raised.
     In case of any unexpected issues during the creation process, an HTTP 500 error is returned.
 
     Args:
         user_data (UserRegistrationRequestSchema): The registration details including email and password.
         db (AsyncSession): The asynchronous database session.
+        settings (BaseAppSettings): The application settings.
+        hasher (PasswordHasherInterface): The password hasher running bcrypt off the event loop.
+        email_sender (EmailSenderInterface): The sender of the activation email.
 
     Returns:
         UserRegistrationResponseSchema: The newly created user's details.
@@ -87,6 +199,7 @@ async def register_user(
         HTTPException:
             - 409 Conflict if a user with the same email exists.
             - 500 Internal Server Error if an error occurs during user creation.
+            - 503 Service Unavailable if the password hashing queue is full.
     """
     stmt = select(UserModel).where(UserModel.email == user_data.email)
     result = await db.execute(stmt)
@@ -106,17 +219,24 @@ async def register_user(
             detail="Default user group not found."
         )
 
+    new_user = UserModel(email=str(user_data.email), group_id=user_group.id)
+    try:
+        await new_user.set_password_async(user_data.password, hasher)
+    except PasswordHasherBusyError as e:
+        raise password_hasher_busy_exception() from e
+
     try:
-        new_user = UserModel.create(
-            email=str(user_data.email),
-            raw_password=user_data.password,
-            group_id=user_group.id,
-        )
         db.add(new_user)
         await db.flush()
 
         activation_token = ActivationTokenModel(user_id=new_user.id)
         db.add(activation_token)
+        await db.flush()
+
+        activation_link = build_account_link(
+            settings, "activate/", email=new_user.email, token=activation_token.token
+        )
+        await email_sender.send_activation_email(new_user.email, activation_link)
 
         await db.commit()
         await db.refresh(new_user)
@@ -164,18 +284,22 @@ async def register_user(
 async def activate_account(
         activation_data: UserActivationRequestSchema,
         db: AsyncSession = Depends(get_db),
+        settings: BaseAppSettings = Depends(get_settings),
+        email_sender: EmailSenderInterface = Depends(get_account_email_sender),
 ) -> MessageResponseSchema:
     """
     Endpoint to activate a user's account.
 
     This endpoint verifies the activation token for a user by checking that the token record exists
     and that it has not expired. If the token is valid and the user's account is not already active,
-    the user's account is activated and the activation token is deleted. If the token is invalid, expired,
-    or if the account is already active, an HTTP 400 error is raised.
+    the user's account is activated, the activation token is deleted and a confirmation email is sent.
+    If the token is invalid, expired, or if the account is already active, an HTTP 400 error is raised.
 
     Args:
         activation_data (UserActivationRequestSchema): Contains the user's email and activation token.
         db (AsyncSession): The asynchronous database session.
+        settings (BaseAppSettings): The application settings.
+        email_sender (EmailSenderInterface): The sender of the confirmation email.
 
     Returns:
         MessageResponseSchema: A response message confirming successful activation.
@@ -216,6 +340,7 @@ async def activate_account(
 
     user.is_active = True
     await db.delete(token_record)
+    await email_sender.send_activation_complete_email(user.email, build_account_link(settings, "login/"))
     await db.commit()
 
     return MessageResponseSchema(message="User account activated successfully.")
@@ -234,16 +359,20 @@ async def activate_account(
 async def request_password_reset_token(
         data: PasswordResetRequestSchema,
         db: AsyncSession = Depends(get_db),
+        settings: BaseAppSettings = Depends(get_settings),
+        email_sender: EmailSenderInterface = Depends(get_account_email_sender),
 ) -> MessageResponseSchema:
     """
     Endpoint to request a password reset token.
 
-    If the user exists and is active, invalidates any existing password reset tokens and generates a new one.
-    Always responds with a success message to avoid leaking user information.
+    If the user exists and is active, invalidates any existing password reset tokens, generates a new one
+    and emails the reset link. Always responds with a success message to avoid leaking user information.
 
     Args:
         data (PasswordResetRequestSchema): The request data containing the user's email.
         db (AsyncSession): The asynchronous database session.
+        settings (BaseAppSettings): The application settings.
+        email_sender (EmailSenderInterface): The sender of the password reset email.
 
     Returns:
         MessageResponseSchema: A success message indicating that instructions will be sent.
@@ -261,6 +390,10 @@ async def request_password_reset_token(
 
     reset_token = PasswordResetTokenModel(user_id=cast(int, user.id))
     db.add(reset_token)
+    await db.flush()
+
+    reset_link = build_account_link(settings, "reset-password/complete/", email=user.email, token=reset_token.token)
+    await email_sender.send_password_reset_email(user.email, reset_link)
     await db.commit()
 
     return MessageResponseSchema(
@@ -309,22 +442,29 @@ async def request_password_reset_token(
                 }
             },
         },
+        503: PASSWORD_HASHER_BUSY_RESPONSE,
     },
 )
 async def reset_password(
         data: PasswordResetCompleteRequestSchema,
         db: AsyncSession = Depends(get_db),
+        settings: BaseAppSettings = Depends(get_settings),
+        hasher: PasswordHasherInterface = Depends(get_password_hasher),
+        email_sender: EmailSenderInterface = Depends(get_account_email_sender),
 ) -> MessageResponseSchema:
     """
     Endpoint for resetting a user's password.
 
     Validates the token and updates the user's password if the token is valid and not expired.
-    Deletes the token after a successful password reset.
+    Deletes the token and sends a confirmation email after a successful password reset.
 
     Args:
         data (PasswordResetCompleteRequestSchema): The request data containing the user's email,
          token, and new password.
         db (AsyncSession): The asynchronous database session.
+        settings (BaseAppSettings): The application settings.
+        hasher (PasswordHasherInterface): The password hasher running bcrypt off the event loop.
+        email_sender (EmailSenderInterface): The sender of the confirmation email.
 
     Returns:
         MessageResponseSchema: A response message indicating successful password reset.
@@ -333,6 +473,7 @@ async def reset_password(
         HTTPException:
             - 400 Bad Request if the email or token is invalid, or the token has expired.
             - 500 Internal Server Error if an error occurs during the password reset process.
+            - 503 Service Unavailable if the password hashing queue is full.
     """
     stmt = select(UserModel).filter_by(email=data.email)
     result = await db.execute(stmt)
@@ -366,8 +507,13 @@ async def reset_password(
         )
 
     try:
-        user.password = data.password
+        await user.set_password_async(data.password, hasher)
+    except PasswordHasherBusyError as e:
+        raise password_hasher_busy_exception() from e
+
+    try:
         await db.run_sync(lambda s: s.delete(token_record))
+        await email_sender.send_password_reset_complete_email(user.email, build_account_link(settings, "login/"))
         await db.commit()
     except SQLAlchemyError:
         await db.rollback()
@@ -416,25 +562,31 @@ async def reset_password(
                 }
             },
         },
+        503: PASSWORD_HASHER_BUSY_RESPONSE,
     },
 )
 async def login_user(
         login_data: UserLoginRequestSchema,
+        background_tasks: BackgroundTasks,
         db: AsyncSession = Depends(get_db),
         settings: BaseAppSettings = Depends(get_settings),
         jwt_manager: JWTAuthManagerInterface = Depends(get_jwt_auth_manager),
+        hasher: PasswordHasherInterface = Depends(get_password_hasher),
 ) -> UserLoginResponseSchema:
     """
     Endpoint for user login.
 
     Authenticates a user using their email and password.
     If authentication is successful, creates a new refresh token and returns both access and refresh tokens.
+    If the stored hash no longer matches the configured hashing policy, it is replaced in the background.
 
     Args:
         login_data (UserLoginRequestSchema): The login credentials.
+        background_tasks (BackgroundTasks): Tasks run after the response is sent.
         db (AsyncSession): The asynchronous database session.
         settings (BaseAppSettings): The application settings.
         jwt_manager (JWTAuthManagerInterface): The JWT authentication manager.
+        hasher (PasswordHasherInterface): The password hasher running bcrypt off the event loop.
 
     Returns:
         UserLoginResponseSchema: A response containing the access and refresh tokens.
@@ -444,12 +596,18 @@ async def login_user(
             - 401 Unauthorized if the email or password is invalid.
             - 403 Forbidden if the user account is not activated.
             - 500 Internal Server Error if an error occurs during token creation.
+            - 503 Service Unavailable if the password hashing queue is full.
     """
     stmt = select(UserModel).filter_by(email=login_data.email)
     result = await db.execute(stmt)
     user = result.scalars().first()
 
-    if not user or not user.verify_password(login_data.password):
+    try:
+        is_valid_password = user is not None and await user.verify_password_async(login_data.password, hasher)
+    except PasswordHasherBusyError as e:
+        raise password_hasher_busy_exception() from e
+
+    if not is_valid_password:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password.",
@@ -479,6 +637,9 @@ async def login_user(
             detail="An error occurred while processing the request.",
         )
 
+    if hasher.needs_update(user.hashed_password):
+        background_tasks.add_task(rehash_password, user.id, user.hashed_password, login_data.password, hasher)
+
     jwt_access_token = jwt_manager.create_access_token({"user_id": user.id})
     return UserLoginResponseSchema(
         access_token=jwt_access_token,
@@ -580,3 +741,31 @@ async def refresh_access_token(
     new_access_token = jwt_manager.create_access_token({"user_id": user_id})
 
     return TokenRefreshResponseSchema(access_token=new_access_token)
+
+
+@router.get(
+    "/email-outbox/stats/",
+    response_model=EmailOutboxStatsSchema,
+    summary="Get email outbox statistics",
+    description="Return the number of queued, sent and failed emails and the age of the oldest queued one. "
+                "Only admins can access this endpoint.",
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(get_current_admin_user)],
+    responses=ADMIN_AUTH_RESPONSES,
+)
+async def get_email_outbox_stats(
+        worker: EmailOutboxWorker = Depends(get_email_outbox_worker),
+) -> EmailOutboxStatsSchema:
+    """
+    Endpoint reporting the queue depth of the email outbox.
+
+    Args:
+        worker (EmailOutboxWorker): The email outbox worker.
+
+    Returns:
+        EmailOutboxStatsSchema: Message counts per status and the age of the oldest pending message.
+
+    Raises:
+        HTTPException: 401 Unauthorized or 403 Forbidden unless the request is made by an active admin.
+    """
+    return EmailOutboxStatsSchema(**await worker.stats())
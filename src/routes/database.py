@@ -0,0 +1,55 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from database import get_db_engine
+from database.pool import InstrumentedAsyncQueuePool
+from schemas import DatabasePoolStatsSchema
+from security.dependencies import ADMIN_AUTH_RESPONSES, get_current_admin_user
+
+router = APIRouter()
+
+
+@router.get(
+    "/pool/stats/",
+    response_model=DatabasePoolStatsSchema,
+    summary="Get database connection pool statistics",
+    description=(
+            "<h3>Return the occupancy of this worker's connection pool together with "
+            "the number of checkouts, the overflow and the time spent waiting for a connection. "
+            "Only admins can access this endpoint.</h3>"
+    ),
+    dependencies=[Depends(get_current_admin_user)],
+    responses={
+        **ADMIN_AUTH_RESPONSES,
+        404: {
+            "description": "The database engine does not collect pool statistics.",
+            "content": {
+                "application/json": {
+                    "example": {"detail": "Connection pool statistics are not available."}
+                }
+            },
+        },
+    }
+)
+async def get_database_pool_stats(
+        engine: AsyncEngine = Depends(get_db_engine),
+) -> DatabasePoolStatsSchema:
+    """
+    Report the connection pool counters as seen by this worker.
+
+    :param engine: The database engine (provided via dependency injection).
+    :type engine: AsyncEngine
+
+    :return: The pool occupancy, checkout counters and wait times.
+    :rtype: DatabasePoolStatsSchema
+
+    :raises HTTPException: Raises a 401 or 403 error unless the request is made by an active admin,
+                           and a 404 error if the engine's pool is not instrumented.
+    """
+    pool = engine.pool
+    if not isinstance(pool, InstrumentedAsyncQueuePool):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Connection pool statistics are not available."
+        )
+    return DatabasePoolStatsSchema(**pool.stats())
@@ -1,26 +1,39 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy import select, func
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import select
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import joinedload
 
-from database import get_db, MovieModel
+from caches import CacheInterface, CountModeEnum, CountTypeEnum, RowCountProvider
+from config import get_cache, get_movie_count_provider, get_settings, BaseAppSettings
+from database import get_db, get_read_db, MovieModel
 from database import (
     CountryModel,
     GenreModel,
     ActorModel,
     LanguageModel
 )
+from database.bulk import get_or_create_bulk
+from database.loading import load_movie_detail
+from database.routing import reads_from_replica, reads_own_writes
+from pagination import CursorDirectionEnum, encode_cursor, decode_cursor
 from schemas import (
     MovieListResponseSchema,
     MovieListItemSchema,
-    MovieDetailSchema
+    MovieDetailSchema,
+    CacheStatsSchema
 )
 from schemas.movies import MovieCreateSchema, MovieUpdateSchema
+from security.dependencies import ADMIN_AUTH_RESPONSES, get_current_admin_user
 
 router = APIRouter()
 
 
+def movie_detail_cache_key(movie_id: int) -> str:
+    return f"movies:detail:{movie_id}"
+
+
 @router.get(
     "/movies/",
     response_model=MovieListResponseSchema,
@@ -30,8 +43,20 @@ router = APIRouter()
             "Clients can specify the `page` number and the number of items per page using `per_page`. "
             "The response includes details about the movies, total pages, and total items, "
             "along with links to the previous and next pages if applicable.</h3>"
+            "<p>For deep pagination pass the opaque `cursor` returned in `next_cursor`/`prev_cursor` "
+            "instead of `page`: every cursor page costs the same as the first one.</p>"
+            "<p>`count` selects how `total_items` is obtained: `exact`, `cached` (default) or `estimate` "
+            "(planner statistics, PostgreSQL only). The response reports the result in `count_type`.</p>"
     ),
     responses={
+        400: {
+            "description": "Invalid cursor.",
+            "content": {
+                "application/json": {
+                    "example": {"detail": "Invalid cursor."}
+                }
+            },
+        },
         404: {
             "description": "No movies found.",
             "content": {
@@ -43,9 +68,16 @@ router = APIRouter()
     }
 )
 async def get_movie_list(
+        request: Request,
         page: int = Query(1, ge=1, description="Page number (1-based index)"),
         per_page: int = Query(10, ge=1, le=20, description="Number of items per page"),
-        db: AsyncSession = Depends(get_db),
+        cursor: Optional[str] = Query(
+            None,
+            description="Opaque keyset cursor from `next_cursor`/`prev_cursor`. Takes precedence over `page`."
+        ),
+        count: CountModeEnum = Query(CountModeEnum.CACHED, description="How to compute `total_items`"),
+        db: AsyncSession = Depends(get_read_db),
+        count_provider: RowCountProvider = Depends(get_movie_count_provider),
 ) -> MovieListResponseSchema:
     """
     Fetch a paginated list of movies from the database (asynchronously).
@@ -54,27 +86,52 @@ async def get_movie_list(
     the page number and the number of items per page. It calculates the total pages
     and provides links to the previous and next pages when applicable.
 
+    When a `cursor` is given, the page is located with a keyset condition on the sort key
+    (`id < last_id` / `id > first_id`) instead of an OFFSET, so deep pages do not scan
+    and discard the rows before them.
+
+    A client that has just written skips the cached count, and counts read on a replica are
+    not cached, so a lagging replica cannot refill the count invalidated by a write.
+
+    :param request: The incoming request, carrying the read-your-writes cookie.
+    :type request: Request
     :param page: The page number to retrieve (1-based index, must be >= 1).
     :type page: int
     :param per_page: The number of items to display per page (must be between 1 and 20).
     :type per_page: int
+    :param cursor: An opaque cursor returned by a previous response (optional).
+    :type cursor: Optional[str]
+    :param count: The counting mode for `total_items` (exact, cached or estimate).
+    :type count: CountModeEnum
     :param db: The async SQLAlchemy database session (provided via dependency injection).
     :type db: AsyncSession
+    :param count_provider: The shared row count provider (provided via dependency injection).
+    :type count_provider: RowCountProvider
 
     :return: A response containing the paginated list of movies and metadata.
     :rtype: MovieListResponseSchema
 
-    :raises HTTPException: Raises a 404 error if no movies are found for the requested page.
+    :raises HTTPException: Raises a 400 error if the cursor is malformed and a 404 error
+        if no movies are found for the requested page.
     """
-    offset = (page - 1) * per_page
-
-    count_stmt = select(func.count(MovieModel.id))
-    result_count = await db.execute(count_stmt)
-    total_items = result_count.scalar() or 0
+    total_items, count_type = await count_provider.count(
+        db,
+        MovieModel.__table__,
+        count,
+        use_cached=not reads_own_writes(request),
+        store=not reads_from_replica(db)
+    )
 
     if not total_items:
         raise HTTPException(status_code=404, detail="No movies found.")
 
+    total_pages = (total_items + per_page - 1) // per_page
+
+    if cursor is not None:
+        return await _get_movie_list_by_cursor(cursor, per_page, total_items, total_pages, count_type, db)
+
+    offset = (page - 1) * per_page
+
     order_by = MovieModel.default_order_by()
     stmt = select(MovieModel)
     if order_by:
@@ -90,18 +147,78 @@ async def get_movie_list(
 
     movie_list = [MovieListItemSchema.model_validate(movie) for movie in movies]
 
-    total_pages = (total_items + per_page - 1) // per_page
-
     response = MovieListResponseSchema(
         movies=movie_list,
         prev_page=f"/theater/movies/?page={page - 1}&per_page={per_page}" if page > 1 else None,
         next_page=f"/theater/movies/?page={page + 1}&per_page={per_page}" if page < total_pages else None,
+        prev_cursor=encode_cursor({"id": movies[0].id}, CursorDirectionEnum.PREV) if page > 1 else None,
+        next_cursor=(
+            encode_cursor({"id": movies[-1].id}, CursorDirectionEnum.NEXT) if page < total_pages else None
+        ),
         total_pages=total_pages,
         total_items=total_items,
+        count_type=count_type,
     )
     return response
 
 
+async def _get_movie_list_by_cursor(
+        cursor: str,
+        per_page: int,
+        total_items: int,
+        total_pages: int,
+        count_type: CountTypeEnum,
+        db: AsyncSession
+) -> MovieListResponseSchema:
+    """
+    Fetch one page of movies positioned by a keyset cursor.
+
+    One extra row is requested to find out whether another page exists in the paging direction.
+    Pages fetched backwards are read in ascending order and reversed, so the returned
+    movies always follow `MovieModel.default_order_by()` (`id DESC`).
+    """
+    try:
+        key, direction = decode_cursor(cursor)
+        boundary_id = int(key["id"])
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor.")
+
+    stmt = select(MovieModel)
+    if direction == CursorDirectionEnum.NEXT:
+        stmt = stmt.where(MovieModel.id < boundary_id).order_by(MovieModel.id.desc())
+    else:
+        stmt = stmt.where(MovieModel.id > boundary_id).order_by(MovieModel.id.asc())
+    stmt = stmt.limit(per_page + 1)
+
+    result_movies = await db.execute(stmt)
+    movies = list(result_movies.scalars().all())
+
+    has_more = len(movies) > per_page
+    movies = movies[:per_page]
+    if direction == CursorDirectionEnum.PREV:
+        movies.reverse()
+
+    if not movies:
+        raise HTTPException(status_code=404, detail="No movies found.")
+
+    has_next = has_more if direction == CursorDirectionEnum.NEXT else True
+    has_prev = has_more if direction == CursorDirectionEnum.PREV else True
+
+    next_cursor = encode_cursor({"id": movies[-1].id}, CursorDirectionEnum.NEXT) if has_next else None
+    prev_cursor = encode_cursor({"id": movies[0].id}, CursorDirectionEnum.PREV) if has_prev else None
+
+    return MovieListResponseSchema(
+        movies=[MovieListItemSchema.model_validate(movie) for movie in movies],
+        prev_page=f"/theater/movies/?cursor={prev_cursor}&per_page={per_page}" if prev_cursor else None,
+        next_page=f"/theater/movies/?cursor={next_cursor}&per_page={per_page}" if next_cursor else None,
+        prev_cursor=prev_cursor,
+        next_cursor=next_cursor,
+        total_pages=total_pages,
+        total_items=total_items,
+        count_type=count_type,
+    )
+
+
 @router.post(
     "/movies/",
     response_model=MovieDetailSchema,
@@ -129,19 +246,26 @@ async def get_movie_list(
 )
 async def create_movie(
         movie_data: MovieCreateSchema,
-        db: AsyncSession = Depends(get_db)
+        db: AsyncSession = Depends(get_db),
+        count_provider: RowCountProvider = Depends(get_movie_count_provider),
+        cache: CacheInterface = Depends(get_cache),
 ) -> MovieDetailSchema:
     """
     Add a new movie to the database.
 
     This endpoint allows the creation of a new movie with details such as
     name, release date, genres, actors, and languages. It automatically
-    handles linking or creating related entities.
+    handles linking or creating related entities, resolving each entity type
+    with one lookup and at most one multi-row insert.
 
     :param movie_data: The data required to create a new movie.
     :type movie_data: MovieCreateSchema
     :param db: The SQLAlchemy async database session (provided via dependency injection).
     :type db: AsyncSession
+    :param count_provider: The shared row count provider, invalidated after the insert.
+    :type count_provider: RowCountProvider
+    :param cache: The shared cache, whose detail entry for the new movie id is invalidated.
+    :type cache: CacheInterface
 
     :return: The created movie with all details.
     :rtype: MovieDetailSchema
@@ -167,49 +291,15 @@ async def create_movie(
         )
 
     try:
-        country_stmt = select(CountryModel).where(CountryModel.code == movie_data.country)
-        country_result = await db.execute(country_stmt)
-        country = country_result.scalars().first()
-        if not country:
-            country = CountryModel(code=movie_data.country)
-            db.add(country)
-            await db.flush()
-
-        genres = []
-        for genre_name in movie_data.genres:
-            genre_stmt = select(GenreModel).where(GenreModel.name == genre_name)
-            genre_result = await db.execute(genre_stmt)
-            genre = genre_result.scalars().first()
-
-            if not genre:
-                genre = GenreModel(name=genre_name)
-                db.add(genre)
-                await db.flush()
-            genres.append(genre)
-
-        actors = []
-        for actor_name in movie_data.actors:
-            actor_stmt = select(ActorModel).where(ActorModel.name == actor_name)
-            actor_result = await db.execute(actor_stmt)
-            actor = actor_result.scalars().first()
-
-            if not actor:
-                actor = ActorModel(name=actor_name)
-                db.add(actor)
-                await db.flush()
-            actors.append(actor)
-
-        languages = []
-        for language_name in movie_data.languages:
-            lang_stmt = select(LanguageModel).where(LanguageModel.name == language_name)
-            lang_result = await db.execute(lang_stmt)
-            language = lang_result.scalars().first()
-
-            if not language:
-                language = LanguageModel(name=language_name)
-                db.add(language)
-                await db.flush()
-            languages.append(language)
+        country_map = await get_or_create_bulk(db, CountryModel, [movie_data.country], "code")
+        genre_map = await get_or_create_bulk(db, GenreModel, movie_data.genres, "name")
+        actor_map = await get_or_create_bulk(db, ActorModel, movie_data.actors, "name")
+        language_map = await get_or_create_bulk(db, LanguageModel, movie_data.languages, "name")
+
+        country = country_map[movie_data.country]
+        genres = list(genre_map.values())
+        actors = list(actor_map.values())
+        languages = list(language_map.values())
 
         movie = MovieModel(
             name=movie_data.name,
@@ -226,6 +316,8 @@ async def create_movie(
         )
         db.add(movie)
         await db.commit()
+        await count_provider.invalidate(MovieModel.__table__)
+        await cache.delete(movie_detail_cache_key(movie.id))
         await db.refresh(movie, ["genres", "actors", "languages"])
 
         return MovieDetailSchema.model_validate(movie)
@@ -235,6 +327,34 @@ async def create_movie(
         raise HTTPException(status_code=400, detail="Invalid input data.")
 
 
+@router.get(
+    "/movies/cache/stats/",
+    response_model=CacheStatsSchema,
+    summary="Get movie detail cache statistics",
+    description=(
+            "<h3>Return the hit, miss, eviction and expiration counters of this worker's cache. "
+            "Only admins can access this endpoint.</h3>"
+    ),
+    dependencies=[Depends(get_current_admin_user)],
+    responses=ADMIN_AUTH_RESPONSES
+)
+async def get_movie_detail_cache_stats(
+        cache: CacheInterface = Depends(get_cache),
+) -> CacheStatsSchema:
+    """
+    Report the counters of the cache backend as seen by this worker.
+
+    :param cache: The shared cache (provided via dependency injection).
+    :type cache: CacheInterface
+
+    :return: The cache counters and its current size.
+    :rtype: CacheStatsSchema
+
+    :raises HTTPException: Raises a 401 or 403 error unless the request is made by an active admin.
+    """
+    return CacheStatsSchema(**cache.stats())
+
+
 @router.get(
     "/movies/{movie_id}/",
     response_model=MovieDetailSchema,
@@ -257,46 +377,57 @@ async def create_movie(
     }
 )
 async def get_movie_by_id(
+        request: Request,
         movie_id: int,
-        db: AsyncSession = Depends(get_db),
-) -> MovieDetailSchema:
+        db: AsyncSession = Depends(get_read_db),
+        settings: BaseAppSettings = Depends(get_settings),
+        cache: CacheInterface = Depends(get_cache),
+) -> Response:
     """
     Retrieve detailed information about a specific movie by its ID.
 
     This function fetches detailed information about a movie identified by its unique ID.
-    If the movie does not exist, a 404 error is returned.
+    If the movie does not exist, a 404 error is returned. Relationships are loaded with
+    the strategy configured in `MOVIE_DETAIL_LOADING_STRATEGY` (see `database.loading`).
+
+    The serialized JSON payload is kept in the shared cache for `MOVIE_DETAIL_CACHE_TTL_SECONDS`,
+    so repeated reads skip both the query and `MovieDetailSchema` validation. Write endpoints
+    invalidate the entry in every worker. A client that has just written bypasses the cache, and
+    only payloads read on the primary are cached, so a lagging replica cannot refill an entry
+    invalidated by a write with the data from before it.
 
+    :param request: The incoming request, carrying the read-your-writes cookie.
+    :type request: Request
     :param movie_id: The unique identifier of the movie to retrieve.
     :type movie_id: int
     :param db: The SQLAlchemy database session (provided via dependency injection).
     :type db: AsyncSession
+    :param settings: The application settings (provided via dependency injection).
+    :type settings: BaseAppSettings
+    :param cache: The shared cache (provided via dependency injection).
+    :type cache: CacheInterface
 
-    :return: The details of the requested movie.
-    :rtype: MovieDetailResponseSchema
+    :return: The details of the requested movie as a JSON response.
+    :rtype: Response
 
     :raises HTTPException: Raises a 404 error if the movie with the given ID is not found.
     """
-    stmt = (
-        select(MovieModel)
-        .options(
-            joinedload(MovieModel.country),
-            joinedload(MovieModel.genres),
-            joinedload(MovieModel.actors),
-            joinedload(MovieModel.languages),
-        )
-        .where(MovieModel.id == movie_id)
-    )
-
-    result = await db.execute(stmt)
-    movie = result.scalars().first()
+    cache_key = movie_detail_cache_key(movie_id)
+    payload = None if reads_own_writes(request) else await cache.get(cache_key)
+    if payload is None:
+        movie = await load_movie_detail(db, movie_id, settings.MOVIE_DETAIL_LOADING_STRATEGY)
+
+        if not movie:
+            raise HTTPException(
+                status_code=404,
+                detail="Movie with the given ID was not found."
+            )
 
-    if not movie:
-        raise HTTPException(
-            status_code=404,
-            detail="Movie with the given ID was not found."
-        )
+        payload = MovieDetailSchema.model_validate(movie).model_dump_json().encode()
+        if not reads_from_replica(db):
+            await cache.set(cache_key, payload, settings.MOVIE_DETAIL_CACHE_TTL_SECONDS)
 
-    return MovieDetailSchema.model_validate(movie)
+    return Response(content=payload, media_type="application/json")
 
 
 @router.delete(
@@ -325,6 +456,8 @@ async def get_movie_by_id(
 async def delete_movie(
         movie_id: int,
         db: AsyncSession = Depends(get_db),
+        count_provider: RowCountProvider = Depends(get_movie_count_provider),
+        cache: CacheInterface = Depends(get_cache),
 ):
     """
     Delete a specific movie by its ID.
@@ -336,6 +469,10 @@ async def delete_movie(
     :type movie_id: int
     :param db: The SQLAlchemy database session (provided via dependency injection).
     :type db: AsyncSession
+    :param count_provider: The shared row count provider, invalidated after the delete.
+    :type count_provider: RowCountProvider
+    :param cache: The shared cache, whose detail entry for the movie is invalidated.
+    :type cache: CacheInterface
 
     :raises HTTPException: Raises a 404 error if the movie with the given ID is not found.
 
@@ -354,6 +491,8 @@ async def delete_movie(
 
     await db.delete(movie)
     await db.commit()
+    await count_provider.invalidate(MovieModel.__table__)
+    await cache.delete(movie_detail_cache_key(movie_id))
 
     return {"detail": "Movie deleted successfully."}
 
@@ -389,6 +528,7 @@ async def update_movie(
         movie_id: int,
         movie_data: MovieUpdateSchema,
         db: AsyncSession = Depends(get_db),
+        cache: CacheInterface = Depends(get_cache),
 ):
     """
     Update a specific movie by its ID.
@@ -402,6 +542,8 @@ async def update_movie(
     :type movie_data: MovieUpdateSchema
     :param db: The SQLAlchemy database session (provided via dependency injection).
     :type db: AsyncSession
+    :param cache: The shared cache, whose detail entry for the movie is invalidated.
+    :type cache: CacheInterface
 
     :raises HTTPException: Raises a 404 error if the movie with the given ID is not found.
 
@@ -428,4 +570,6 @@ async def update_movie(
         await db.rollback()
         raise HTTPException(status_code=400, detail="Invalid input data.")
 
+    await cache.delete(movie_detail_cache_key(movie_id))
+
     return {"detail": "Movie updated successfully."}
@@ -1,5 +1,645 @@
-from fastapi import APIRouter
+import asyncio
+import logging
+import secrets
+from typing import Dict, Optional, Tuple
+
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, status
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+
+from config import (
+    get_s3_storage_client,
+    get_avatar_pipeline,
+    get_settings,
+    BaseAppSettings
+)
+from database import get_db, UserModel, UserGroupEnum, UserProfileModel
+from exceptions import BaseS3Error
+from schemas import (
+    ProfileCreateSchema,
+    ProfileUpdateSchema,
+    ProfileResponseSchema,
+    AvatarUploadRequestSchema,
+    AvatarUploadResponseSchema,
+    AvatarConfirmRequestSchema
+)
+from security.dependencies import UNAUTHORIZED_RESPONSE, get_current_user_id
+from storages import AvatarPipeline, S3StorageInterface, IMMUTABLE_CACHE_CONTROL, iter_upload_file
+from storages.avatars import SUPPORTED_AVATAR_CONTENT_TYPES
 
 router = APIRouter()
 
-# Write your code here
+AVATAR_READ_CHUNK_SIZE = 64 * 1024
+
+AUTH_RESPONSES = {
+    401: UNAUTHORIZED_RESPONSE,
+    403: {
+        "description": "Forbidden - The user may only access their own profile unless they are an admin.",
+        "content": {
+            "application/json": {
+                "example": {
+                    "detail": "You don't have permission to edit this profile."
+                }
+            }
+        },
+    },
+}
+
+AVATAR_UPLOAD_ERROR_RESPONSE = {
+    "description": "Internal Server Error - The avatar could not be uploaded.",
+    "content": {
+        "application/json": {
+            "example": {
+                "detail": "Failed to upload avatar. Please try again later."
+            }
+        }
+    },
+}
+
+
+def avatar_key_prefix(user_id: int) -> str:
+    """
+    Storage key prefix of a user's avatars; the avatar pipeline appends a hash of the image.
+
+    :param user_id: The ID of the user.
+    :return: The key prefix.
+    """
+    return f"avatars/{user_id}_"
+
+
+def avatar_upload_prefix(user_id: int) -> str:
+    """
+    Storage key prefix of the avatars a user uploads directly to the storage.
+
+    :param user_id: The ID of the user.
+    :return: The key prefix.
+    """
+    return f"avatars/uploads/{user_id}/"
+
+
+def avatar_validation_exception(error: ValueError) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        detail=[{"type": "value_error", "loc": ["body", "avatar"], "msg": str(error)}]
+    )
+
+
+async def read_avatar(avatar: UploadFile, pipeline: AvatarPipeline) -> bytes:
+    """
+    Read an uploaded avatar chunk by chunk, stopping one byte past the size limit, so an oversized
+    upload is never loaded whole.
+
+    :param avatar: The uploaded avatar.
+    :param pipeline: The avatar pipeline whose size limit applies.
+    :return: The avatar contents.
+    """
+    limit = pipeline.max_file_size + 1
+    contents = bytearray()
+    async for chunk in iter_upload_file(avatar, chunk_size=AVATAR_READ_CHUNK_SIZE):
+        contents += chunk[:limit - len(contents)]
+        if len(contents) >= limit:
+            break
+    return bytes(contents)
+
+
+async def load_users(
+        db: AsyncSession,
+        current_user_id: int,
+        user_id: int,
+        forbidden_detail: str = "You don't have permission to edit this profile."
+) -> Tuple[UserModel, UserModel]:
+    """
+    Fetch the requesting and the target user, with their groups and profiles, in a single query,
+    and check that the requesting user may access the target user's profile.
+
+    :param db: The asynchronous database session.
+    :param current_user_id: The ID of the authenticated user.
+    :param user_id: The ID of the user whose profile is accessed.
+    :param forbidden_detail: The error message when access is denied.
+    :return: The requesting user and the target user.
+    :raises HTTPException:
+        - 401 Unauthorized if either user does not exist or is not active.
+        - 403 Forbidden if a non-admin accesses another user's profile.
+    """
+    stmt = (
+        select(UserModel)
+        .options(joinedload(UserModel.group), joinedload(UserModel.profile))
+        .where(UserModel.id.in_({current_user_id, user_id}))
+    )
+    result = await db.execute(stmt)
+    users = {user.id: user for user in result.unique().scalars().all()}
+
+    current_user = users.get(current_user_id)
+    if not current_user or not current_user.is_active:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found or not active.")
+
+    if current_user_id != user_id and not current_user.has_group(UserGroupEnum.ADMIN):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=forbidden_detail)
+
+    user = users.get(user_id)
+    if not user or not user.is_active:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found or not active.")
+
+    return current_user, user
+
+
+async def validate_avatar_and_load_users(
+        pipeline: AvatarPipeline,
+        contents: bytes,
+        db: AsyncSession,
+        current_user_id: int,
+        user_id: int
+) -> Tuple[UserModel, UserModel]:
+    """
+    Validate an avatar in the avatar pipeline's worker pool while the users are loaded.
+
+    A permission error takes precedence over a validation error, so a user who may not edit the
+    profile never learns whether the submitted avatar was valid.
+
+    :param pipeline: The avatar pipeline.
+    :param contents: The avatar contents.
+    :param db: The asynchronous database session.
+    :param current_user_id: The ID of the authenticated user.
+    :param user_id: The ID of the user whose profile is accessed.
+    :return: The requesting user and the target user.
+    :raises HTTPException:
+        - 401 Unauthorized if either user does not exist or is not active.
+        - 403 Forbidden if a non-admin accesses another user's profile.
+        - 422 Unprocessable Entity if the avatar is invalid.
+    """
+    validation, users = await asyncio.gather(
+        pipeline.validate(contents),
+        load_users(db, current_user_id, user_id),
+        return_exceptions=True
+    )
+    if isinstance(users, HTTPException) and users.status_code == status.HTTP_403_FORBIDDEN:
+        raise users
+    if isinstance(validation, ValueError):
+        raise avatar_validation_exception(validation)
+    for outcome in (validation, users):
+        if isinstance(outcome, BaseException):
+            raise outcome
+    return users
+
+
+async def build_profile_response(
+        profile: UserProfileModel,
+        s3_client: S3StorageInterface
+) -> ProfileResponseSchema:
+    return ProfileResponseSchema(
+        id=profile.id,
+        user_id=profile.user_id,
+        first_name=profile.first_name,
+        last_name=profile.last_name,
+        gender=profile.gender,
+        date_of_birth=profile.date_of_birth,
+        info=profile.info,
+        avatar=await s3_client.get_file_url(profile.avatar) if profile.avatar else None
+    )
+
+
+async def render_avatar(
+        pipeline: AvatarPipeline,
+        user_id: int,
+        contents: bytes
+) -> Tuple[str, Dict[str, Tuple[str, bytes, str]]]:
+    """
+    Normalize an avatar off the event loop, translating failures into HTTP errors.
+
+    :return: The content-addressed key of the main variant, and all rendered variants.
+    :raises HTTPException: 422 Unprocessable Entity if the avatar cannot be decoded.
+    """
+    try:
+        variants = await pipeline.render(avatar_key_prefix(user_id), contents)
+    except ValueError as error:
+        raise avatar_validation_exception(error)
+    main_key, _, _ = next(iter(variants.values()))
+    return main_key, variants
+
+
+async def upload_avatar(
+        pipeline: AvatarPipeline,
+        s3_client: S3StorageInterface,
+        user_id: int,
+        variants: Dict[str, Tuple[str, bytes, str]]
+) -> Dict[str, str]:
+    """
+    Upload rendered avatar variants, translating failures into HTTP errors.
+
+    :raises HTTPException: 500 Internal Server Error if the upload fails.
+    """
+    try:
+        return await pipeline.upload(s3_client, variants)
+    except BaseS3Error as error:
+        logging.error(f"Failed to upload the avatar of user {user_id}: {error}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to upload avatar. Please try again later."
+        )
+
+
+async def delete_avatar(
+        pipeline: AvatarPipeline,
+        s3_client: S3StorageInterface,
+        keys: Dict[str, str]
+) -> None:
+    """
+    Compensate an avatar upload whose profile could not be saved. Failures are only logged.
+    """
+    try:
+        await pipeline.delete(s3_client, keys)
+    except BaseS3Error as error:
+        logging.error(f"Failed to delete orphaned avatar {keys}: {error}")
+
+
+@router.get(
+    "/users/{user_id}/profile/",
+    response_model=ProfileResponseSchema,
+    summary="Get user profile",
+    description="Retrieve the profile of a user. Users can read their own profile, admins any profile.",
+    responses={
+        **AUTH_RESPONSES,
+        404: {
+            "description": "Not Found - The user has no profile.",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "detail": "User profile not found."
+                    }
+                }
+            },
+        },
+    },
+)
+async def get_profile(
+        user_id: int,
+        current_user_id: int = Depends(get_current_user_id),
+        db: AsyncSession = Depends(get_db),
+        s3_client: S3StorageInterface = Depends(get_s3_storage_client),
+) -> ProfileResponseSchema:
+    """
+    Retrieve a user profile.
+
+    :param user_id: The ID of the user whose profile is requested.
+    :param current_user_id: The ID of the authenticated user, decoded from the access token.
+    :param db: The asynchronous database session.
+    :param s3_client: The storage used to build the avatar URL.
+    :return: The user profile.
+    :raises HTTPException:
+        - 401 Unauthorized if the token is invalid or either user is not active.
+        - 403 Forbidden if a non-admin requests another user's profile.
+        - 404 Not Found if the user has no profile.
+    """
+    _, user = await load_users(
+        db, current_user_id, user_id, forbidden_detail="You don't have permission to view this profile."
+    )
+    if not user.profile:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User profile not found.")
+    return await build_profile_response(user.profile, s3_client)
+
+
+@router.post(
+    "/users/{user_id}/profile/",
+    response_model=ProfileResponseSchema,
+    summary="Create user profile",
+    description="Create a profile with an avatar. Users can create their own profile, admins any profile.",
+    status_code=status.HTTP_201_CREATED,
+    responses={
+        **AUTH_RESPONSES,
+        400: {
+            "description": "Bad Request - The user already has a profile.",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "detail": "User already has a profile."
+                    }
+                }
+            },
+        },
+        500: AVATAR_UPLOAD_ERROR_RESPONSE,
+    },
+)
+async def create_profile(
+        user_id: int,
+        current_user_id: int = Depends(get_current_user_id),
+        profile_data: ProfileCreateSchema = Depends(ProfileCreateSchema.from_form),
+        db: AsyncSession = Depends(get_db),
+        s3_client: S3StorageInterface = Depends(get_s3_storage_client),
+        pipeline: AvatarPipeline = Depends(get_avatar_pipeline),
+) -> ProfileResponseSchema:
+    """
+    Create a user profile.
+
+    The avatar is validated in the avatar pipeline's worker pool while the users are loaded, and
+    uploaded while the profile row is inserted. The row is only committed once the upload has
+    succeeded; if the insert fails instead, the uploaded avatar is deleted again.
+
+    :param user_id: The ID of the user the profile is created for.
+    :param current_user_id: The ID of the authenticated user, decoded from the access token.
+    :param profile_data: The validated profile form.
+    :param db: The asynchronous database session.
+    :param s3_client: The storage the avatar is uploaded to.
+    :param pipeline: The avatar pipeline.
+    :return: The created profile.
+    :raises HTTPException:
+        - 400 Bad Request if the user already has a profile.
+        - 401 Unauthorized if the token is invalid or either user is not active.
+        - 403 Forbidden if a non-admin creates another user's profile.
+        - 422 Unprocessable Entity if the form or the avatar is invalid.
+        - 500 Internal Server Error if the avatar upload or the insert fails.
+    """
+    contents = await read_avatar(profile_data.avatar, pipeline)
+    _, user = await validate_avatar_and_load_users(pipeline, contents, db, current_user_id, user_id)
+
+    if user.profile:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="User already has a profile.")
+
+    avatar_key, variants = await render_avatar(pipeline, user.id, contents)
+
+    profile = UserProfileModel(
+        user_id=user.id,
+        first_name=profile_data.first_name,
+        last_name=profile_data.last_name,
+        gender=profile_data.gender,
+        date_of_birth=profile_data.date_of_birth,
+        info=profile_data.info,
+        avatar=avatar_key
+    )
+    db.add(profile)
+
+    uploaded, inserted = await asyncio.gather(
+        upload_avatar(pipeline, s3_client, user.id, variants),
+        db.flush(),
+        return_exceptions=True
+    )
+    if isinstance(uploaded, BaseException):
+        await db.rollback()
+        raise uploaded
+
+    try:
+        if isinstance(inserted, BaseException):
+            raise inserted
+        await db.commit()
+    except SQLAlchemyError as error:
+        await db.rollback()
+        await delete_avatar(pipeline, s3_client, uploaded)
+        if isinstance(error, IntegrityError):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="User already has a profile.")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="An error occurred while creating the profile."
+        )
+
+    return await build_profile_response(profile, s3_client)
+
+
+@router.patch(
+    "/users/{user_id}/profile/",
+    response_model=ProfileResponseSchema,
+    summary="Update user profile",
+    description="Update some fields of a profile and optionally replace the avatar.",
+    responses={
+        **AUTH_RESPONSES,
+        404: {
+            "description": "Not Found - The user has no profile.",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "detail": "User profile not found."
+                    }
+                }
+            },
+        },
+        500: AVATAR_UPLOAD_ERROR_RESPONSE,
+    },
+)
+async def update_profile(
+        user_id: int,
+        current_user_id: int = Depends(get_current_user_id),
+        profile_data: ProfileUpdateSchema = Depends(ProfileUpdateSchema.from_form),
+        db: AsyncSession = Depends(get_db),
+        s3_client: S3StorageInterface = Depends(get_s3_storage_client),
+        pipeline: AvatarPipeline = Depends(get_avatar_pipeline),
+) -> ProfileResponseSchema:
+    """
+    Update a user profile.
+
+    Only the submitted fields are changed. A new avatar is validated while the users are loaded and
+    uploaded while the changes are flushed.
+
+    :param user_id: The ID of the user whose profile is updated.
+    :param current_user_id: The ID of the authenticated user, decoded from the access token.
+    :param profile_data: The validated profile form.
+    :param db: The asynchronous database session.
+    :param s3_client: The storage the avatar is uploaded to.
+    :param pipeline: The avatar pipeline.
+    :return: The updated profile.
+    :raises HTTPException:
+        - 401 Unauthorized if the token is invalid or either user is not active.
+        - 403 Forbidden if a non-admin updates another user's profile.
+        - 404 Not Found if the user has no profile.
+        - 422 Unprocessable Entity if the form or the avatar is invalid.
+        - 500 Internal Server Error if the avatar upload or the update fails.
+    """
+    contents: Optional[bytes] = None
+    if profile_data.avatar is not None:
+        contents = await read_avatar(profile_data.avatar, pipeline)
+        users = await validate_avatar_and_load_users(pipeline, contents, db, current_user_id, user_id)
+    else:
+        users = await load_users(db, current_user_id, user_id)
+    _, user = users
+
+    profile = user.profile
+    if not profile:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User profile not found.")
+
+    for field, value in profile_data.model_dump(exclude_none=True, exclude={"avatar"}).items():
+        setattr(profile, field, value)
+
+    previous_avatar = new_avatar = profile.avatar
+    uploaded = None
+    if contents is not None:
+        new_avatar, variants = await render_avatar(pipeline, user.id, contents)
+        profile.avatar = new_avatar
+    try:
+        if contents is None:
+            await db.commit()
+        else:
+            uploaded, flushed = await asyncio.gather(
+                upload_avatar(pipeline, s3_client, user.id, variants),
+                db.flush(),
+                return_exceptions=True
+            )
+            for outcome in (uploaded, flushed):
+                if isinstance(outcome, BaseException):
+                    raise outcome
+            await db.commit()
+    except SQLAlchemyError:
+        await db.rollback()
+        if isinstance(uploaded, dict) and new_avatar != previous_avatar:
+            await delete_avatar(pipeline, s3_client, uploaded)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="An error occurred while updating the profile."
+        )
+    except HTTPException:
+        await db.rollback()
+        raise
+
+    if previous_avatar and previous_avatar != new_avatar:
+        await delete_avatar(pipeline, s3_client, pipeline.variant_keys(previous_avatar))
+
+    return await build_profile_response(profile, s3_client)
+
+
+@router.post(
+    "/users/{user_id}/profile/avatar/upload/",
+    response_model=AvatarUploadResponseSchema,
+    summary="Request a direct avatar upload",
+    description="Get a presigned URL or form to upload an avatar straight to the storage, "
+                "then confirm it with the avatar confirm endpoint.",
+    responses=AUTH_RESPONSES,
+)
+async def request_avatar_upload(
+        user_id: int,
+        upload_data: AvatarUploadRequestSchema,
+        current_user_id: int = Depends(get_current_user_id),
+        db: AsyncSession = Depends(get_db),
+        settings: BaseAppSettings = Depends(get_settings),
+        s3_client: S3StorageInterface = Depends(get_s3_storage_client),
+        pipeline: AvatarPipeline = Depends(get_avatar_pipeline),
+) -> AvatarUploadResponseSchema:
+    """
+    Issue a presigned upload for a new avatar under a fresh, unguessable key.
+
+    The avatar bytes never pass through the API. A presigned POST form also makes the storage enforce
+    the avatar size limit; a presigned PUT URL requires the client to send the declared Content-Type
+    and the immutable Cache-Control header. Every upload gets a new key, so the object never changes.
+
+    :param user_id: The ID of the user the avatar is uploaded for.
+    :param upload_data: The content type of the avatar and the upload method.
+    :param current_user_id: The ID of the authenticated user, decoded from the access token.
+    :param db: The asynchronous database session.
+    :param settings: The application settings.
+    :param s3_client: The storage the avatar is uploaded to.
+    :param pipeline: The avatar pipeline whose size limit applies.
+    :return: The key, the presigned URL and, for POST, the form fields.
+    :raises HTTPException:
+        - 401 Unauthorized if the token is invalid or either user is not active.
+        - 403 Forbidden if a non-admin uploads another user's avatar.
+    """
+    await load_users(db, current_user_id, user_id)
+
+    extension = SUPPORTED_AVATAR_CONTENT_TYPES[upload_data.content_type]
+    key = f"{avatar_upload_prefix(user_id)}{secrets.token_hex(16)}{extension}"
+    expires_in = settings.AVATAR_UPLOAD_URL_EXPIRE_SECONDS
+
+    if upload_data.method == "PUT":
+        url = await s3_client.generate_presigned_put_url(
+            key, upload_data.content_type, expires_in, cache_control=IMMUTABLE_CACHE_CONTROL
+        )
+        return AvatarUploadResponseSchema(key=key, method="PUT", url=url, expires_in=expires_in)
+
+    form = await s3_client.generate_presigned_post(
+        key, upload_data.content_type, pipeline.max_file_size, expires_in, cache_control=IMMUTABLE_CACHE_CONTROL
+    )
+    return AvatarUploadResponseSchema(
+        key=key, method="POST", url=form["url"], fields=form["fields"], expires_in=expires_in
+    )
+
+
+@router.post(
+    "/users/{user_id}/profile/avatar/confirm/",
+    response_model=ProfileResponseSchema,
+    summary="Confirm a direct avatar upload",
+    description="Check the metadata of an avatar uploaded with a presigned upload and attach it to the profile.",
+    responses={
+        **AUTH_RESPONSES,
+        404: {
+            "description": "Not Found - The user has no profile or the avatar was not uploaded.",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "detail": "Uploaded avatar not found."
+                    }
+                }
+            },
+        },
+    },
+)
+async def confirm_avatar_upload(
+        user_id: int,
+        confirm_data: AvatarConfirmRequestSchema,
+        current_user_id: int = Depends(get_current_user_id),
+        db: AsyncSession = Depends(get_db),
+        s3_client: S3StorageInterface = Depends(get_s3_storage_client),
+        pipeline: AvatarPipeline = Depends(get_avatar_pipeline),
+) -> ProfileResponseSchema:
+    """
+    Attach a directly uploaded avatar to the profile.
+
+    Only the object metadata is checked, the avatar is not downloaded. An object that is too large or
+    has an unsupported content type is deleted. The previous avatar is deleted once the profile
+    points at the new one.
+
+    :param user_id: The ID of the user whose profile is updated.
+    :param confirm_data: The key returned by the upload request.
+    :param current_user_id: The ID of the authenticated user, decoded from the access token.
+    :param db: The asynchronous database session.
+    :param s3_client: The storage the avatar was uploaded to.
+    :param pipeline: The avatar pipeline whose size limit applies.
+    :return: The updated profile.
+    :raises HTTPException:
+        - 401 Unauthorized if the token is invalid or either user is not active.
+        - 403 Forbidden if a non-admin updates another user's profile.
+        - 404 Not Found if the user has no profile or the avatar was not uploaded.
+        - 422 Unprocessable Entity if the key or the uploaded object is invalid.
+        - 500 Internal Server Error if the storage or the update fails.
+    """
+    _, user = await load_users(db, current_user_id, user_id)
+
+    key = confirm_data.key
+    if not key.startswith(avatar_upload_prefix(user_id)) or "/" in key[len(avatar_upload_prefix(user_id)):]:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Invalid avatar key.")
+
+    profile = user.profile
+    if not profile:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User profile not found.")
+
+    try:
+        metadata = await s3_client.get_file_metadata(key)
+    except BaseS3Error as error:
+        logging.error(f"Failed to read the metadata of avatar {key}: {error}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to verify avatar. Please try again later."
+        )
+    if metadata is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Uploaded avatar not found.")
+
+    error = None
+    if metadata["size"] > pipeline.max_file_size:
+        error = ValueError(f"Image size exceeds {pipeline.max_file_size // (1024 * 1024)} MB")
+    elif metadata["content_type"] not in SUPPORTED_AVATAR_CONTENT_TYPES:
+        error = ValueError(f"Unsupported content type: {metadata['content_type']}")
+    if error is not None:
+        await delete_avatar(pipeline, s3_client, {"upload": key})
+        raise avatar_validation_exception(error)
+
+    previous_avatar = profile.avatar
+    profile.avatar = key
+    try:
+        await db.commit()
+    except SQLAlchemyError:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="An error occurred while updating the profile."
+        )
+
+    if previous_avatar and previous_avatar != key:
+        await delete_avatar(pipeline, s3_client, pipeline.variant_keys(previous_avatar))
+
+    return await build_profile_response(profile, s3_client)
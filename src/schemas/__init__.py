@@ -17,3 +17,14 @@ from schemas.accounts import (
     TokenRefreshRequestSchema,
     TokenRefreshResponseSchema
 )
+from schemas.caches import CacheStatsSchema
+from schemas.database import DatabasePoolStatsSchema
+from schemas.notifications import EmailOutboxStatsSchema
+from schemas.profiles import (
+    ProfileCreateSchema,
+    ProfileUpdateSchema,
+    ProfileResponseSchema,
+    AvatarUploadRequestSchema,
+    AvatarUploadResponseSchema,
+    AvatarConfirmRequestSchema
+)
@@ -0,0 +1,25 @@
+from pydantic import BaseModel
+
+
+class CacheStatsSchema(BaseModel):
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+    size: int
+    max_size: int
+
+    model_config = {
+        "json_schema_extra": {
+            "examples": [
+                {
+                    "hits": 1520,
+                    "misses": 87,
+                    "evictions": 3,
+                    "expirations": 41,
+                    "size": 1024,
+                    "max_size": 1024
+                }
+            ]
+        }
+    }
@@ -0,0 +1,35 @@
+from pydantic import BaseModel
+
+
+class DatabasePoolStatsSchema(BaseModel):
+    size: int
+    max_overflow: int
+    checked_in: int
+    checked_out: int
+    overflow: int
+    checkouts: int
+    timeouts: int
+    overflow_max: int
+    wait_seconds_total: float
+    wait_seconds_max: float
+    wait_seconds_avg: float
+
+    model_config = {
+        "json_schema_extra": {
+            "examples": [
+                {
+                    "size": 5,
+                    "max_overflow": 10,
+                    "checked_in": 3,
+                    "checked_out": 4,
+                    "overflow": 2,
+                    "checkouts": 18342,
+                    "timeouts": 0,
+                    "overflow_max": 6,
+                    "wait_seconds_total": 12.4,
+                    "wait_seconds_max": 0.35,
+                    "wait_seconds_avg": 0.0007
+                }
+            ]
+        }
+    }
@@ -14,8 +14,11 @@ movie_list_response_schema_example = {
     ],
     "prev_page": "/theater/movies/?page=1&per_page=1",
     "next_page": "/theater/movies/?page=3&per_page=1",
+    "prev_cursor": "eyJkIjoicHJldiIsImsiOnsiaWQiOjk5MzN9fQ",
+    "next_cursor": "eyJkIjoibmV4dCIsImsiOnsiaWQiOjk5MzN9fQ",
     "total_pages": 9933,
-    "total_items": 9933
+    "total_items": 9933,
+    "count_type": "cached"
 }
 
 movie_create_schema_example = {
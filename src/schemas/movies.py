@@ -3,6 +3,7 @@ from typing import Optional, List
 
 from pydantic import BaseModel, Field, field_validator
 
+from caches import CountTypeEnum
 from database.models.movies import MovieStatusEnum
 from schemas.examples.movies import (
     country_schema_example,
@@ -134,8 +135,11 @@ class MovieListResponseSchema(BaseModel):
     movies: List[MovieListItemSchema]
     prev_page: Optional[str]
     next_page: Optional[str]
+    prev_cursor: Optional[str] = None
+    next_cursor: Optional[str] = None
     total_pages: int
     total_items: int
+    count_type: CountTypeEnum = CountTypeEnum.EXACT
 
     model_config = {
         "from_attributes": True,
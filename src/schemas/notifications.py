@@ -0,0 +1,23 @@
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class EmailOutboxStatsSchema(BaseModel):
+    pending: int
+    sent: int
+    failed: int
+    oldest_pending_age_seconds: Optional[float] = None
+
+    model_config = {
+        "json_schema_extra": {
+            "examples": [
+                {
+                    "pending": 12,
+                    "sent": 4810,
+                    "failed": 2,
+                    "oldest_pending_age_seconds": 1.8
+                }
+            ]
+        }
+    }
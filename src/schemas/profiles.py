@@ -1,13 +1,142 @@
 from datetime import date
+from typing import Dict, Literal, Optional
 
-from fastapi import UploadFile, Form, File, HTTPException
-from pydantic import BaseModel, field_validator, HttpUrl
+from fastapi import UploadFile, Form, File, HTTPException, status
+from pydantic import BaseModel, ValidationError, field_validator, HttpUrl
 
 from validation import (
     validate_name,
-    validate_image,
     validate_gender,
     validate_birth_date
 )
 
-# Write your code here
+
+class ProfileUpdateSchema(BaseModel):
+    first_name: Optional[str] = None
+    last_name: Optional[str] = None
+    gender: Optional[str] = None
+    date_of_birth: Optional[date] = None
+    info: Optional[str] = None
+    avatar: Optional[UploadFile] = None
+
+    @field_validator("first_name", "last_name")
+    @classmethod
+    def validate_name_field(cls, value: Optional[str]) -> Optional[str]:
+        if value is None:
+            return value
+        validate_name(value)
+        return value.lower()
+
+    @field_validator("gender")
+    @classmethod
+    def validate_gender_field(cls, value: Optional[str]) -> Optional[str]:
+        if value is not None:
+            validate_gender(value)
+        return value
+
+    @field_validator("date_of_birth")
+    @classmethod
+    def validate_date_of_birth_field(cls, value: Optional[date]) -> Optional[date]:
+        if value is not None:
+            validate_birth_date(value)
+        return value
+
+    @field_validator("info")
+    @classmethod
+    def validate_info_field(cls, value: Optional[str]) -> Optional[str]:
+        if value is not None and not value.strip():
+            raise ValueError("Info field cannot be empty or contain only spaces.")
+        return value
+
+    @classmethod
+    def _validate_form(cls, **fields):
+        """
+        Build the schema from form fields, reporting validation errors as 422 Unprocessable Entity.
+
+        The avatar itself is validated by the route, off the event loop.
+        """
+        try:
+            return cls(**fields)
+        except ValidationError as error:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=[
+                    {**detail, "loc": ("body", *detail["loc"])}
+                    for detail in error.errors(include_url=False, include_context=False, include_input=False)
+                ]
+            )
+
+    @classmethod
+    def from_form(
+            cls,
+            first_name: Optional[str] = Form(None),
+            last_name: Optional[str] = Form(None),
+            gender: Optional[str] = Form(None),
+            date_of_birth: Optional[date] = Form(None),
+            info: Optional[str] = Form(None),
+            avatar: Optional[UploadFile] = File(None)
+    ) -> "ProfileUpdateSchema":
+        return cls._validate_form(
+            first_name=first_name,
+            last_name=last_name,
+            gender=gender,
+            date_of_birth=date_of_birth,
+            info=info,
+            avatar=avatar
+        )
+
+
+class ProfileCreateSchema(ProfileUpdateSchema):
+    first_name: str
+    last_name: str
+    gender: str
+    date_of_birth: date
+    info: str
+    avatar: UploadFile
+
+    @classmethod
+    def from_form(
+            cls,
+            first_name: str = Form(...),
+            last_name: str = Form(...),
+            gender: str = Form(...),
+            date_of_birth: date = Form(...),
+            info: str = Form(""),
+            avatar: UploadFile = File(...)
+    ) -> "ProfileCreateSchema":
+        return cls._validate_form(
+            first_name=first_name,
+            last_name=last_name,
+            gender=gender,
+            date_of_birth=date_of_birth,
+            info=info,
+            avatar=avatar
+        )
+
+
+class ProfileResponseSchema(BaseModel):
+    id: int
+    user_id: int
+    first_name: Optional[str]
+    last_name: Optional[str]
+    gender: Optional[str]
+    date_of_birth: Optional[date]
+    info: Optional[str]
+    avatar: Optional[HttpUrl]
+
+
+class AvatarUploadRequestSchema(BaseModel):
+    content_type: Literal["image/jpeg", "image/png"]
+    method: Literal["POST", "PUT"] = "POST"
+
+
+class AvatarUploadResponseSchema(BaseModel):
+    key: str
+    method: str
+    url: str
+    fields: Dict[str, str] = {}
+    expires_in: int
+
+
+class AvatarConfirmRequestSchema(BaseModel):
+    key: str
@@ -0,0 +1,77 @@
+from fastapi import Depends, HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+
+from config import get_jwt_auth_manager
+from database import get_db, UserModel, UserGroupEnum
+from exceptions import BaseSecurityError
+from security.http import get_token
+from security.interfaces import JWTAuthManagerInterface
+
+UNAUTHORIZED_RESPONSE = {
+    "description": "Unauthorized - Missing, invalid or expired token, or the user is not active.",
+    "content": {
+        "application/json": {
+            "example": {
+                "detail": "User not found or not active."
+            }
+        }
+    },
+}
+
+ADMIN_AUTH_RESPONSES = {
+    401: UNAUTHORIZED_RESPONSE,
+    403: {
+        "description": "Forbidden - Only admins can access this resource.",
+        "content": {
+            "application/json": {
+                "example": {
+                    "detail": "Only admins can access this resource."
+                }
+            }
+        },
+    },
+}
+
+
+def get_current_user_id(
+        token: str = Depends(get_token),
+        jwt_manager: JWTAuthManagerInterface = Depends(get_jwt_auth_manager),
+) -> int:
+    """
+    Decode the access token once and return the ID of the user it was issued to.
+
+    :param token: The Bearer token from the Authorization header.
+    :param jwt_manager: The JWT authentication manager.
+    :return: The ID of the authenticated user.
+    :raises HTTPException: 401 Unauthorized if the token is invalid or expired.
+    """
+    try:
+        payload = jwt_manager.decode_access_token(token)
+    except BaseSecurityError as error:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=str(error))
+    return payload.get("user_id")
+
+
+async def get_current_admin_user(
+        current_user_id: int = Depends(get_current_user_id),
+        db: AsyncSession = Depends(get_db),
+) -> UserModel:
+    """
+    Load the authenticated user and require them to be an active admin.
+
+    :param current_user_id: The ID of the authenticated user, decoded from the access token.
+    :param db: The asynchronous database session.
+    :return: The authenticated admin.
+    :raises HTTPException:
+        - 401 Unauthorized if the token is invalid or the user is not active.
+        - 403 Forbidden if the user is not an admin.
+    """
+    stmt = select(UserModel).options(joinedload(UserModel.group)).where(UserModel.id == current_user_id)
+    user = await db.scalar(stmt)
+    if not user or not user.is_active:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found or not active.")
+    if not user.has_group(UserGroupEnum.ADMIN):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Only admins can access this resource.")
+    return user
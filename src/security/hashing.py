@@ -0,0 +1,131 @@
+import asyncio
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from enum import Enum
+from typing import Callable, Optional, TypeVar
+
+from exceptions import PasswordHasherBusyError
+from security.interfaces import PasswordHasherInterface
+from security.passwords import (
+    DEFAULT_BCRYPT_ROUNDS,
+    DEFAULT_PASSWORD_SCHEMES,
+    build_password_context,
+    hash_password,
+    password_needs_update,
+    verify_password
+)
+
+T = TypeVar("T")
+
+
+class PasswordHasherExecutorEnum(str, Enum):
+    THREAD = "thread"
+    PROCESS = "process"
+
+
+class PasswordHasher(PasswordHasherInterface):
+    """
+    Runs password hashing and verification in a worker pool, off the event loop.
+
+    At most `max_workers` jobs run at once; up to `max_queue_size` more wait for a free worker.
+    Any job beyond that is rejected with `PasswordHasherBusyError` instead of piling up behind
+    seconds of queued CPU work.
+    """
+
+    def __init__(
+        self,
+        max_workers: int,
+        max_queue_size: int,
+        executor: PasswordHasherExecutorEnum | str = PasswordHasherExecutorEnum.THREAD,
+        schemes: str = DEFAULT_PASSWORD_SCHEMES,
+        bcrypt_rounds: int = DEFAULT_BCRYPT_ROUNDS,
+    ):
+        """
+        Initialize the hasher. The worker pool is created on first use.
+
+        Args:
+            max_workers (int): Number of jobs that may run concurrently.
+            max_queue_size (int): Number of jobs that may wait for a free worker.
+            executor (PasswordHasherExecutorEnum | str): Kind of worker pool, "thread" or "process".
+                The bcrypt backend releases the GIL, so threads are enough for it.
+            schemes (str): Comma-separated passlib schemes; the first one is used for new hashes.
+            bcrypt_rounds (int): The bcrypt cost factor.
+
+        Raises:
+            ValueError: If the hashing policy is invalid.
+        """
+        build_password_context(schemes, bcrypt_rounds)
+        self._schemes = schemes
+        self._bcrypt_rounds = bcrypt_rounds
+        self._max_workers = max(1, max_workers)
+        self._max_queue_size = max(0, max_queue_size)
+        self._executor_kind = PasswordHasherExecutorEnum(executor)
+        self._executor: Optional[Executor] = None
+        self._semaphore = asyncio.Semaphore(self._max_workers)
+        self._pending = 0
+
+    @property
+    def pending(self) -> int:
+        """
+        Number of jobs currently running or waiting for a worker.
+        """
+        return self._pending
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self._executor_kind is PasswordHasherExecutorEnum.PROCESS:
+                self._executor = ProcessPoolExecutor(max_workers=self._max_workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self._max_workers,
+                    thread_name_prefix="password-hasher"
+                )
+        return self._executor
+
+    async def _submit(self, func: Callable[..., T], *args) -> T:
+        if self._pending >= self._max_workers + self._max_queue_size:
+            raise PasswordHasherBusyError()
+
+        self._pending += 1
+        try:
+            async with self._semaphore:
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(self._get_executor(), func, *args)
+        finally:
+            self._pending -= 1
+
+    async def hash(self, raw_password: str) -> str:
+        """
+        Hash a plain-text password in the worker pool.
+
+        Raises:
+            PasswordHasherBusyError: If the queue is full.
+        """
+        return await self._submit(hash_password, raw_password, self._schemes, self._bcrypt_rounds)
+
+    async def verify(self, raw_password: str, hashed_password: str) -> bool:
+        """
+        Verify a plain-text password against its hash in the worker pool.
+
+        Raises:
+            PasswordHasherBusyError: If the queue is full.
+        """
+        return await self._submit(
+            verify_password, raw_password, hashed_password, self._schemes, self._bcrypt_rounds
+        )
+
+    def needs_update(self, hashed_password: str) -> bool:
+        """
+        Check whether a stored hash no longer matches the configured scheme and cost.
+        """
+        return password_needs_update(hashed_password, self._schemes, self._bcrypt_rounds)
+
+    def shutdown(self, wait: bool = False) -> None:
+        """
+        Shut the worker pool down.
+
+        Args:
+            wait (bool): Let the queued jobs finish instead of cancelling them.
+        """
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=not wait)
@@ -50,3 +50,37 @@ class JWTAuthManagerInterface(ABC):
         Verify an access token or raise an error if invalid.
         """
         pass
+
+
+class PasswordHasherInterface(ABC):
+    """
+    Interface for the password hashing service.
+    Defines non-blocking methods for hashing and verifying passwords.
+    """
+
+    @abstractmethod
+    async def hash(self, raw_password: str) -> str:
+        """
+        Hash a plain-text password.
+        """
+        pass
+
+    @abstractmethod
+    async def verify(self, raw_password: str, hashed_password: str) -> bool:
+        """
+        Verify a plain-text password against its hash.
+        """
+        pass
+
+    @abstractmethod
+    def needs_update(self, hashed_password: str) -> bool:
+        """
+        Check whether a stored hash should be replaced by one made with the current policy.
+        """
+        pass
+
+    def shutdown(self, wait: bool = False) -> None:
+        """
+        Release the worker pool, if any, letting its queued jobs finish when `wait` is set.
+        """
+        pass
@@ -1,29 +1,84 @@
+from functools import lru_cache
+
 from passlib.context import CryptContext
 
-pwd_context = CryptContext(
-    schemes=["bcrypt"],
-    bcrypt__rounds=14,
-    deprecated="auto"
-)
+DEFAULT_PASSWORD_SCHEMES = "bcrypt"
+DEFAULT_BCRYPT_ROUNDS = 14
+
+
+@lru_cache
+def build_password_context(
+    schemes: str = DEFAULT_PASSWORD_SCHEMES,
+    bcrypt_rounds: int = DEFAULT_BCRYPT_ROUNDS
+) -> CryptContext:
+    """
+    Build (and memoize) the password context for a hashing policy.
+
+    The first scheme is used for new hashes; the remaining ones are only accepted for verification
+    and are reported by `needs_update`. The bcrypt cost is pinned to exactly `bcrypt_rounds`, so
+    hashes made with any other cost are reported by `needs_update` as well.
+
+    Args:
+        schemes (str): Comma-separated passlib scheme names, e.g. "argon2,bcrypt".
+        bcrypt_rounds (int): The bcrypt cost factor.
+
+    Returns:
+        CryptContext: The configured password context.
+
+    Raises:
+        ValueError: If a scheme is unknown or its backend (e.g. argon2-cffi for argon2) is not installed.
+    """
+    scheme_names = [scheme.strip() for scheme in schemes.split(",") if scheme.strip()]
+    try:
+        context = CryptContext(
+            schemes=scheme_names,
+            default=scheme_names[0] if scheme_names else None,
+            deprecated="auto",
+            bcrypt__default_rounds=bcrypt_rounds,
+            bcrypt__min_rounds=bcrypt_rounds,
+            bcrypt__max_rounds=bcrypt_rounds,
+        )
+    except (KeyError, ValueError) as error:
+        raise ValueError(f"Invalid password hashing schemes {schemes!r}: {error}") from error
+
+    for scheme in scheme_names:
+        handler = context.handler(scheme)
+        if hasattr(handler, "has_backend") and not handler.has_backend():
+            raise ValueError(f"No backend is installed for the password hashing scheme {scheme!r}.")
+    return context
 
 
-def hash_password(password: str) -> str:
+pwd_context = build_password_context()
+
+
+def hash_password(
+    password: str,
+    schemes: str = DEFAULT_PASSWORD_SCHEMES,
+    bcrypt_rounds: int = DEFAULT_BCRYPT_ROUNDS
+) -> str:
     """
     Hash a plain-text password using the configured password context.
 
-    This function takes a plain-text password and returns its bcrypt hash.
-    The bcrypt algorithm is used with a specified number of rounds for enhanced security.
+    This function takes a plain-text password and returns its hash made with the default scheme
+    of the policy (bcrypt with 14 rounds unless configured otherwise).
 
     Args:
         password (str): The plain-text password to hash.
+        schemes (str): Comma-separated passlib scheme names of the policy.
+        bcrypt_rounds (int): The bcrypt cost factor of the policy.
 
     Returns:
         str: The resulting hashed password.
     """
-    return pwd_context.hash(password)
+    return build_password_context(schemes, bcrypt_rounds).hash(password)
 
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
+def verify_password(
+    plain_password: str,
+    hashed_password: str,
+    schemes: str = DEFAULT_PASSWORD_SCHEMES,
+    bcrypt_rounds: int = DEFAULT_BCRYPT_ROUNDS
+) -> bool:
     """
     Verify a plain-text password against its hashed version.
 
@@ -33,8 +88,31 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     Args:
         plain_password (str): The plain-text password provided by the user.
         hashed_password (str): The hashed password stored in the database.
+        schemes (str): Comma-separated passlib scheme names of the policy.
+        bcrypt_rounds (int): The bcrypt cost factor of the policy.
 
     Returns:
         bool: True if the password is correct, False otherwise.
     """
-    return pwd_context.verify(plain_password, hashed_password)
+    return build_password_context(schemes, bcrypt_rounds).verify(plain_password, hashed_password)
+
+
+def password_needs_update(
+    hashed_password: str,
+    schemes: str = DEFAULT_PASSWORD_SCHEMES,
+    bcrypt_rounds: int = DEFAULT_BCRYPT_ROUNDS
+) -> bool:
+    """
+    Check whether a stored hash no longer matches the policy and should be rehashed.
+
+    This only parses the hash, so it is cheap enough to call on the event loop.
+
+    Args:
+        hashed_password (str): The hashed password stored in the database.
+        schemes (str): Comma-separated passlib scheme names of the policy.
+        bcrypt_rounds (int): The bcrypt cost factor of the policy.
+
+    Returns:
+        bool: True if the hash uses a deprecated scheme or a different cost.
+    """
+    return build_password_context(schemes, bcrypt_rounds).needs_update(hashed_password)
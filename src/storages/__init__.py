@@ -1,2 +1,5 @@
 from storages.interfaces import S3StorageInterface
 from storages.s3 import S3StorageClient
+from storages.streams import iter_bytes, iter_upload_file
+from storages.avatars import AvatarPipeline
+from storages.metadata import IMMUTABLE_CACHE_CONTROL, content_digest, detect_content_type
@@ -0,0 +1,270 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from typing import Dict, Optional, Tuple
+
+from PIL import Image, ImageOps
+
+from storages.interfaces import S3StorageInterface
+from storages.metadata import IMMUTABLE_CACHE_CONTROL, content_digest, detect_content_type
+from storages.streams import iter_bytes
+
+SUPPORTED_AVATAR_FORMATS = ("JPG", "JPEG", "PNG")
+SUPPORTED_AVATAR_CONTENT_TYPES = {"image/jpeg": ".jpg", "image/png": ".png"}
+DEFAULT_AVATAR_MAX_FILE_SIZE = 1 * 1024 * 1024
+DEFAULT_AVATAR_MAX_PIXELS = 4096 * 4096
+DEFAULT_AVATAR_VARIANTS = (("full", 1024), ("thumbnail", 128))
+
+
+def inspect_image(contents: bytes, max_pixels: int = DEFAULT_AVATAR_MAX_PIXELS) -> Tuple[str, int, int]:
+    """
+    Check the format and dimensions of an image from its header, without decoding the pixels.
+
+    Args:
+        contents (bytes): The encoded image.
+        max_pixels (int): Maximum allowed width * height, as a guard against decompression bombs.
+
+    Returns:
+        Tuple[str, int, int]: The image format, width and height.
+
+    Raises:
+        ValueError: If the image cannot be read, has an unsupported format or is too large.
+    """
+    try:
+        with Image.open(BytesIO(contents)) as image:
+            image_format, (width, height) = image.format, image.size
+    except (IOError, Image.DecompressionBombError):
+        raise ValueError("Invalid image format")
+
+    if image_format not in SUPPORTED_AVATAR_FORMATS:
+        raise ValueError(
+            f"Unsupported image format: {image_format}. Use one of next: {list(SUPPORTED_AVATAR_FORMATS)}"
+        )
+    if width * height > max_pixels:
+        raise ValueError(f"Image dimensions {width}x{height} exceed the limit of {max_pixels} pixels")
+    return image_format, width, height
+
+
+def render_avatar_variants(
+    contents: bytes,
+    variants: Tuple[Tuple[str, int], ...],
+    max_pixels: int = DEFAULT_AVATAR_MAX_PIXELS,
+    jpeg_quality: int = 85
+) -> Dict[str, bytes]:
+    """
+    Decode an image and re-encode it as a JPEG for every variant, downscaled to fit its size.
+
+    Metadata is dropped and the EXIF orientation is applied. JPEG sources are decoded at a reduced
+    scale when the largest variant allows it.
+
+    Args:
+        contents (bytes): The encoded image.
+        variants (Tuple[Tuple[str, int], ...]): Variant names with the maximum width and height of each.
+        max_pixels (int): Maximum allowed width * height of the source image.
+        jpeg_quality (int): The JPEG quality of the variants.
+
+    Returns:
+        Dict[str, bytes]: The encoded JPEG of every variant, by name.
+
+    Raises:
+        ValueError: If the image is invalid or too large.
+    """
+    inspect_image(contents, max_pixels)
+    largest = max(size for _, size in variants)
+
+    try:
+        with Image.open(BytesIO(contents)) as image:
+            image.draft("RGB", (largest, largest))
+            source = ImageOps.exif_transpose(image).convert("RGB")
+    except (IOError, Image.DecompressionBombError):
+        raise ValueError("Invalid image format")
+
+    rendered = {}
+    for name, size in variants:
+        variant = source.copy()
+        variant.thumbnail((size, size), Image.Resampling.LANCZOS)
+        output = BytesIO()
+        variant.save(output, format="JPEG", quality=jpeg_quality, optimize=True)
+        rendered[name] = output.getvalue()
+    return rendered
+
+
+class AvatarPipeline:
+    """
+    Validates, normalizes and stores profile avatars, doing all image work in a worker pool.
+
+    The header and dimensions are checked before any pixel is decoded, so a decompression bomb is
+    rejected cheaply. When normalization is enabled the avatar is re-encoded as a JPEG in every
+    configured size. Keys are content-addressed: the first variant is stored under the key prefix
+    followed by a hash of its bytes and the others next to it, so every object can be cached forever.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 2,
+        max_file_size: int = DEFAULT_AVATAR_MAX_FILE_SIZE,
+        max_pixels: int = DEFAULT_AVATAR_MAX_PIXELS,
+        variants: Tuple[Tuple[str, int], ...] = DEFAULT_AVATAR_VARIANTS,
+        normalize: bool = True,
+        jpeg_quality: int = 85,
+    ):
+        """
+        Initialize the pipeline. The worker pool is created on first use.
+
+        Args:
+            max_workers (int): Number of images processed concurrently. Pillow releases the GIL
+                while decoding and resizing, so threads are enough.
+            max_file_size (int): Maximum size of an uploaded avatar in bytes.
+            max_pixels (int): Maximum width * height of an uploaded avatar.
+            variants (Tuple[Tuple[str, int], ...]): Variant names with their maximum width and height.
+            normalize (bool): Whether to re-encode the avatar; otherwise it is stored as uploaded.
+            jpeg_quality (int): The JPEG quality of the variants.
+        """
+        self._max_workers = max(1, max_workers)
+        self._max_file_size = max_file_size
+        self._max_pixels = max_pixels
+        self._variants = variants
+        self._normalize = normalize
+        self._jpeg_quality = jpeg_quality
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self._max_workers, thread_name_prefix="avatar-pipeline")
+        return self._executor
+
+    @property
+    def max_file_size(self) -> int:
+        """
+        Maximum size of an uploaded avatar in bytes.
+        """
+        return self._max_file_size
+
+    @staticmethod
+    def variant_key(key: str, variant: str) -> str:
+        """
+        Build the storage key of a secondary variant, e.g. `avatars/1_avatar_thumbnail.jpg`.
+        """
+        stem, dot, extension = key.rpartition(".")
+        return f"{stem}_{variant}.{extension}" if dot else f"{key}_{variant}"
+
+    def variant_keys(self, key: str) -> Dict[str, str]:
+        """
+        Build the storage key of every variant of an avatar stored under `key`.
+        """
+        return {
+            name: key if index == 0 else self.variant_key(key, name)
+            for index, (name, _) in enumerate(self._variants)
+        }
+
+    async def validate(self, contents: bytes) -> None:
+        """
+        Check the size, format and dimensions of an avatar in the worker pool.
+
+        Raises:
+            ValueError: If the avatar is too large, unreadable or has an unsupported format.
+        """
+        if len(contents) > self._max_file_size:
+            raise ValueError(f"Image size exceeds {self._max_file_size // (1024 * 1024)} MB")
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._get_executor(), inspect_image, contents, self._max_pixels)
+
+    async def render(self, key_prefix: str, contents: bytes) -> Dict[str, Tuple[str, bytes, str]]:
+        """
+        Normalize an avatar in the worker pool and derive the content-addressed key of every variant.
+
+        Args:
+            key_prefix (str): The start of the storage keys, e.g. `avatars/1_`; the main variant is
+                stored under the prefix followed by a hash of its bytes and its extension.
+            contents (bytes): The uploaded avatar.
+
+        Returns:
+            Dict[str, Tuple[str, bytes, str]]: The key, bytes and content type of every variant, by name.
+
+        Raises:
+            ValueError: If the avatar is invalid.
+        """
+        main = self._variants[0][0]
+        if not self._normalize:
+            content_type = detect_content_type("", contents)
+            extension = SUPPORTED_AVATAR_CONTENT_TYPES.get(content_type, "")
+            return {main: (f"{key_prefix}{content_digest(contents)}{extension}", contents, content_type)}
+
+        loop = asyncio.get_running_loop()
+        rendered = await loop.run_in_executor(
+            self._get_executor(),
+            render_avatar_variants,
+            contents,
+            self._variants,
+            self._max_pixels,
+            self._jpeg_quality
+        )
+        keys = self.variant_keys(f"{key_prefix}{content_digest(rendered[main])}.jpg")
+        return {name: (keys[name], data, "image/jpeg") for name, data in rendered.items()}
+
+    @staticmethod
+    async def upload(storage: S3StorageInterface, variants: Dict[str, Tuple[str, bytes, str]]) -> Dict[str, str]:
+        """
+        Upload rendered variants concurrently, marked as immutable for browsers and CDNs.
+
+        Each variant goes through the storage's streaming upload, which sends it with a single PUT
+        below the multipart threshold and as a multipart upload above it.
+
+        Args:
+            storage (S3StorageInterface): The storage to upload to.
+            variants (Dict[str, Tuple[str, bytes, str]]): The variants, as returned by `render`.
+
+        Returns:
+            Dict[str, str]: The storage key of every variant, by name.
+
+        Raises:
+            BaseS3Error: If an upload fails.
+        """
+        await asyncio.gather(*(
+            storage.upload_stream(
+                key,
+                iter_bytes(data),
+                size_hint=len(data),
+                content_type=content_type,
+                cache_control=IMMUTABLE_CACHE_CONTROL
+            )
+            for key, data, content_type in variants.values()
+        ))
+        return {name: key for name, (key, _, _) in variants.items()}
+
+    async def store(self, storage: S3StorageInterface, key_prefix: str, contents: bytes) -> Dict[str, str]:
+        """
+        Render an avatar and upload its variants; see `render` and `upload`.
+
+        Returns:
+            Dict[str, str]: The storage key of every variant, by name.
+
+        Raises:
+            ValueError: If the avatar is invalid.
+            BaseS3Error: If an upload fails.
+        """
+        return await self.upload(storage, await self.render(key_prefix, contents))
+
+    async def delete(self, storage: S3StorageInterface, keys: Dict[str, str]) -> None:
+        """
+        Delete stored variants, e.g. to undo `store` when the profile could not be saved.
+
+        Args:
+            storage (S3StorageInterface): The storage the variants were uploaded to.
+            keys (Dict[str, str]): The storage key of every variant, as returned by `store`.
+
+        Raises:
+            BaseS3Error: If a delete fails.
+        """
+        await asyncio.gather(*(storage.delete_file(key) for key in keys.values()))
+
+    def shutdown(self, wait: bool = False) -> None:
+        """
+        Shut the worker pool down.
+
+        Args:
+            wait (bool): Let the queued jobs finish instead of cancelling them.
+        """
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=not wait)
@@ -1,20 +1,107 @@
 from abc import ABC, abstractmethod
-from typing import Union
+from typing import Any, AsyncIterable, Dict, Optional, Union
 
 
 class S3StorageInterface(ABC):
 
     @abstractmethod
-    async def upload_file(self, file_name: str, file_data: Union[bytes, bytearray]) -> None:
+    async def upload_file(
+        self,
+        file_name: str,
+        file_data: Union[bytes, bytearray],
+        content_type: Optional[str] = None,
+        cache_control: Optional[str] = None
+    ) -> None:
         """
         Uploads a file to the storage.
 
         :param file_name: The name of the file to be stored.
         :param file_data: The file data in bytes.
+        :param content_type: The MIME type; detected from the data and name if omitted.
+        :param cache_control: The `Cache-Control` header served with the file.
         :return: URL of the uploaded file.
         """
         pass
 
+    @abstractmethod
+    async def upload_stream(
+        self,
+        file_name: str,
+        chunks: AsyncIterable[bytes],
+        size_hint: Optional[int] = None,
+        content_type: Optional[str] = None,
+        cache_control: Optional[str] = None
+    ) -> None:
+        """
+        Uploads a file to the storage from an async iterable of chunks, without holding the whole body in memory.
+
+        :param file_name: The name of the file to be stored.
+        :param chunks: The file data, chunk by chunk.
+        :param size_hint: The total size in bytes, if known in advance.
+        :param content_type: The MIME type; detected from the first chunks and name if omitted.
+        :param cache_control: The `Cache-Control` header served with the file.
+        """
+        pass
+
+    @abstractmethod
+    async def delete_file(self, file_name: str) -> None:
+        """
+        Deletes a file from the storage. Deleting a missing file is not an error.
+
+        :param file_name: The name of the file to be deleted.
+        """
+        pass
+
+    @abstractmethod
+    async def generate_presigned_put_url(
+        self,
+        file_name: str,
+        content_type: str,
+        expires_in: int,
+        cache_control: Optional[str] = None
+    ) -> str:
+        """
+        Generate a URL that lets a client upload a file directly with a single PUT request.
+
+        :param file_name: The name the file will be stored under.
+        :param content_type: The MIME type the client must send.
+        :param expires_in: Number of seconds the URL stays valid.
+        :param cache_control: The `Cache-Control` header the client must send.
+        :return: The presigned URL.
+        """
+        pass
+
+    @abstractmethod
+    async def generate_presigned_post(
+        self,
+        file_name: str,
+        content_type: str,
+        max_size: int,
+        expires_in: int,
+        cache_control: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Generate a form that lets a client upload a file directly with a POST request.
+
+        :param file_name: The name the file will be stored under.
+        :param content_type: The MIME type the form must declare.
+        :param max_size: Maximum size of the file in bytes.
+        :param expires_in: Number of seconds the form stays valid.
+        :param cache_control: The `Cache-Control` header the form sets on the file.
+        :return: The form `url` and the `fields` to send along with the file.
+        """
+        pass
+
+    @abstractmethod
+    async def get_file_metadata(self, file_name: str) -> Optional[Dict[str, Any]]:
+        """
+        Fetch the metadata of a stored file without downloading it.
+
+        :param file_name: The name of the file stored in the bucket.
+        :return: The `size` in bytes and the `content_type`, or None if the file does not exist.
+        """
+        pass
+
     @abstractmethod
     async def get_file_url(self, file_name: str) -> str:
         """
@@ -24,3 +111,15 @@ class S3StorageInterface(ABC):
         :return: The full URL to access the file.
         """
         pass
+
+    async def open(self) -> None:
+        """
+        Open any long-lived connection the storage needs. Called on application startup.
+        """
+        pass
+
+    async def close(self) -> None:
+        """
+        Release any long-lived connection held by the storage. Called on application shutdown.
+        """
+        pass
@@ -0,0 +1,49 @@
+import hashlib
+import mimetypes
+from typing import Union
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+DEFAULT_CONTENT_TYPE = "application/octet-stream"
+
+_SIGNATURES = (
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"GIF87a", "image/gif"),
+    (b"GIF89a", "image/gif"),
+    (b"%PDF-", "application/pdf"),
+)
+
+
+def detect_content_type(file_name: str, file_data: Union[bytes, bytearray, None] = None) -> str:
+    """
+    Detect the MIME type of a file from its leading bytes, falling back to its extension.
+
+    Args:
+        file_name (str): The name of the file.
+        file_data (Union[bytes, bytearray, None]): The file contents, or at least their first bytes.
+
+    Returns:
+        str: The detected MIME type, or `application/octet-stream` if it is unknown.
+    """
+    if file_data:
+        head = bytes(file_data[:16])
+        for signature, content_type in _SIGNATURES:
+            if head.startswith(signature):
+                return content_type
+        if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+            return "image/webp"
+    return mimetypes.guess_type(file_name)[0] or DEFAULT_CONTENT_TYPE
+
+
+def content_digest(file_data: Union[bytes, bytearray], length: int = 16) -> str:
+    """
+    Short SHA-256 hex digest of a file, used to build content-addressed keys.
+
+    Args:
+        file_data (Union[bytes, bytearray]): The file contents.
+        length (int): Number of hex characters to keep.
+
+    Returns:
+        str: The truncated hex digest.
+    """
+    return hashlib.sha256(file_data).hexdigest()[:length]
@@ -1,15 +1,25 @@
-from typing import Union
+import asyncio
+from contextlib import AsyncExitStack
+from typing import Any, AsyncIterable, AsyncIterator, Dict, Optional, Union
 
 import aioboto3
+from aiobotocore.config import AioConfig
 from botocore.exceptions import (
     BotoCoreError,
+    ClientError,
     NoCredentialsError,
     HTTPClientError,
     ConnectionError
 )
 
-from exceptions import S3ConnectionError, S3FileUploadError
+from caches import LRUTTLCache
+from exceptions import BaseS3Error, S3ConnectionError, S3FileDeleteError, S3FileUploadError
 from storages import S3StorageInterface
+from storages.metadata import detect_content_type
+
+
+MIN_MULTIPART_PART_SIZE = 5 * 1024 * 1024
+MAX_MULTIPART_PARTS = 10_000
 
 
 class S3StorageClient(S3StorageInterface):
@@ -19,18 +29,40 @@ class S3StorageClient(S3StorageInterface):
         endpoint_url: str,
         access_key: str,
         secret_key: str,
-        bucket_name: str
+        bucket_name: str,
+        max_pool_connections: int = 10,
+        keepalive_timeout_seconds: float = 15,
+        multipart_threshold: int = 8 * 1024 * 1024,
+        multipart_part_size: int = 8 * 1024 * 1024,
+        public_endpoint_url: Optional[str] = None,
+        presigned_get_expires_in: int = 0,
+        presigned_get_cache_size: int = 10_000,
     ):
         """
         Initialize the asynchronous S3 Storage Client using an aioboto3 Session.
 
+        A single botocore client, with its endpoint resolver and HTTP connection pool, is created on
+        first use and reused by every call until `close` is awaited.
+
         Args:
             endpoint_url (str): S3-compatible storage endpoint.
             access_key (str): Access key for authentication.
             secret_key (str): Secret key for authentication.
             bucket_name (str): Name of the bucket where files will be stored.
+            max_pool_connections (int): Maximum number of pooled HTTP connections.
+            keepalive_timeout_seconds (float): How long an idle pooled connection is kept open.
+            multipart_threshold (int): Streams larger than this many bytes use a multipart upload.
+            multipart_part_size (int): Size of each multipart part; S3 requires at least 5 MiB.
+            public_endpoint_url (Optional[str]): Endpoint that clients outside the deployment use to
+                reach the storage, e.g. a published MinIO port. Presigned URLs are signed for it.
+                Defaults to `endpoint_url`.
+            presigned_get_expires_in (int): If set, `get_file_url` returns presigned GET URLs valid for
+                this many seconds instead of plain URLs, for private buckets.
+            presigned_get_cache_size (int): Number of presigned GET URLs memoized. A URL is reused
+                until the last tenth of its lifetime, so repeated reads skip the HMAC computation.
         """
         self._endpoint_url = endpoint_url
+        self._public_endpoint_url = public_endpoint_url or endpoint_url
         self._access_key = access_key
         self._secret_key = secret_key
         self._bucket_name = bucket_name
@@ -39,42 +71,357 @@ class S3StorageClient(S3StorageInterface):
             aws_access_key_id=self._access_key,
             aws_secret_access_key=self._secret_key,
         )
+        self._config = AioConfig(
+            max_pool_connections=max_pool_connections,
+            connector_args={"keepalive_timeout": keepalive_timeout_seconds},
+            signature_version="s3v4",
+            s3={"addressing_style": "path"},
+        )
+        self._multipart_threshold = multipart_threshold
+        self._multipart_part_size = max(multipart_part_size, MIN_MULTIPART_PART_SIZE)
+        self._presigned_get_expires_in = presigned_get_expires_in
+        self._presigned_get_urls = LRUTTLCache(
+            max_size=presigned_get_cache_size if presigned_get_expires_in else 0,
+            ttl_seconds=presigned_get_expires_in * 0.9
+        )
+        self._client: Optional[Any] = None
+        self._presign_client: Optional[Any] = None
+        self._exit_stack: Optional[AsyncExitStack] = None
+        self._lock = asyncio.Lock()
+
+    async def open(self) -> None:
+        """
+        Create the shared S3 client if it does not exist yet.
+
+        When a separate public endpoint is configured, a second client is created for it; it is only
+        used to sign URLs and never opens a connection.
+        """
+        if self._client is not None:
+            return
+        async with self._lock:
+            if self._client is not None:
+                return
+            exit_stack = AsyncExitStack()
+            client = await exit_stack.enter_async_context(
+                self._session.client("s3", endpoint_url=self._endpoint_url, config=self._config)
+            )
+            self._presign_client = client
+            if self._public_endpoint_url != self._endpoint_url:
+                self._presign_client = await exit_stack.enter_async_context(
+                    self._session.client("s3", endpoint_url=self._public_endpoint_url, config=self._config)
+                )
+            self._client, self._exit_stack = client, exit_stack
 
-    async def upload_file(self, file_name: str, file_data: Union[bytes, bytearray]) -> None:
+    async def close(self) -> None:
+        """
+        Close the shared S3 client and its connection pool.
+        """
+        async with self._lock:
+            if self._exit_stack is not None:
+                await self._exit_stack.aclose()
+            self._client = self._presign_client = self._exit_stack = None
+
+    async def _get_client(self) -> Any:
+        await self.open()
+        return self._client
+
+    @staticmethod
+    def _object_headers(
+        file_name: str,
+        head: Union[bytes, bytearray],
+        content_type: Optional[str],
+        cache_control: Optional[str]
+    ) -> Dict[str, str]:
+        headers = {"ContentType": content_type or detect_content_type(file_name, head)}
+        if cache_control:
+            headers["CacheControl"] = cache_control
+        return headers
+
+    async def upload_file(
+        self,
+        file_name: str,
+        file_data: Union[bytes, bytearray],
+        content_type: Optional[str] = None,
+        cache_control: Optional[str] = None
+    ) -> None:
         """
         Asynchronously upload a file to the S3-compatible storage.
 
         Args:
             file_name (str): The name of the file to be stored.
             file_data (Union[bytes, bytearray]): The file data in bytes.
+            content_type (Optional[str]): The MIME type; detected from the data and name if omitted.
+            cache_control (Optional[str]): The `Cache-Control` header served with the file.
+
+        Raises:
+            S3ConnectionError: If there is a connection error with S3.
+            S3FileUploadError: If the file upload fails, e.g. with a BotoCore error or AccessDenied.
+        """
+        try:
+            client = await self._get_client()
+            await client.put_object(
+                Bucket=self._bucket_name,
+                Key=file_name,
+                Body=file_data,
+                **self._object_headers(file_name, file_data, content_type, cache_control)
+            )
+        except (ConnectionError, HTTPClientError, NoCredentialsError) as e:
+            raise S3ConnectionError(f"Failed to connect to S3 storage: {str(e)}") from e
+        except (BotoCoreError, ClientError) as e:
+            raise S3FileUploadError(f"Failed to upload to S3 storage: {str(e)}") from e
+
+    async def upload_stream(
+        self,
+        file_name: str,
+        chunks: AsyncIterable[bytes],
+        size_hint: Optional[int] = None,
+        content_type: Optional[str] = None,
+        cache_control: Optional[str] = None
+    ) -> None:
+        """
+        Asynchronously upload a file to the S3-compatible storage from a stream of chunks.
+
+        Up to `multipart_threshold` bytes are buffered; if the stream ends within it, the file is sent
+        with a single PUT, otherwise it is sent as a multipart upload one part at a time. At most one
+        part is held in memory, whatever the size of the file. A failed multipart upload is aborted.
+
+        Args:
+            file_name (str): The name of the file to be stored.
+            chunks (AsyncIterable[bytes]): The file data, chunk by chunk.
+            size_hint (Optional[int]): The total size in bytes, if known; used to keep the number
+                of parts within the S3 limit.
+            content_type (Optional[str]): The MIME type; detected from the first chunks and name if omitted.
+            cache_control (Optional[str]): The `Cache-Control` header served with the file.
 
         Raises:
             S3ConnectionError: If there is a connection error with S3.
             S3FileUploadError: If the file upload fails due to a BotoCore error.
         """
+        part_size = self._multipart_part_size
+        if size_hint is not None:
+            part_size = max(part_size, -(-size_hint // MAX_MULTIPART_PARTS))
+
+        iterator = chunks.__aiter__()
+        buffer = bytearray()
+        exhausted = False
+        while len(buffer) <= self._multipart_threshold:
+            try:
+                buffer += await iterator.__anext__()
+            except StopAsyncIteration:
+                exhausted = True
+                break
+
+        headers = self._object_headers(file_name, buffer, content_type, cache_control)
         try:
-            async with self._session.client(
-                "s3", endpoint_url=self._endpoint_url
-            ) as client:
+            client = await self._get_client()
+            if exhausted:
                 await client.put_object(
                     Bucket=self._bucket_name,
                     Key=file_name,
-                    Body=file_data,
-                    ContentType="image/jpeg"
+                    Body=bytes(buffer),
+                    **headers
                 )
+                return
+            await self._upload_multipart(client, file_name, iterator, buffer, part_size, headers)
         except (ConnectionError, HTTPClientError, NoCredentialsError) as e:
             raise S3ConnectionError(f"Failed to connect to S3 storage: {str(e)}") from e
-        except BotoCoreError as e:
+        except (BotoCoreError, ClientError) as e:
             raise S3FileUploadError(f"Failed to upload to S3 storage: {str(e)}") from e
 
+    async def _upload_multipart(
+        self,
+        client: Any,
+        file_name: str,
+        iterator: AsyncIterator[bytes],
+        buffer: bytearray,
+        part_size: int,
+        headers: Dict[str, str]
+    ) -> None:
+        upload = await client.create_multipart_upload(
+            Bucket=self._bucket_name,
+            Key=file_name,
+            **headers
+        )
+        upload_id = upload["UploadId"]
+        parts = []
+
+        async def upload_part(body: bytes) -> None:
+            part_number = len(parts) + 1
+            response = await client.upload_part(
+                Bucket=self._bucket_name,
+                Key=file_name,
+                UploadId=upload_id,
+                PartNumber=part_number,
+                Body=body
+            )
+            parts.append({"ETag": response["ETag"], "PartNumber": part_number})
+
+        try:
+            exhausted = False
+            while not exhausted:
+                while len(buffer) < part_size:
+                    try:
+                        buffer += await iterator.__anext__()
+                    except StopAsyncIteration:
+                        exhausted = True
+                        break
+                while len(buffer) >= part_size:
+                    await upload_part(bytes(buffer[:part_size]))
+                    del buffer[:part_size]
+            if buffer or not parts:
+                await upload_part(bytes(buffer))
+
+            await client.complete_multipart_upload(
+                Bucket=self._bucket_name,
+                Key=file_name,
+                UploadId=upload_id,
+                MultipartUpload={"Parts": parts}
+            )
+        except BaseException:
+            try:
+                await client.abort_multipart_upload(Bucket=self._bucket_name, Key=file_name, UploadId=upload_id)
+            except (BotoCoreError, ClientError):
+                pass
+            raise
+
+    async def delete_file(self, file_name: str) -> None:
+        """
+        Asynchronously delete a file from the S3-compatible storage.
+
+        Args:
+            file_name (str): The name of the file stored in the bucket.
+
+        Raises:
+            S3ConnectionError: If there is a connection error with S3.
+            S3FileDeleteError: If the delete fails due to a BotoCore error.
+        """
+        try:
+            client = await self._get_client()
+            await client.delete_object(Bucket=self._bucket_name, Key=file_name)
+        except (ConnectionError, HTTPClientError, NoCredentialsError) as e:
+            raise S3ConnectionError(f"Failed to connect to S3 storage: {str(e)}") from e
+        except (BotoCoreError, ClientError) as e:
+            raise S3FileDeleteError(f"Failed to delete from S3 storage: {str(e)}") from e
+
+    async def generate_presigned_put_url(
+        self,
+        file_name: str,
+        content_type: str,
+        expires_in: int,
+        cache_control: Optional[str] = None
+    ) -> str:
+        """
+        Generate a URL that lets a client upload a file with a single PUT, without credentials.
+
+        The client must send the same `Content-Type` (and `Cache-Control`) header, which is part of the signature.
+
+        Args:
+            file_name (str): The name the file will be stored under.
+            content_type (str): The MIME type of the file.
+            expires_in (int): Number of seconds the URL stays valid.
+            cache_control (Optional[str]): The `Cache-Control` header the client must send.
+
+        Returns:
+            str: The presigned URL.
+        """
+        params = {"Bucket": self._bucket_name, "Key": file_name, "ContentType": content_type}
+        if cache_control:
+            params["CacheControl"] = cache_control
+        await self.open()
+        return await self._presign_client.generate_presigned_url("put_object", Params=params, ExpiresIn=expires_in)
+
+    async def generate_presigned_post(
+        self,
+        file_name: str,
+        content_type: str,
+        max_size: int,
+        expires_in: int,
+        cache_control: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Generate a presigned HTML form POST that lets a client upload a file without credentials.
+
+        Unlike a presigned PUT, the policy also makes the storage reject bodies larger than `max_size`.
+
+        Args:
+            file_name (str): The name the file will be stored under.
+            content_type (str): The MIME type the form must declare.
+            max_size (int): Maximum size of the file in bytes.
+            expires_in (int): Number of seconds the form stays valid.
+            cache_control (Optional[str]): The `Cache-Control` header the form sets on the file.
+
+        Returns:
+            Dict[str, Any]: The form `url` and the `fields` to send along with the file.
+        """
+        fields = {"Content-Type": content_type}
+        if cache_control:
+            fields["Cache-Control"] = cache_control
+        await self.open()
+        return await self._presign_client.generate_presigned_post(
+            Bucket=self._bucket_name,
+            Key=file_name,
+            Fields=fields,
+            Conditions=[*({name: value} for name, value in fields.items()), ["content-length-range", 1, max_size]],
+            ExpiresIn=expires_in
+        )
+
+    async def get_file_metadata(self, file_name: str) -> Optional[Dict[str, Any]]:
+        """
+        Fetch the size and content type of a stored file without downloading it.
+
+        Args:
+            file_name (str): The name of the file stored in the bucket.
+
+        Returns:
+            Optional[Dict[str, Any]]: The `size` in bytes and the `content_type`, or None if the
+            file does not exist.
+
+        Raises:
+            S3ConnectionError: If there is a connection error with S3.
+            BaseS3Error: If the request fails for another reason.
+        """
+        try:
+            client = await self._get_client()
+            response = await client.head_object(Bucket=self._bucket_name, Key=file_name)
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return None
+            raise BaseS3Error(f"Failed to read file metadata from S3 storage: {str(e)}") from e
+        except (ConnectionError, HTTPClientError, NoCredentialsError) as e:
+            raise S3ConnectionError(f"Failed to connect to S3 storage: {str(e)}") from e
+        except BotoCoreError as e:
+            raise BaseS3Error(f"Failed to read file metadata from S3 storage: {str(e)}") from e
+        return {"size": response["ContentLength"], "content_type": response.get("ContentType", "")}
+
     async def get_file_url(self, file_name: str) -> str:
         """
-        Generate a public URL for a file stored in the S3-compatible storage.
+        Generate a URL for a file stored in the S3-compatible storage.
+
+        With `presigned_get_expires_in` set, this is a presigned GET URL on the public endpoint,
+        memoized until the last tenth of its lifetime; otherwise a plain public URL.
 
         Args:
             file_name (str): The name of the file stored in the bucket.
 
         Returns:
             str: The full URL to access the file.
+
+        Raises:
+            S3ConnectionError: If the URL cannot be presigned.
         """
-        return f"{self._endpoint_url}/{self._bucket_name}/{file_name}"
+        if not self._presigned_get_expires_in:
+            return f"{self._public_endpoint_url}/{self._bucket_name}/{file_name}"
+
+        url = self._presigned_get_urls.get(file_name)
+        if url is None:
+            try:
+                await self.open()
+                url = await self._presign_client.generate_presigned_url(
+                    "get_object",
+                    Params={"Bucket": self._bucket_name, "Key": file_name},
+                    ExpiresIn=self._presigned_get_expires_in
+                )
+            except (ConnectionError, BotoCoreError, ClientError) as e:
+                raise S3ConnectionError(f"Failed to presign a URL for S3 storage: {str(e)}") from e
+            self._presigned_get_urls.set(file_name, url)
+        return url
@@ -0,0 +1,36 @@
+from typing import AsyncIterator, Union
+
+from fastapi import UploadFile
+
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+
+async def iter_upload_file(file: UploadFile, chunk_size: int = DEFAULT_CHUNK_SIZE) -> AsyncIterator[bytes]:
+    """
+    Read an uploaded file from its current position in chunks of at most `chunk_size` bytes.
+
+    Args:
+        file (UploadFile): The uploaded file; its spooled body is read without loading it whole.
+        chunk_size (int): Maximum size of each chunk.
+
+    Yields:
+        bytes: The next chunk of the file.
+    """
+    while chunk := await file.read(chunk_size):
+        yield chunk
+
+
+async def iter_bytes(data: Union[bytes, bytearray], chunk_size: int = DEFAULT_CHUNK_SIZE) -> AsyncIterator[bytes]:
+    """
+    Split in-memory data into chunks of at most `chunk_size` bytes, e.g. to feed `upload_stream`.
+
+    Args:
+        data (Union[bytes, bytearray]): The data to split.
+        chunk_size (int): Maximum size of each chunk.
+
+    Yields:
+        bytes: The next chunk of the data.
+    """
+    view = memoryview(data)
+    for start in range(0, len(view), chunk_size):
+        yield bytes(view[start:start + chunk_size])
@@ -3,7 +3,7 @@ from httpx import AsyncClient, ASGITransport
 from sqlalchemy import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from config import get_settings, get_accounts_email_notificator, get_s3_storage_client
+from config import get_settings, get_accounts_email_notificator, get_s3_storage_client, get_password_hasher
 from database import (
     reset_database,
     get_db_contextmanager,
@@ -12,9 +12,13 @@ from database import (
 )
 from database.populate import CSVDatabaseSeeder
 from main import app
+from security.hashing import PasswordHasher
 from security.interfaces import JWTAuthManagerInterface
 from security.token_manager import JWTAuthManager
 from storages import S3StorageClient
+from tests.doubles.fakes.redis_server import FakeRedisServer
+from tests.doubles.fakes.s3_server import FakeS3Server
+from tests.doubles.fakes.smtp import FakeSMTPServer
 from tests.doubles.fakes.storage import FakeS3Storage
 from tests.doubles.stubs.emails import StubEmailSender
 
@@ -78,6 +82,45 @@ async def email_sender_stub():
     return StubEmailSender()
 
 
+@pytest_asyncio.fixture(scope="function", loop_scope="function")
+async def smtp_server_fake():
+    """
+    Provide a fake SMTP server listening on a local port.
+
+    The server is started before the test and stopped after it.
+    """
+    server = FakeSMTPServer()
+    await server.start()
+    yield server
+    await server.stop()
+
+
+@pytest_asyncio.fixture(scope="function", loop_scope="function")
+async def redis_server_fake():
+    """
+    Provide a fake Redis server listening on a local port.
+
+    The server is started before the test and stopped after it.
+    """
+    server = FakeRedisServer()
+    await server.start()
+    yield server
+    await server.stop()
+
+
+@pytest_asyncio.fixture(scope="function", loop_scope="function")
+async def s3_server_fake():
+    """
+    Provide a fake S3-compatible server listening on a local port.
+
+    The server is started before the test and stopped after it.
+    """
+    server = FakeS3Server()
+    await server.start()
+    yield server
+    await server.stop()
+
+
 @pytest_asyncio.fixture(scope="function")
 async def s3_storage_fake():
     """
@@ -104,14 +147,32 @@ async def s3_client(settings):
 
 
 @pytest_asyncio.fixture(scope="function")
-async def client(email_sender_stub, s3_storage_fake):
+async def password_hasher(settings):
+    """
+    Provide a password hasher bound to the event loop of the current test.
+
+    The application hasher is a process-wide singleton, while every test runs in its own loop.
+    """
+    hasher = PasswordHasher(
+        max_workers=settings.PASSWORD_HASHER_MAX_WORKERS,
+        max_queue_size=settings.PASSWORD_HASHER_MAX_QUEUE_SIZE,
+        schemes=settings.PASSWORD_HASH_SCHEMES,
+        bcrypt_rounds=settings.PASSWORD_BCRYPT_ROUNDS
+    )
+    yield hasher
+    hasher.shutdown()
+
+
+@pytest_asyncio.fixture(scope="function")
+async def client(email_sender_stub, s3_storage_fake, password_hasher):
     """
     Provide an asynchronous HTTP client for testing.
 
-    Overrides the dependencies for email sender and S3 storage with test doubles.
+    Overrides the dependencies for email sender, S3 storage and password hasher with test doubles.
     """
     app.dependency_overrides[get_accounts_email_notificator] = lambda: email_sender_stub
     app.dependency_overrides[get_s3_storage_client] = lambda: s3_storage_fake
+    app.dependency_overrides[get_password_hasher] = lambda: password_hasher
 
     async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as async_client:
         yield async_client
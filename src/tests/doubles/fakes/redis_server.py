@@ -0,0 +1,134 @@
+import asyncio
+from typing import Dict, List, Optional, Set, Union
+
+
+def encode_reply(*items: Union[bytes, int]) -> bytes:
+    """
+    Encode a RESP array of bulk strings and integers, as pushed to subscribers.
+    """
+    parts = [b"*%d\r\n" % len(items)]
+    for item in items:
+        parts.append(b":%d\r\n" % item if isinstance(item, int) else b"$%d\r\n%s\r\n" % (len(item), item))
+    return b"".join(parts)
+
+
+async def read_command(reader: asyncio.StreamReader) -> List[bytes]:
+    """
+    Read one command, sent by the client as a RESP array of bulk strings.
+    """
+    header = await reader.readuntil(b"\r\n")
+    if not header.startswith(b"*"):
+        raise ConnectionError(f"Unexpected command header: {header!r}")
+    args = []
+    for _ in range(int(header[1:-2])):
+        length = await reader.readuntil(b"\r\n")
+        args.append((await reader.readexactly(int(length[1:-2]) + 2))[:-2])
+    return args
+
+
+class FakeRedisServer:
+    """
+    Fake Redis server for integration testing.
+
+    This class speaks just enough RESP2 (CLIENT, PING, AUTH, SELECT, GET, SET, DEL, PUBLISH, SUBSCRIBE,
+    UNSUBSCRIBE) on a local port to serve `redis.asyncio` clients, storing values in memory. Replies
+    to GET can be held back by `reply_delay_seconds` to simulate a slow server.
+    """
+
+    def __init__(self):
+        """
+        Initialize the server with no data, no subscribers and no reply delay.
+        """
+        self.data: Dict[bytes, bytes] = {}
+        self.published: List[bytes] = []
+        self.connections = 0
+        self.reply_delay_seconds = 0.0
+        self.host = "127.0.0.1"
+        self.port: Optional[int] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._writers: Set[asyncio.StreamWriter] = set()
+        self._subscribers: Dict[bytes, Set[asyncio.StreamWriter]] = {}
+
+    @property
+    def subscribers(self) -> int:
+        """
+        Number of connections subscribed to any channel.
+        """
+        return sum(len(writers) for writers in self._subscribers.values())
+
+    async def start(self) -> None:
+        """
+        Start listening on a free local port.
+        """
+        self._server = await asyncio.start_server(self._handle, self.host, 0)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        """
+        Drop every connection and stop listening.
+        """
+        self.drop_connections()
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    def drop_connections(self) -> None:
+        """
+        Close every open client connection from the server side.
+        """
+        for writer in list(self._writers):
+            writer.close()
+        self._writers.clear()
+
+    @staticmethod
+    def _bulk(value: Optional[bytes]) -> bytes:
+        if value is None:
+            return b"$-1\r\n"
+        return b"$%d\r\n%s\r\n" % (len(value), value)
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        self._writers.add(writer)
+        try:
+            while True:
+                command = await read_command(reader)
+                verb, args = command[0].upper(), command[1:]
+
+                if verb in (b"AUTH", b"SELECT", b"CLIENT"):
+                    writer.write(b"+OK\r\n")
+                elif verb == b"PING":
+                    writer.write(b"+PONG\r\n")
+                elif verb == b"GET":
+                    await asyncio.sleep(self.reply_delay_seconds)
+                    writer.write(self._bulk(self.data.get(args[0])))
+                elif verb == b"SET":
+                    self.data[args[0]] = args[1]
+                    writer.write(b"+OK\r\n")
+                elif verb == b"DEL":
+                    deleted = [key for key in args if self.data.pop(key, None) is not None]
+                    writer.write(b":%d\r\n" % len(deleted))
+                elif verb == b"PUBLISH":
+                    self.published.append(args[1])
+                    subscribers = self._subscribers.get(args[0], set())
+                    for subscriber in subscribers:
+                        subscriber.write(encode_reply(b"message", args[0], args[1]))
+                    writer.write(b":%d\r\n" % len(subscribers))
+                elif verb == b"SUBSCRIBE":
+                    for channel in args:
+                        self._subscribers.setdefault(channel, set()).add(writer)
+                        writer.write(encode_reply(b"subscribe", channel, 1))
+                elif verb == b"UNSUBSCRIBE":
+                    channels = args or [channel for channel, writers in self._subscribers.items() if writer in writers]
+                    for channel in channels:
+                        self._subscribers.get(channel, set()).discard(writer)
+                        writer.write(encode_reply(b"unsubscribe", channel, 0))
+                else:
+                    writer.write(b"-ERR unknown command\r\n")
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+            pass
+        finally:
+            for subscribers in self._subscribers.values():
+                subscribers.discard(writer)
+            self._writers.discard(writer)
+            writer.close()
@@ -0,0 +1,118 @@
+import uuid
+from typing import Dict, Optional, Set, Tuple
+
+from aiohttp import web
+
+
+class FakeS3Server:
+    """
+    Fake S3-compatible server for integration testing.
+
+    This class serves the subset of the S3 REST API used by `S3StorageClient` (path-style PUT object
+    and multipart uploads) on a local port, storing objects in memory instead of a real bucket. It
+    also records every client connection, so tests can verify that connections are reused. While
+    `deny_access` is set, every request is answered with an S3 AccessDenied error.
+    """
+
+    def __init__(self):
+        """
+        Initialize the server with no objects and no connections.
+        """
+        self.objects: Dict[str, bytes] = {}
+        self.content_types: Dict[str, str] = {}
+        self.cache_controls: Dict[str, str] = {}
+        self.connections: Set[Tuple[str, int]] = set()
+        self.requests = 0
+        self.deny_access = False
+        self.uploads: Dict[str, Dict[int, bytes]] = {}
+        self.completed_parts: Dict[str, int] = {}
+        self.aborted: Set[str] = set()
+        self.host = "127.0.0.1"
+        self.port: Optional[int] = None
+        self._runner: Optional[web.AppRunner] = None
+
+    @property
+    def endpoint_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    async def start(self) -> None:
+        """
+        Start listening on a free local port.
+        """
+        app = web.Application(client_max_size=1024 ** 3)
+        app.router.add_route("*", "/{bucket}/{key:.+}", self._handle)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, 0)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        """
+        Stop the server and drop every connection.
+        """
+        if self._runner is not None:
+            await self._runner.cleanup()
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        self.requests += 1
+        self.connections.add(request.transport.get_extra_info("peername")[:2])
+        key = f"{request.match_info['bucket']}/{request.match_info['key']}"
+
+        query = request.query
+
+        if self.deny_access:
+            return self._xml_error(403, "AccessDenied", "Access Denied")
+
+        if request.method == "POST" and "uploads" in query:
+            upload_id = uuid.uuid4().hex
+            self.uploads[upload_id] = {}
+            self.content_types[key] = request.headers.get("Content-Type", "")
+            return self._xml(
+                "InitiateMultipartUploadResult",
+                f"<Bucket>{request.match_info['bucket']}</Bucket>"
+                f"<Key>{request.match_info['key']}</Key><UploadId>{upload_id}</UploadId>"
+            )
+        if request.method == "PUT" and "uploadId" in query:
+            body = await request.read()
+            self.uploads[query["uploadId"]][int(query["partNumber"])] = body
+            return web.Response(headers={"ETag": f'"{query["partNumber"]}-{len(body)}"'})
+        if request.method == "POST" and "uploadId" in query:
+            parts = self.uploads.pop(query["uploadId"])
+            self.objects[key] = b"".join(parts[number] for number in sorted(parts))
+            self.completed_parts[key] = len(parts)
+            return self._xml("CompleteMultipartUploadResult", f"<Key>{request.match_info['key']}</Key>")
+        if request.method == "DELETE" and "uploadId" in query:
+            self.uploads.pop(query["uploadId"], None)
+            self.aborted.add(query["uploadId"])
+            return web.Response(status=204)
+        if request.method == "HEAD":
+            if key not in self.objects:
+                return web.Response(status=404)
+            return web.Response(
+                headers={"Content-Length": str(len(self.objects[key])), "Content-Type": self.content_types[key]}
+            )
+        if request.method == "DELETE":
+            self.objects.pop(key, None)
+            return web.Response(status=204)
+        if request.method == "PUT":
+            self.objects[key] = await request.read()
+            self.content_types[key] = request.headers.get("Content-Type", "")
+            self.cache_controls[key] = request.headers.get("Cache-Control", "")
+            return web.Response(headers={"ETag": f'"{len(self.objects[key])}"'})
+        return web.Response(status=405)
+
+    @staticmethod
+    def _xml_error(status: int, code: str, message: str) -> web.Response:
+        return web.Response(
+            status=status,
+            text=f'<?xml version="1.0" encoding="UTF-8"?><Error><Code>{code}</Code><Message>{message}</Message></Error>',
+            content_type="application/xml"
+        )
+
+    @staticmethod
+    def _xml(root: str, body: str) -> web.Response:
+        return web.Response(
+            text=f'<?xml version="1.0" encoding="UTF-8"?><{root}>{body}</{root}>',
+            content_type="application/xml"
+        )
@@ -0,0 +1,104 @@
+import asyncio
+from typing import List, Optional, Set, Tuple
+
+
+class FakeSMTPServer:
+    """
+    Fake SMTP server for integration testing.
+
+    This class speaks just enough ESMTP (EHLO, AUTH PLAIN, MAIL, RCPT, DATA, NOOP, RSET, QUIT) on a
+    local port to accept messages from `aiosmtplib`, storing them in memory and counting the
+    connections it has accepted. Logins are rejected while `reject_auth` is set.
+    """
+
+    def __init__(self):
+        """
+        Initialize the server with no messages and no connections.
+        """
+        self.messages: List[Tuple[str, List[str], str]] = []
+        self.connections = 0
+        self.reject_auth = False
+        self.host = "127.0.0.1"
+        self.port: Optional[int] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._writers: Set[asyncio.StreamWriter] = set()
+
+    @property
+    def open_connections(self) -> int:
+        """
+        Number of client connections that are still open.
+        """
+        return len(self._writers)
+
+    async def start(self) -> None:
+        """
+        Start listening on a free local port.
+        """
+        self._server = await asyncio.start_server(self._handle, self.host, 0)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        """
+        Drop every connection and stop listening.
+        """
+        self.drop_connections()
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    def drop_connections(self) -> None:
+        """
+        Close every open client connection from the server side.
+        """
+        for writer in list(self._writers):
+            writer.close()
+        self._writers.clear()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        self._writers.add(writer)
+        mail_from, rcpt_tos = "", []
+
+        async def reply(line: str) -> None:
+            writer.write(f"{line}\r\n".encode())
+            await writer.drain()
+
+        try:
+            await reply("220 fake-smtp ESMTP ready")
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                command = line.decode().strip()
+                verb = command.split(" ", 1)[0].upper()
+
+                if verb in ("EHLO", "HELO"):
+                    writer.write(b"250-fake-smtp\r\n250 AUTH PLAIN\r\n")
+                    await writer.drain()
+                elif verb == "AUTH" and self.reject_auth:
+                    await reply("535 Authentication credentials invalid")
+                elif verb == "AUTH":
+                    await reply("235 Authentication successful")
+                elif verb == "MAIL":
+                    mail_from, rcpt_tos = command.split(":", 1)[1].strip(" <>"), []
+                    await reply("250 OK")
+                elif verb == "RCPT":
+                    rcpt_tos.append(command.split(":", 1)[1].strip(" <>"))
+                    await reply("250 OK")
+                elif verb == "DATA":
+                    await reply("354 End data with <CR><LF>.<CR><LF>")
+                    data = await reader.readuntil(b"\r\n.\r\n")
+                    self.messages.append((mail_from, rcpt_tos, data[:-5].decode()))
+                    await reply("250 OK")
+                elif verb in ("NOOP", "RSET"):
+                    await reply("250 OK")
+                elif verb == "QUIT":
+                    await reply("221 Bye")
+                    break
+                else:
+                    await reply("502 Command not implemented")
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self._writers.discard(writer)
+            writer.close()
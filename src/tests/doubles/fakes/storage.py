@@ -1,6 +1,6 @@
-from typing import Dict, Union
+from typing import Any, AsyncIterable, Dict, Optional, Union
 
-from storages import S3StorageInterface
+from storages import S3StorageInterface, detect_content_type
 
 
 class FakeS3Storage(S3StorageInterface):
@@ -16,15 +16,110 @@ class FakeS3Storage(S3StorageInterface):
         Initialize the fake storage with an empty dictionary.
         """
         self.storage: Dict[str, bytes] = {}
+        self.content_types: Dict[str, str] = {}
+        self.cache_controls: Dict[str, Optional[str]] = {}
 
-    async def upload_file(self, file_name: str, file_data: Union[bytes, bytearray]) -> None:
+    async def upload_file(
+        self,
+        file_name: str,
+        file_data: Union[bytes, bytearray],
+        content_type: Optional[str] = None,
+        cache_control: Optional[str] = None
+    ) -> None:
         """
         Simulates file upload to S3 by storing the file data in a dictionary.
 
         :param file_name: The name of the file to be stored.
         :param file_data: The file data in bytes.
+        :param content_type: The MIME type; detected from the data and name if omitted.
+        :param cache_control: The `Cache-Control` header served with the file.
         """
         self.storage[file_name] = file_data
+        self.content_types[file_name] = content_type or detect_content_type(file_name, file_data)
+        self.cache_controls[file_name] = cache_control
+
+    async def upload_stream(
+        self,
+        file_name: str,
+        chunks: AsyncIterable[bytes],
+        size_hint: Optional[int] = None,
+        content_type: Optional[str] = None,
+        cache_control: Optional[str] = None
+    ) -> None:
+        """
+        Simulates a streaming upload to S3 by joining the chunks into the dictionary.
+
+        :param file_name: The name of the file to be stored.
+        :param chunks: The file data, chunk by chunk.
+        :param size_hint: The total size in bytes, if known (ignored).
+        :param content_type: The MIME type; detected from the first chunks and name if omitted.
+        :param cache_control: The `Cache-Control` header served with the file.
+        """
+        self.storage[file_name] = b"".join([chunk async for chunk in chunks])
+        self.content_types[file_name] = content_type or detect_content_type(file_name, self.storage[file_name])
+        self.cache_controls[file_name] = cache_control
+
+    async def delete_file(self, file_name: str) -> None:
+        """
+        Simulates deleting a file from S3 by removing it from the dictionary.
+
+        :param file_name: The name of the file to be deleted.
+        """
+        self.storage.pop(file_name, None)
+        self.content_types.pop(file_name, None)
+        self.cache_controls.pop(file_name, None)
+
+    async def generate_presigned_put_url(
+        self,
+        file_name: str,
+        content_type: str,
+        expires_in: int,
+        cache_control: Optional[str] = None
+    ) -> str:
+        """
+        Generates a fake presigned PUT URL; tests store the file with `upload_file` instead.
+
+        :param file_name: The name the file will be stored under.
+        :param content_type: The MIME type of the file.
+        :param expires_in: Number of seconds the URL stays valid.
+        :param cache_control: The `Cache-Control` header the client must send.
+        :return: The fake URL.
+        """
+        return f"http://fake-s3.local/{file_name}?X-Amz-Expires={expires_in}&X-Amz-Signature=fake"
+
+    async def generate_presigned_post(
+        self,
+        file_name: str,
+        content_type: str,
+        max_size: int,
+        expires_in: int,
+        cache_control: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Generates a fake presigned POST form.
+
+        :param file_name: The name the file will be stored under.
+        :param content_type: The MIME type the form must declare.
+        :param max_size: Maximum size of the file in bytes.
+        :param expires_in: Number of seconds the form stays valid.
+        :param cache_control: The `Cache-Control` header the form sets on the file.
+        :return: The fake form URL and fields.
+        """
+        fields = {"key": file_name, "Content-Type": content_type, "policy": "fake", "x-amz-signature": "fake"}
+        if cache_control:
+            fields["Cache-Control"] = cache_control
+        return {"url": "http://fake-s3.local/", "fields": fields}
+
+    async def get_file_metadata(self, file_name: str) -> Optional[Dict[str, Any]]:
+        """
+        Returns the size and content type of a stored file.
+
+        :param file_name: The name of the file.
+        :return: The metadata, or None if the file does not exist.
+        """
+        if file_name not in self.storage:
+            return None
+        return {"size": len(self.storage[file_name]), "content_type": self.content_types.get(file_name, "")}
 
     async def get_file_url(self, file_name: str) -> str:
         """
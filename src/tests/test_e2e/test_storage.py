@@ -1,9 +1,12 @@
+import re
+
 import aioboto3
 import pytest
 from io import BytesIO
 from PIL import Image
 from sqlalchemy import select
 
+from config import get_avatar_pipeline
 from database import UserModel, UserProfileModel
 
 
@@ -19,7 +22,7 @@ async def test_create_user_profile(e2e_client, e2e_db_session, settings, s3_clie
     2. Upload an avatar via `POST /users/{user_id}/profile/`.
     3. Verify that the profile was created successfully.
     4. Verify that the avatar URL is valid.
-    5. Connect directly to MinIO (via aioboto3) and verify that the file exists.
+    5. Connect directly to MinIO (via aioboto3) and verify that every avatar variant exists.
     """
 
     user_email = "test@mate.com"
@@ -64,16 +67,17 @@ async def test_create_user_profile(e2e_client, e2e_db_session, settings, s3_clie
     assert profile_data["date_of_birth"] == "1990-01-01"
     assert "avatar" in profile_data, "Avatar URL is missing!"
 
-    avatar_key = f"avatars/{user.id}_avatar.jpg"
-    expected_url = await s3_client.get_file_url(avatar_key)
-    assert profile_data["avatar"] == expected_url, f"Invalid avatar URL: {profile_data['avatar']}"
-
     stmt_profile = select(UserProfileModel).where(UserProfileModel.user_id == user.id)
     result_profile = await e2e_db_session.execute(stmt_profile)
     profile_in_db = result_profile.scalars().first()
     assert profile_in_db, f"Profile for user {user.id} should exist!"
     assert profile_in_db.avatar, "Avatar path should not be empty!"
 
+    avatar_key = profile_in_db.avatar
+    assert re.fullmatch(rf"avatars/{user.id}_[0-9a-f]{{16}}\.jpg", avatar_key), f"Key is not content-addressed: {avatar_key}"
+    expected_url = await s3_client.get_file_url(avatar_key)
+    assert profile_data["avatar"] == expected_url, f"Invalid avatar URL: {profile_data['avatar']}"
+
     await e2e_db_session.commit()
 
     session = aioboto3.Session()
@@ -83,9 +87,9 @@ async def test_create_user_profile(e2e_client, e2e_db_session, settings, s3_clie
         aws_access_key_id=settings.S3_STORAGE_ACCESS_KEY,
         aws_secret_access_key=settings.S3_STORAGE_SECRET_KEY
     ) as s3:
-        response = await s3.list_objects_v2(
-            Bucket=settings.S3_BUCKET_NAME,
-            Prefix=avatar_key
-        )
-
-    assert "Contents" in response, f"Avatar {avatar_key} was not found in MinIO!"
+        for variant_key in get_avatar_pipeline().variant_keys(avatar_key).values():
+            response = await s3.list_objects_v2(
+                Bucket=settings.S3_BUCKET_NAME,
+                Prefix=variant_key
+            )
+            assert "Contents" in response, f"Avatar {variant_key} was not found in MinIO!"
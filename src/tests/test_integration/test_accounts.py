@@ -1,3 +1,4 @@
+import asyncio
 from datetime import datetime, timezone, timedelta
 from unittest.mock import patch
 
@@ -6,6 +7,7 @@ from sqlalchemy import select, delete, func
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import joinedload
 
+from config import get_password_hasher
 from database import (
     UserModel,
     ActivationTokenModel,
@@ -14,6 +16,8 @@ from database import (
     UserGroupEnum,
     RefreshTokenModel
 )
+from main import app
+from security.hashing import PasswordHasher
 
 
 @pytest.mark.asyncio
@@ -992,3 +996,90 @@ async def test_refresh_access_token_user_not_found(client, db_session, jwt_manag
 
     assert refresh_response.status_code == 404, "Expected status code 404 for non-existent user."
     assert refresh_response.json()["detail"] == "User not found.", "Unexpected error message."
+
+
+@pytest.mark.asyncio
+async def test_login_user_password_hasher_busy(client, db_session, seed_user_groups):
+    """
+    Test that login returns 503 when the password hashing queue is full
+    and succeeds again once the queued job has finished.
+    """
+    user_payload = {
+        "email": "testuser@example.com",
+        "password": "StrongPassword123!"
+    }
+    stmt = select(UserGroupModel).where(UserGroupModel.name == UserGroupEnum.USER)
+    result = await db_session.execute(stmt)
+    user_group = result.scalars().first()
+
+    user = UserModel.create(
+        email=user_payload["email"],
+        raw_password=user_payload["password"],
+        group_id=user_group.id
+    )
+    user.is_active = True
+    db_session.add(user)
+    await db_session.commit()
+
+    hasher = PasswordHasher(max_workers=1, max_queue_size=0)
+    app.dependency_overrides[get_password_hasher] = lambda: hasher
+
+    try:
+        busy_job = asyncio.create_task(hasher.hash("AnotherPassword123!"))
+        await asyncio.sleep(0)
+        assert hasher.pending == 1, "The background job should occupy the only worker."
+
+        response = await client.post("/api/v1/accounts/login/", json=user_payload)
+        assert response.status_code == 503, f"Expected status code 503, but got {response.status_code}"
+        assert response.json()["detail"] == "Server is busy. Please try again later.", \
+            "Unexpected error message for a full hashing queue."
+        assert response.headers.get("Retry-After") == "1", "Retry-After header is missing."
+
+        await busy_job
+        response = await client.post("/api/v1/accounts/login/", json=user_payload)
+        assert response.status_code == 201, f"Expected status code 201, but got {response.status_code}"
+    finally:
+        hasher.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_login_user_rehashes_outdated_password_hash(client, db_session, seed_user_groups):
+    """
+    Test that a successful login replaces a hash made with a different bcrypt cost
+    and that the new hash still verifies the same password.
+    """
+    user_payload = {
+        "email": "testuser@example.com",
+        "password": "StrongPassword123!"
+    }
+    stmt = select(UserGroupModel).where(UserGroupModel.name == UserGroupEnum.USER)
+    result = await db_session.execute(stmt)
+    user_group = result.scalars().first()
+
+    user = UserModel.create(
+        email=user_payload["email"],
+        raw_password=user_payload["password"],
+        group_id=user_group.id
+    )
+    user.is_active = True
+    db_session.add(user)
+    await db_session.commit()
+    old_hashed_password = user.hashed_password
+
+    hasher = PasswordHasher(max_workers=1, max_queue_size=1, bcrypt_rounds=4)
+    app.dependency_overrides[get_password_hasher] = lambda: hasher
+    assert hasher.needs_update(old_hashed_password), "A 14-round hash must not match a 4-round policy."
+
+    try:
+        response = await client.post("/api/v1/accounts/login/", json=user_payload)
+        assert response.status_code == 201, f"Expected status code 201, but got {response.status_code}"
+
+        await db_session.refresh(user)
+        assert user.hashed_password != old_hashed_password, "The outdated hash was not replaced."
+        assert user.hashed_password.startswith("$2b$04$"), "The new hash does not use the configured cost."
+        assert not hasher.needs_update(user.hashed_password), "The new hash must match the policy."
+
+        assert await hasher.verify(user_payload["password"], user.hashed_password), \
+            "The rehashed password does not verify."
+    finally:
+        hasher.shutdown()
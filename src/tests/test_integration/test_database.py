@@ -0,0 +1,430 @@
+import os
+from contextlib import asynccontextmanager
+
+import pandas as pd
+import pytest
+import pytest_asyncio
+from sqlalchemy import exc, func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from config import get_settings
+from database import (
+    Base,
+    get_db_engine,
+    ActorModel,
+    CountryModel,
+    GenreModel,
+    LanguageModel,
+    MovieModel,
+    ActorsMoviesModel,
+    MoviesGenresModel,
+    MoviesLanguagesModel,
+    MovieImportCheckpointModel,
+    UserModel
+)
+from database.populate import CSVDatabaseSeeder
+from database.pool import InstrumentedAsyncQueuePool
+from database.routing import READ_YOUR_WRITES_COOKIE, ReadReplicaRouter, reads_from_replica
+from main import app
+
+
+@pytest_asyncio.fixture(scope="function", loop_scope="function")
+async def pooled_engine(tmp_path):
+    """
+    Provide an engine with an instrumented pool of one connection and one overflow connection.
+    """
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedAsyncQueuePool,
+        pool_size=1,
+        max_overflow=1,
+        pool_timeout=0.1,
+        pool_pre_ping=True
+    )
+    yield engine
+    await engine.dispose()
+
+
+@pytest.mark.asyncio(loop_scope="function")
+async def test_instrumented_pool_records_checkouts_overflow_and_timeouts(pooled_engine):
+    """
+    Test that the pool counts checkouts, tracks the overflow and records a checkout timeout,
+    and that the counters survive disposing of the engine.
+    """
+    async with pooled_engine.connect() as first, pooled_engine.connect() as second:
+        await first.execute(text("SELECT 1"))
+        await second.execute(text("SELECT 1"))
+
+        stats = pooled_engine.pool.stats()
+        assert stats["checked_out"] == 2, "Both connections must be checked out."
+        assert stats["overflow"] == 1, "The second connection must be an overflow connection."
+
+        with pytest.raises(exc.TimeoutError):
+            async with pooled_engine.connect():
+                pass
+
+    stats = pooled_engine.pool.stats()
+    assert stats["checkouts"] == 2, "Only successful checkouts must be counted."
+    assert stats["timeouts"] == 1, "The checkout timeout must be counted."
+    assert stats["overflow_max"] == 1, "The peak overflow must be recorded."
+    assert stats["checked_out"] == 0, "Connections must be returned to the pool."
+    assert stats["wait_seconds_max"] >= 0.1, "The timed out checkout waited for the pool timeout."
+    assert stats["wait_seconds_avg"] == pytest.approx(stats["wait_seconds_total"] / 3), \
+        "The average wait must cover every checkout attempt."
+
+    await pooled_engine.dispose()
+    assert pooled_engine.pool.stats()["checkouts"] == 2, "Counters must survive disposing of the engine."
+
+
+@pytest.mark.asyncio(loop_scope="function")
+async def test_database_pool_stats_endpoint(client, pooled_engine, db_session, seed_user_groups, jwt_manager):
+    """
+    Test that the pool statistics endpoint is restricted to admins, reports the instrumented pool
+    and returns 404 for other pools.
+    """
+    stats_url = "/api/v1/database/pool/stats/"
+
+    user = UserModel.create(email="user@mate.com", raw_password="UserPass123!", group_id=1)  # 1 = User
+    user.is_active = True
+    admin = UserModel.create(email="admin@mate.com", raw_password="AdminPass123!", group_id=3)  # 3 = Admin
+    admin.is_active = True
+    db_session.add_all([user, admin])
+    await db_session.commit()
+
+    response = await client.get(stats_url)
+    assert response.status_code == 401, f"Expected 401 without a token, got {response.status_code}."
+
+    user_token = jwt_manager.create_access_token({"user_id": user.id})
+    response = await client.get(stats_url, headers={"Authorization": f"Bearer {user_token}"})
+    assert response.status_code == 403, f"Expected 403 for a regular user, got {response.status_code}."
+
+    admin_token = jwt_manager.create_access_token({"user_id": admin.id})
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    response = await client.get(stats_url, headers=headers)
+    assert response.status_code == 404, "The in-memory test database has no instrumented pool."
+
+    async with pooled_engine.connect() as connection:
+        await connection.execute(text("SELECT 1"))
+
+    app.dependency_overrides[get_db_engine] = lambda: pooled_engine
+    response = await client.get(stats_url, headers=headers)
+    assert response.status_code == 200, f"Expected 200, got {response.status_code}."
+
+    response_data = response.json()
+    assert response_data["size"] == 1, "Pool size does not match."
+    assert response_data["max_overflow"] == 1, "Max overflow does not match."
+    assert response_data["checkouts"] == 1, "Checkout count does not match."
+    assert response_data["checked_out"] == 0, "No connection must be checked out."
+
+
+@pytest_asyncio.fixture(scope="function", loop_scope="function")
+async def replica_engines(tmp_path):
+    """
+    Provide a primary engine, two replica engines and one replica engine that cannot connect.
+    """
+    engines = {
+        name: create_async_engine(f"sqlite+aiosqlite:///{tmp_path / name}.db")
+        for name in ("primary", "replica_a", "replica_b")
+    }
+    engines["unreachable"] = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'missing' / 'replica.db'}")
+    yield engines
+    for engine in engines.values():
+        await engine.dispose()
+
+
+@pytest.mark.asyncio(loop_scope="function")
+async def test_read_replica_router_balances_skips_unavailable_replicas_and_falls_back(replica_engines, tmp_path):
+    """
+    Test that the router alternates between the replicas, skips a replica that cannot connect,
+    uses the primary when asked to or when no replica is left, and retries a failed replica later.
+    """
+    session_factory = sessionmaker(class_=AsyncSession, expire_on_commit=False)
+
+    async def chosen(router: ReadReplicaRouter, use_primary: bool = False):
+        session = await router.open_session(session_factory, use_primary=use_primary)
+        async with session:
+            return session.bind
+
+    router = ReadReplicaRouter(
+        primary=replica_engines["primary"],
+        replicas=[replica_engines["replica_a"], replica_engines["unreachable"], replica_engines["replica_b"]]
+    )
+    assert [await chosen(router) for _ in range(4)] == [
+        replica_engines["replica_a"],
+        replica_engines["replica_b"],
+        replica_engines["replica_b"],
+        replica_engines["replica_a"],
+    ], "Reads must be spread over the reachable replicas."
+    assert await chosen(router, use_primary=True) is replica_engines["primary"], \
+        "Reads pinned to the primary must not use a replica."
+
+    for use_primary in (False, True):
+        session = await router.open_session(session_factory, use_primary=use_primary)
+        async with session:
+            assert reads_from_replica(session) is not use_primary, "Replica sessions must be marked as such."
+
+    router = ReadReplicaRouter(
+        primary=replica_engines["primary"],
+        replicas=[replica_engines["unreachable"]],
+        retry_seconds=0
+    )
+    assert await chosen(router) is replica_engines["primary"], "Reads must fall back to the primary."
+
+    (tmp_path / "missing").mkdir()
+    assert await chosen(router) is replica_engines["unreachable"], "A recovered replica must be used again."
+
+
+@pytest.mark.asyncio
+async def test_write_pins_reads_to_primary(client, seed_user_groups):
+    """
+    Test that a committed write sets the read-your-writes cookie that keeps the client's reads on the primary.
+    """
+    response = await client.get("/api/v1/theater/movies/")
+    assert READ_YOUR_WRITES_COOKIE not in response.cookies, "A read must not pin the reads to the primary."
+
+    payload = {"email": "replica@example.com", "password": "StrongPassword123!"}
+    response = await client.post("/api/v1/accounts/register/", json=payload)
+    assert response.status_code == 201, f"Expected 201, got {response.status_code}."
+    assert READ_YOUR_WRITES_COOKIE in response.cookies, "A write must pin the reads to the primary."
+
+
+@pytest.mark.asyncio
+async def test_streaming_seeder_deduplicates_across_chunks(db_session, tmp_path):
+    """
+    Test that the streaming seeder inserts every distinct movie once, even when duplicates span chunks,
+    together with all of its associations, and leaves the CSV file untouched.
+    """
+    sample = pd.read_csv(get_settings().PATH_TO_MOVIES_CSV)
+    csv_path = tmp_path / "movies.csv"
+    pd.concat([sample, sample.head(7)], ignore_index=True).to_csv(csv_path, index=False)
+    csv_contents = csv_path.read_bytes()
+
+    seeder = CSVDatabaseSeeder(csv_file_path=str(csv_path), db_session=db_session)
+    await seeder.seed_streaming(chunk_size=5)
+
+    expected = CSVDatabaseSeeder._clean_frame(sample.drop_duplicates(subset=["names", "date_x"]))
+    for model, column in (
+            (MovieModel, None),
+            (MoviesGenresModel, "genre"),
+            (ActorsMoviesModel, "crew"),
+            (MoviesLanguagesModel, "orig_lang")
+    ):
+        count = await db_session.scalar(select(func.count()).select_from(model))
+        expected_count = len(expected) if column is None else len(CSVDatabaseSeeder._split_names(expected[column]))
+        assert count == expected_count, f"Unexpected number of rows in {model}."
+
+    assert csv_path.read_bytes() == csv_contents, "The streaming seeder must not rewrite the CSV file."
+
+
+@pytest.mark.asyncio(loop_scope="function")
+@pytest.mark.skipif(
+    not os.getenv("DATABASE_URL", "").startswith("postgresql"),
+    reason="The COPY path needs DATABASE_URL to point at a PostgreSQL database."
+)
+async def test_seeder_copies_cleaned_unique_movies_into_postgresql(tmp_path):
+    """
+    Test that the PostgreSQL seeder streams movies and associations with COPY, and that a duplicate
+    whose date only differs in whitespace is dropped before the staging insert.
+    """
+    engine = create_async_engine(os.environ["DATABASE_URL"])
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.drop_all)
+        await connection.run_sync(Base.metadata.create_all)
+    session_maker = sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)  # type: ignore
+
+    sample = pd.read_csv(get_settings().PATH_TO_MOVIES_CSV)
+    duplicate = sample.head(1).copy()
+    duplicate["date_x"] = " " + duplicate["date_x"].astype(str) + " "
+    csv_path = tmp_path / "movies.csv"
+    pd.concat([sample, duplicate], ignore_index=True).to_csv(csv_path, index=False)
+
+    try:
+        async with session_maker() as db_session:
+            seeder = CSVDatabaseSeeder(csv_file_path=str(csv_path), db_session=db_session)
+            await seeder.seed()
+
+            expected = CSVDatabaseSeeder._clean_frame(sample)
+            for model, column in (
+                    (MovieModel, None),
+                    (MoviesGenresModel, "genre"),
+                    (ActorsMoviesModel, "crew"),
+                    (MoviesLanguagesModel, "orig_lang")
+            ):
+                count = await db_session.scalar(select(func.count()).select_from(model))
+                expected_count = (
+                    len(expected) if column is None else len(CSVDatabaseSeeder._split_names(expected[column]))
+                )
+                assert count == expected_count, f"Unexpected number of rows in {model}."
+    finally:
+        async with engine.begin() as connection:
+            await connection.run_sync(Base.metadata.drop_all)
+        await engine.dispose()
+
+
+async def _count_rows(db_session, model) -> int:
+    return await db_session.scalar(select(func.count()).select_from(model))
+
+
+@pytest.mark.asyncio
+async def test_incremental_import_upserts_movies_and_diffs_associations(db_session, tmp_path):
+    """
+    Test that an incremental import updates changed movies, writes only the changed associations,
+    and that importing the same file again is a no-op.
+    """
+    sample = pd.read_csv(get_settings().PATH_TO_MOVIES_CSV)
+    csv_path = tmp_path / "catalog.csv"
+    sample.to_csv(csv_path, index=False)
+
+    seeder = CSVDatabaseSeeder(csv_file_path=str(csv_path), db_session=db_session)
+    await seeder.import_incremental(chunk_size=5)
+    movies = await _count_rows(db_session, MovieModel)
+    genre_links = await _count_rows(db_session, MoviesGenresModel)
+    assert movies == len(sample), "Every movie of the first import must be inserted."
+
+    delta = sample.copy()
+    delta.loc[0, "score"] = 12.5
+    delta.loc[0, "genre"] = "Documentary"
+    delta.to_csv(csv_path, index=False)
+
+    await seeder.import_incremental(chunk_size=5)
+    db_session.expire_all()
+
+    assert await _count_rows(db_session, MovieModel) == movies, "Existing movies must be updated, not duplicated."
+    movie = await db_session.scalar(select(MovieModel).where(MovieModel.name == sample.loc[0, "names"]))
+    assert movie.score == 12.5, "The changed score must be applied."
+    await db_session.refresh(movie, ["genres"])
+    assert [genre.name for genre in movie.genres] == ["Documentary"], "The genres must match the new catalog."
+    original_genres = len(CSVDatabaseSeeder._split_names(sample.loc[[0], "genre"]))
+    assert await _count_rows(db_session, MoviesGenresModel) == genre_links - original_genres + 1, \
+        "Only the associations of the changed movie must be rewritten."
+
+    checkpoint = await db_session.scalar(select(MovieImportCheckpointModel))
+    assert checkpoint.completed and checkpoint.rows_committed == len(sample), "The checkpoint must cover the file."
+
+    await seeder.import_incremental(chunk_size=5)
+    assert await _count_rows(db_session, MovieModel) == movies, "Importing the same file again must be a no-op."
+
+
+@pytest.mark.asyncio
+async def test_incremental_import_resumes_after_last_committed_chunk(db_session, tmp_path, monkeypatch):
+    """
+    Test that an interrupted import keeps its committed chunks and resumes after them.
+    """
+    sample = pd.read_csv(get_settings().PATH_TO_MOVIES_CSV)
+    csv_path = tmp_path / "catalog.csv"
+    sample.to_csv(csv_path, index=False)
+
+    seeder = CSVDatabaseSeeder(csv_file_path=str(csv_path), db_session=db_session)
+    import_frame = seeder._import_frame
+    imported_rows = []
+
+    async def failing_import_frame(data):
+        if len(imported_rows) == 2:
+            raise RuntimeError("Connection lost")
+        imported_rows.append(len(data))
+        return await import_frame(data)
+
+    monkeypatch.setattr(seeder, "_import_frame", failing_import_frame)
+    with pytest.raises(RuntimeError):
+        await seeder.import_incremental(chunk_size=5)
+    await db_session.rollback()
+
+    checkpoint = await db_session.scalar(select(MovieImportCheckpointModel))
+    assert checkpoint.rows_committed == 10 and not checkpoint.completed, "Two chunks must be committed."
+    assert await _count_rows(db_session, MovieModel) == 10, "The committed chunks must be kept."
+
+    monkeypatch.setattr(seeder, "_import_frame", import_frame)
+    await seeder.import_incremental(chunk_size=5)
+
+    assert await _count_rows(db_session, MovieModel) == len(sample), "The import must resume and complete."
+    await db_session.refresh(checkpoint)
+    assert checkpoint.completed and checkpoint.rows_committed == len(sample), "The checkpoint must cover the file."
+
+
+@pytest.mark.asyncio
+async def test_resumed_incremental_import_keeps_first_occurrence_of_duplicates(db_session, tmp_path, monkeypatch):
+    """
+    Test that a duplicate of a movie committed before an interruption, whose date only differs
+    in whitespace, is dropped after resuming, as it is in an uninterrupted import.
+    """
+    sample = pd.read_csv(get_settings().PATH_TO_MOVIES_CSV)
+    duplicate = sample.head(1).copy()
+    duplicate["date_x"] = " " + duplicate["date_x"].astype(str) + " "
+    duplicate["score"] = 99.0
+    csv_path = tmp_path / "catalog.csv"
+    pd.concat([sample, duplicate], ignore_index=True).to_csv(csv_path, index=False)
+
+    seeder = CSVDatabaseSeeder(csv_file_path=str(csv_path), db_session=db_session)
+    import_frame = seeder._import_frame
+    chunks = 0
+
+    async def failing_import_frame(data):
+        nonlocal chunks
+        if chunks == 1:
+            raise RuntimeError("Connection lost")
+        chunks += 1
+        return await import_frame(data)
+
+    monkeypatch.setattr(seeder, "_import_frame", failing_import_frame)
+    with pytest.raises(RuntimeError):
+        await seeder.import_incremental(chunk_size=5)
+    await db_session.rollback()
+
+    monkeypatch.setattr(seeder, "_import_frame", import_frame)
+    await seeder.import_incremental(chunk_size=5)
+    db_session.expire_all()
+
+    assert await _count_rows(db_session, MovieModel) == len(sample), "The duplicate must not be inserted."
+    movie = await db_session.scalar(select(MovieModel).where(MovieModel.name == sample.loc[0, "names"]))
+    assert movie.score == sample.loc[0, "score"], "The first occurrence of a movie must be kept."
+
+
+@pytest.mark.asyncio(loop_scope="function")
+async def test_reference_data_is_resolved_concurrently_on_separate_sessions(tmp_path):
+    """
+    Test that with a session factory the four reference dimensions are resolved at the same time,
+    each in its own session, and that the seeded data is complete.
+    """
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'seed.db'}")
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    session_maker = sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)  # type: ignore
+
+    open_sessions = []
+    max_open_sessions = 0
+
+    @asynccontextmanager
+    async def session_factory():
+        nonlocal max_open_sessions
+        async with session_maker() as session:
+            open_sessions.append(session)
+            max_open_sessions = max(max_open_sessions, len(open_sessions))
+            try:
+                yield session
+            finally:
+                open_sessions.remove(session)
+
+    sample = pd.read_csv(get_settings().PATH_TO_MOVIES_CSV)
+    csv_path = tmp_path / "movies.csv"
+    sample.to_csv(csv_path, index=False)
+
+    async with session_maker() as db_session:
+        seeder = CSVDatabaseSeeder(str(csv_path), db_session, session_factory=session_factory)
+        await seeder.seed_streaming()
+
+        assert max_open_sessions == 4, "Each reference dimension must be resolved in its own, concurrent session."
+        for model, column in (
+                (CountryModel, "country"),
+                (GenreModel, "genre"),
+                (ActorModel, "crew"),
+                (LanguageModel, "orig_lang")
+        ):
+            expected_count = (
+                sample[column].nunique() if column == "country"
+                else CSVDatabaseSeeder._split_names(sample[column]).nunique()
+            )
+            assert await _count_rows(db_session, model) == expected_count, f"Unexpected number of rows in {model}."
+        assert await _count_rows(db_session, MovieModel) == len(sample), "Every movie must be seeded."
+
+    await engine.dispose()
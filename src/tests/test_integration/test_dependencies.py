@@ -0,0 +1,98 @@
+import pytest
+
+from config import (
+    dependencies,
+    get_settings,
+    get_jwt_auth_manager,
+    get_accounts_email_notificator,
+    get_password_hasher,
+    reload_dependencies
+)
+from main import app
+from notifications import EmailSender
+from notifications.outbox import EmailOutboxWorker
+
+
+@pytest.mark.asyncio
+async def test_application_scoped_dependencies_are_reused_and_reloaded():
+    """
+    Test that the lifespan builds the settings, JWT manager and email sender once,
+    that every resolution returns the same instances, and that a reload replaces them.
+    """
+    async with app.router.lifespan_context(app):
+        settings = get_settings()
+        jwt_manager = get_jwt_auth_manager(settings)
+        email_sender = get_accounts_email_notificator(settings)
+
+        assert get_settings() is settings, "Settings must be built once per process."
+        assert get_jwt_auth_manager(get_settings()) is jwt_manager, "JWT manager must be reused."
+        assert get_accounts_email_notificator(get_settings()) is email_sender, "Email sender must be reused."
+
+        await reload_dependencies()
+
+        reloaded_settings = get_settings()
+        assert reloaded_settings is not settings, "Reload must re-read the settings."
+        assert reloaded_settings == settings, "Reloaded settings must match an unchanged environment."
+        assert get_jwt_auth_manager(reloaded_settings) is not jwt_manager, "Reload must rebuild the JWT manager."
+        assert get_accounts_email_notificator(reloaded_settings) is not email_sender, \
+            "Reload must rebuild the email sender."
+
+
+@pytest.mark.asyncio
+async def test_reload_keeps_old_services_usable_until_drained():
+    """
+    Test that a reload swaps in new services while requests holding the old ones can still use
+    them, and that the old services are released after the grace period.
+    """
+    async with app.router.lifespan_context(app):
+        hasher = get_password_hasher(get_settings())
+        hashed_password = await hasher.hash("StrongPassword123!")
+
+        await reload_dependencies()
+
+        assert get_password_hasher(get_settings()) is not hasher, "Reload must rebuild the password hasher."
+        assert await hasher.verify("StrongPassword123!", hashed_password), \
+            "A request holding the old hasher must still be able to use it."
+        assert len(dependencies._draining) == 1, "The old services must be drained in the background."
+
+    assert not dependencies._draining, "Shutdown must release the services still draining."
+    assert not dependencies._built_services, "Shutdown must release every built service."
+
+
+@pytest.mark.asyncio
+async def test_close_releases_only_built_services(monkeypatch):
+    """
+    Test that shutting down does not build services that were never used, such as the outbox
+    worker when the outbox is disabled.
+    """
+    built = []
+    monkeypatch.setattr(EmailOutboxWorker, "__init__", lambda *args, **kwargs: built.append(args))
+
+    async with app.router.lifespan_context(app):
+        assert not get_settings().EMAIL_OUTBOX_ENABLED, "The outbox is disabled in the testing settings."
+
+    assert not built, "Shutdown must not build the outbox worker."
+
+
+@pytest.mark.asyncio
+async def test_email_templates_are_prepared_on_startup_and_reload(monkeypatch):
+    """
+    Test that the email templates are pre-rendered when the application starts and again when the
+    dependencies are reloaded, instead of on the first email.
+    """
+    prepared = []
+    prepare_templates = EmailSender.prepare_templates
+
+    async def recording_prepare_templates(self):
+        prepared.append(self)
+        await prepare_templates(self)
+
+    monkeypatch.setattr(EmailSender, "prepare_templates", recording_prepare_templates)
+
+    async with app.router.lifespan_context(app):
+        assert prepared == [get_accounts_email_notificator(get_settings())], "Startup must prepare the templates."
+
+        await reload_dependencies()
+
+        assert prepared[-1] is get_accounts_email_notificator(get_settings()) and len(prepared) == 2, \
+            "Reload must prepare the templates of the new email sender."
@@ -0,0 +1,346 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+import pytest_asyncio
+from jinja2 import DictLoader, Environment, FileSystemLoader
+from sqlalchemy import select
+
+from config import get_accounts_email_notificator, get_settings
+from database import EmailOutboxModel, EmailOutboxStatusEnum, UserModel, get_db_contextmanager
+from exceptions import BaseEmailError
+from main import app
+from notifications import EmailSender
+from notifications.outbox import EmailOutboxWorker, OutboxEmailSender
+from notifications.rendering import PrerenderedTemplate, create_template_environment
+from tests.doubles.stubs.emails import StubEmailSender
+
+
+@pytest_asyncio.fixture(scope="function", loop_scope="function")
+async def email_sender(settings, smtp_server_fake):
+    """
+    Provide an email sender connected to the fake SMTP server.
+    """
+    sender = EmailSender(
+        hostname=smtp_server_fake.host,
+        port=smtp_server_fake.port,
+        email="noreply@mate.com",
+        password="password",
+        use_tls=False,
+        template_dir=settings.PATH_TO_EMAIL_TEMPLATES_DIR,
+        activation_email_template_name=settings.ACTIVATION_EMAIL_TEMPLATE_NAME,
+        activation_complete_email_template_name=settings.ACTIVATION_COMPLETE_EMAIL_TEMPLATE_NAME,
+        password_email_template_name=settings.PASSWORD_RESET_TEMPLATE_NAME,
+        password_complete_email_template_name=settings.PASSWORD_RESET_COMPLETE_TEMPLATE_NAME,
+        pool_max_size=2,
+        pool_idle_timeout_seconds=30
+    )
+    yield sender
+    await sender.close()
+
+
+@pytest.mark.asyncio
+async def test_email_sender_reuses_pooled_connection(email_sender, smtp_server_fake):
+    """
+    Test that consecutive emails are sent over a single SMTP connection.
+    """
+    for i in range(3):
+        await email_sender.send_activation_email(f"user{i}@mate.com", f"http://test/activate/{i}")
+
+    assert len(smtp_server_fake.messages) == 3, "Expected three delivered messages."
+    assert smtp_server_fake.connections == 1, \
+        f"Expected one pooled connection, got {smtp_server_fake.connections}."
+
+    mail_from, rcpt_tos, data = smtp_server_fake.messages[0]
+    assert mail_from == "noreply@mate.com", "Unexpected sender."
+    assert rcpt_tos == ["user0@mate.com"], "Unexpected recipients."
+    assert "Account Activation" in data, "Subject is missing in the message."
+
+
+@pytest.mark.asyncio
+async def test_email_sender_replaces_dropped_connection(email_sender, smtp_server_fake):
+    """
+    Test that a connection closed by the server is detected and replaced transparently.
+    """
+    await email_sender.send_password_reset_email("user@mate.com", "http://test/reset/1")
+    smtp_server_fake.drop_connections()
+
+    await email_sender.send_password_reset_email("user@mate.com", "http://test/reset/2")
+
+    assert len(smtp_server_fake.messages) == 2, "Expected both messages to be delivered."
+    assert smtp_server_fake.connections == 2, "Expected a reconnect after the server dropped the connection."
+
+
+@pytest.mark.asyncio
+async def test_email_sender_discards_connections_from_another_loop(email_sender, smtp_server_fake):
+    """
+    Test that a connection pooled by a send in another, since closed, event loop is not reused.
+    """
+    await asyncio.to_thread(
+        asyncio.run, email_sender.send_activation_email("other-loop@mate.com", "http://test/activate/1")
+    )
+
+    await email_sender.send_activation_email("this-loop@mate.com", "http://test/activate/2")
+
+    assert len(smtp_server_fake.messages) == 2, "Expected both messages to be delivered."
+    assert smtp_server_fake.connections == 2, "Expected a new connection in the current loop."
+
+
+@pytest.mark.asyncio
+async def test_email_sender_closes_connection_when_login_fails(email_sender, smtp_server_fake):
+    """
+    Test that a connection whose login is rejected is closed instead of leaked.
+    """
+    smtp_server_fake.reject_auth = True
+
+    with pytest.raises(BaseEmailError):
+        await email_sender.send_activation_email("user@mate.com", "http://test/activate/")
+
+    for _ in range(50):
+        if smtp_server_fake.open_connections == 0:
+            break
+        await asyncio.sleep(0.01)
+    assert smtp_server_fake.open_connections == 0, "The rejected connection must be closed."
+    assert email_sender._pool.idle_size == 0, "The rejected connection must not be pooled."
+
+
+@pytest.mark.asyncio
+async def test_email_sender_limits_pool_size(email_sender, smtp_server_fake):
+    """
+    Test that concurrent sends never open more connections than the pool size.
+    """
+    await asyncio.gather(*(
+        email_sender.send_activation_complete_email(f"user{i}@mate.com", "http://test/login/")
+        for i in range(6)
+    ))
+
+    assert len(smtp_server_fake.messages) == 6, "Expected six delivered messages."
+    assert smtp_server_fake.connections <= 2, \
+        f"Expected at most two connections, got {smtp_server_fake.connections}."
+
+
+class FailingEmailSender(StubEmailSender):
+    """
+    Email sender that fails every activation email.
+    """
+
+    async def send_activation_email(self, email: str, activation_link: str) -> None:
+        raise BaseEmailError(f"Failed to send email to {email}: relay unavailable")
+
+
+@pytest.mark.asyncio
+async def test_email_outbox_delivers_enqueued_messages(db_session, email_sender, smtp_server_fake):
+    """
+    Test that enqueued messages are stored as pending and delivered in one batch by the worker.
+    """
+    outbox = OutboxEmailSender(db_session)
+    worker = EmailOutboxWorker(sender=email_sender, session_factory=get_db_contextmanager, batch_size=10)
+
+    await outbox.send_activation_email("user@mate.com", "http://test/activate/")
+    await outbox.send_password_reset_email("user@mate.com", "http://test/reset/")
+    await db_session.commit()
+
+    stats = await worker.stats()
+    assert stats["pending"] == 2 and stats["sent"] == 0, f"Unexpected outbox stats: {stats}"
+    assert stats["oldest_pending_age_seconds"] is not None, "Age of the oldest pending message is missing."
+    assert not smtp_server_fake.messages, "Enqueueing must not send anything."
+
+    assert await worker.dispatch_batch() == 2, "Expected both messages in one batch."
+    assert len(smtp_server_fake.messages) == 2, "Expected both messages to be delivered."
+    assert smtp_server_fake.connections <= 2, "The batch must not open more connections than the pool size."
+
+    stats = await worker.stats()
+    assert stats["pending"] == 0 and stats["sent"] == 2, f"Unexpected outbox stats: {stats}"
+    assert stats["oldest_pending_age_seconds"] is None, "No message should be pending."
+    assert await worker.dispatch_batch() == 0, "Sent messages must not be dispatched again."
+
+
+@pytest.mark.asyncio
+async def test_email_outbox_retries_with_backoff(db_session):
+    """
+    Test that a failed message is rescheduled with a backoff and marked as failed after the last attempt.
+    """
+    outbox = OutboxEmailSender(db_session)
+    worker = EmailOutboxWorker(
+        sender=FailingEmailSender(),
+        session_factory=get_db_contextmanager,
+        max_attempts=2,
+        retry_backoff_seconds=60
+    )
+    await outbox.send_activation_email("user@mate.com", "http://test/activate/")
+    await db_session.commit()
+
+    assert await worker.dispatch_batch() == 1, "Expected the message to be attempted."
+    message = (await db_session.execute(select(EmailOutboxModel))).scalars().one()
+    assert message.status == EmailOutboxStatusEnum.PENDING, "Message must stay pending until the last attempt."
+    assert message.attempts == 1, "Attempt was not recorded."
+    assert "relay unavailable" in message.last_error, "Error was not recorded."
+    assert await worker.dispatch_batch() == 0, "Message must not be retried before its backoff has passed."
+
+    message.next_attempt_at = datetime.now(timezone.utc) - timedelta(seconds=1)
+    await db_session.commit()
+
+    assert await worker.dispatch_batch() == 1, "Expected the message to be retried."
+    db_session.expire_all()
+    await db_session.refresh(message)
+    assert message.status == EmailOutboxStatusEnum.FAILED, "Message must fail after the last attempt."
+    assert message.attempts == 2, "Both attempts must be recorded."
+
+
+@pytest.mark.asyncio
+async def test_register_enqueues_activation_email(client, db_session, seed_user_groups, settings, jwt_manager):
+    """
+    Test that registration returns without sending and leaves the activation email in the outbox.
+    """
+    app.dependency_overrides[get_settings] = lambda: settings.model_copy(update={"EMAIL_OUTBOX_ENABLED": True})
+
+    response = await client.post(
+        "/api/v1/accounts/register/",
+        json={"email": "outbox@mate.com", "password": "StrongPassword123!"}
+    )
+    assert response.status_code == 201, f"Expected status code 201, but got {response.status_code}"
+
+    message = (await db_session.execute(select(EmailOutboxModel))).scalars().one()
+    assert message.kind == "activation" and message.recipient == "outbox@mate.com", "Unexpected outbox message."
+    assert "token=" in message.payload["activation_link"], "Activation link must carry the token."
+
+    stats_url = "/api/v1/accounts/email-outbox/stats/"
+    user = UserModel.create(email="user@mate.com", raw_password="UserPass123!", group_id=1)  # 1 = User
+    user.is_active = True
+    admin = UserModel.create(email="admin@mate.com", raw_password="AdminPass123!", group_id=3)  # 3 = Admin
+    admin.is_active = True
+    db_session.add_all([user, admin])
+    await db_session.commit()
+
+    stats_response = await client.get(stats_url)
+    assert stats_response.status_code == 401, f"Expected 401 without a token, got {stats_response.status_code}"
+
+    user_token = jwt_manager.create_access_token({"user_id": user.id})
+    stats_response = await client.get(stats_url, headers={"Authorization": f"Bearer {user_token}"})
+    assert stats_response.status_code == 403, f"Expected 403 for a regular user, got {stats_response.status_code}"
+
+    admin_token = jwt_manager.create_access_token({"user_id": admin.id})
+    stats_response = await client.get(stats_url, headers={"Authorization": f"Bearer {admin_token}"})
+    assert stats_response.status_code == 200, f"Expected status code 200, but got {stats_response.status_code}"
+    assert stats_response.json()["pending"] == 1, "Outbox stats must report the queued message."
+
+
+
+@pytest.mark.asyncio
+async def test_outbox_message_is_discarded_with_its_transaction(db_session):
+    """
+    Test that a message is only stored when the transaction it was enqueued in commits.
+    """
+    outbox = OutboxEmailSender(db_session)
+    await outbox.send_activation_email("rolled-back@mate.com", "http://test/activate/")
+    await db_session.rollback()
+
+    await outbox.send_activation_email("committed@mate.com", "http://test/activate/")
+    await db_session.commit()
+
+    recipients = (await db_session.execute(select(EmailOutboxModel.recipient))).scalars().all()
+    assert recipients == ["committed@mate.com"], "Only the committed message must be stored."
+
+
+@pytest.mark.asyncio
+async def test_email_outbox_claims_messages_with_a_lease(db_session):
+    """
+    Test that claimed messages are not claimed again while leased, become due again once the
+    lease expires, and that the outcome of an expired claim does not overwrite the new claim.
+    """
+    db_session.add(EmailOutboxModel(kind="activation", recipient="user@mate.com", payload={"activation_link": "x"}))
+    await db_session.commit()
+
+    worker = EmailOutboxWorker(sender=StubEmailSender(), session_factory=get_db_contextmanager, lease_seconds=60)
+    claimed = await worker._claim_batch()
+    assert len(claimed) == 1 and claimed[0].attempts == 1, "The claim must count an attempt."
+    assert await worker._claim_batch() == [], "A leased message must not be claimed twice."
+
+    expired = EmailOutboxWorker(sender=StubEmailSender(), session_factory=get_db_contextmanager, lease_seconds=-1)
+    message = await db_session.get(EmailOutboxModel, claimed[0].id)
+    message.next_attempt_at = datetime.now(timezone.utc) - timedelta(seconds=1)
+    await db_session.commit()
+    reclaimed = await expired._claim_batch()
+    assert len(reclaimed) == 1 and reclaimed[0].attempts == 2, "An expired lease must make the message due again."
+
+    await worker._record_outcomes(claimed, [None])
+    db_session.expire_all()
+    message = await db_session.get(EmailOutboxModel, claimed[0].id)
+    assert message.status == EmailOutboxStatusEnum.PENDING, "A stale claim must not record its outcome."
+
+    await expired._record_outcomes(reclaimed, [None])
+    db_session.expire_all()
+    message = await db_session.get(EmailOutboxModel, claimed[0].id)
+    assert message.status == EmailOutboxStatusEnum.SENT, "The current claim must record its outcome."
+
+
+@pytest.mark.asyncio
+async def test_direct_email_failure_does_not_fail_committed_registration(client, db_session, seed_user_groups):
+    """
+    Test that an email delivery error after registration is logged instead of turning the
+    committed registration into a 500 response.
+    """
+    app.dependency_overrides[get_accounts_email_notificator] = lambda: FailingEmailSender()
+
+    payload = {"email": "smtp-down@mate.com", "password": "StrongPassword123!"}
+    response = await client.post("/api/v1/accounts/register/", json=payload)
+    assert response.status_code == 201, f"Expected status code 201, but got {response.status_code}"
+
+    retry = await client.post("/api/v1/accounts/register/", json=payload)
+    assert retry.status_code == 409, "The user must have been created by the first request."
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("template_name, link_variable", [
+    ("activation_request.html", "activation_link"),
+    ("activation_complete.html", "login_link"),
+    ("password_reset_request.html", "reset_link"),
+    ("password_reset_complete.html", "login_link"),
+])
+async def test_prerendered_templates_match_jinja(settings, tmp_path, template_name, link_variable):
+    """
+    Test that pre-rendered email templates produce exactly the output of a regular Jinja render
+    and that the compiled templates are written to the bytecode cache.
+    """
+    env = create_template_environment(settings.PATH_TO_EMAIL_TEMPLATES_DIR, str(tmp_path))
+    template = PrerenderedTemplate(env.get_template(template_name), ("email", link_variable))
+    values = {"email": "user@mate.com", link_variable: "http://test/link/?email=user%40mate.com&token=abc"}
+
+    rendered = await template.render(**values)
+
+    assert template.is_prerendered, f"Template {template_name} should be pre-rendered."
+    expected = Environment(loader=FileSystemLoader(settings.PATH_TO_EMAIL_TEMPLATES_DIR)).get_template(
+        template_name
+    ).render(**values)
+    assert rendered == expected, f"Pre-rendered output of {template_name} differs from Jinja's."
+    assert list(tmp_path.iterdir()), "Compiled template was not written to the bytecode cache."
+
+
+@pytest.mark.asyncio
+async def test_email_sender_renders_prepared_templates_without_compiling(email_sender, smtp_server_fake, monkeypatch):
+    """
+    Test that once the templates are prepared, sending an email does not pre-render them again.
+    """
+    await email_sender.prepare_templates()
+
+    async def failing_prepare(self):
+        raise AssertionError("Prepared templates must not be pre-rendered again.")
+
+    monkeypatch.setattr(PrerenderedTemplate, "prepare", failing_prepare)
+
+    await email_sender.send_activation_email("user@mate.com", "http://test/activate/")
+    await email_sender.send_password_reset_complete_email("user@mate.com", "http://test/login/")
+
+    assert len(smtp_server_fake.messages) == 2, "Expected both messages to be delivered."
+
+
+@pytest.mark.asyncio
+async def test_prerendered_template_falls_back_to_jinja():
+    """
+    Test that a template transforming its variables is rendered by Jinja instead of pre-rendered.
+    """
+    env = Environment(loader=DictLoader({"upper.html": "<p>{{ email | upper }}</p>"}), enable_async=True)
+    template = PrerenderedTemplate(env.get_template("upper.html"), ("email",))
+
+    assert await template.render(email="user@mate.com") == "<p>USER@MATE.COM</p>", "Unexpected fallback output."
+    assert not template.is_prerendered, "Template with a filter must not be pre-rendered."
@@ -1,16 +1,23 @@
+import asyncio
 import random
+import time
 
 import pytest
 from sqlalchemy import select, func
 from sqlalchemy.orm import joinedload
 
-from database import MovieModel
+from caches import InMemoryCache, LRUTTLCache, RedisCache
+from config import get_cache, get_settings
+from database import get_db_contextmanager, get_read_db, MovieModel, UserModel
+from database.routing import READ_REPLICA_SESSION_INFO_KEY, READ_YOUR_WRITES_COOKIE
 from database import (
     GenreModel,
     ActorModel,
     LanguageModel,
     CountryModel
 )
+from main import app
+from routes.movies import movie_detail_cache_key
 
 
 @pytest.mark.asyncio
@@ -408,6 +415,41 @@ async def test_create_movie_and_related_models(client, db_session):
     assert country is not None, f"Country '{movie_data['country']}' was not created."
 
 
+@pytest.mark.asyncio
+async def test_create_movie_reuses_existing_related_models(client, db_session):
+    """
+    Test that creating movies with a large, partly shared cast reuses existing actors
+    and does not create duplicates for repeated names in the payload.
+    """
+    shared_actors = [f"Shared Actor {i}" for i in range(20)]
+    base_movie = {
+        "date": "2025-01-01",
+        "score": 70.0,
+        "overview": "A movie with a large cast.",
+        "status": "Released",
+        "budget": 1000000.00,
+        "revenue": 5000000.00,
+        "country": "US",
+        "genres": ["Drama", "Drama"],
+        "languages": ["English"]
+    }
+
+    first = {**base_movie, "name": "First Cast Movie", "actors": shared_actors + shared_actors[:5]}
+    response = await client.post("/api/v1/theater/movies/", json=first)
+    assert response.status_code == 201, f"Expected status code 201, but got {response.status_code}"
+    assert len(response.json()["actors"]) == len(shared_actors), "Repeated actor names must be linked once."
+    assert len(response.json()["genres"]) == 1, "Repeated genre names must be linked once."
+
+    second_actors = shared_actors[10:] + [f"New Actor {i}" for i in range(10)]
+    second = {**base_movie, "name": "Second Cast Movie", "actors": second_actors}
+    response = await client.post("/api/v1/theater/movies/", json=second)
+    assert response.status_code == 201, f"Expected status code 201, but got {response.status_code}"
+    assert {actor["name"] for actor in response.json()["actors"]} == set(second_actors), "Cast mismatch."
+
+    result = await db_session.execute(select(func.count(ActorModel.id)))
+    assert result.scalar_one() == 30, "Existing actors must be reused instead of duplicated."
+
+
 @pytest.mark.asyncio
 async def test_create_movie_duplicate_error(client, db_session, seed_database):
     """
@@ -536,3 +578,388 @@ async def test_update_movie_not_found(client):
     assert response_data["detail"] == expected_detail, (
         f"Expected detail message: {expected_detail}, but got: {response_data['detail']}"
     )
+
+
+@pytest.mark.asyncio
+async def test_movie_list_cursor_pagination_matches_offset_pages(client, db_session, seed_database):
+    """
+    Test that walking the list with `next_cursor` returns the same pages as `page`/`per_page`.
+    """
+    per_page = 5
+
+    stmt = select(MovieModel.id).order_by(MovieModel.id.desc())
+    result = await db_session.execute(stmt)
+    expected_ids = list(result.scalars().all())
+
+    response = await client.get(f"/api/v1/theater/movies/?page=1&per_page={per_page}")
+    assert response.status_code == 200, f"Expected status code 200, but got {response.status_code}"
+    response_data = response.json()
+    assert response_data["prev_cursor"] is None, "First page must not have a previous cursor."
+
+    returned_ids = [movie["id"] for movie in response_data["movies"]]
+    next_cursor = response_data["next_cursor"]
+
+    while next_cursor:
+        response = await client.get(f"/api/v1/theater/movies/?cursor={next_cursor}&per_page={per_page}")
+        assert response.status_code == 200, f"Expected status code 200, but got {response.status_code}"
+        response_data = response.json()
+        assert response_data["total_items"] == len(expected_ids), "Total items mismatch."
+        assert response_data["prev_cursor"] is not None, "Cursor pages after the first must have a previous cursor."
+        returned_ids.extend(movie["id"] for movie in response_data["movies"])
+        next_cursor = response_data["next_cursor"]
+
+    assert returned_ids == expected_ids, (
+        f"Cursor pagination returned a different sequence. Expected: {expected_ids}, got: {returned_ids}"
+    )
+
+
+@pytest.mark.asyncio
+async def test_movie_list_prev_cursor_returns_previous_page(client, seed_database):
+    """
+    Test that following `prev_cursor` from the second page returns the first page in `id DESC` order.
+    """
+    per_page = 5
+
+    first_page = (await client.get(f"/api/v1/theater/movies/?per_page={per_page}")).json()
+    second_page = (await client.get(
+        f"/api/v1/theater/movies/?cursor={first_page['next_cursor']}&per_page={per_page}"
+    )).json()
+
+    response = await client.get(f"/api/v1/theater/movies/?cursor={second_page['prev_cursor']}&per_page={per_page}")
+    assert response.status_code == 200, f"Expected status code 200, but got {response.status_code}"
+    response_data = response.json()
+
+    assert [movie["id"] for movie in response_data["movies"]] == [movie["id"] for movie in first_page["movies"]], (
+        "Previous cursor did not return the first page."
+    )
+    assert response_data["prev_cursor"] is None, "First page reached via cursor must not have a previous cursor."
+    assert response_data["next_page"] == (
+        f"/theater/movies/?cursor={response_data['next_cursor']}&per_page={per_page}"
+    ), "Next page link must carry the next cursor."
+
+
+@pytest.mark.asyncio
+async def test_movie_list_invalid_cursor(client, seed_database):
+    """
+    Test that a malformed cursor is rejected with a 400 error.
+    """
+    response = await client.get("/api/v1/theater/movies/?cursor=not-a-cursor")
+
+    assert response.status_code == 400, f"Expected status code 400, but got {response.status_code}"
+    assert response.json() == {"detail": "Invalid cursor."}, f"Unexpected response: {response.json()}"
+
+
+@pytest.mark.asyncio
+async def test_movie_list_count_modes(client, db_session, seed_database):
+    """
+    Test that `count=exact` and `count=estimate` both report the real total on SQLite,
+    where no planner estimate is available.
+    """
+    count_stmt = select(func.count(MovieModel.id))
+    result = await db_session.execute(count_stmt)
+    total_items = result.scalar_one()
+
+    for count_mode in ("exact", "estimate"):
+        response = await client.get(f"/api/v1/theater/movies/?count={count_mode}")
+        assert response.status_code == 200, f"Expected status code 200, but got {response.status_code}"
+        response_data = response.json()
+        assert response_data["total_items"] == total_items, f"Total items mismatch for count={count_mode}."
+        assert response_data["count_type"] == "exact", (
+            f"Expected an exact count for count={count_mode}, got {response_data['count_type']}"
+        )
+
+
+@pytest.mark.asyncio
+async def test_movie_list_cached_count_invalidated_by_writes(client, db_session, seed_database, settings):
+    """
+    Test that the cached total is reused between list requests and refreshed after create and delete.
+    """
+    cache = InMemoryCache(max_size=10)
+    app.dependency_overrides[get_cache] = lambda: cache
+    app.dependency_overrides[get_settings] = lambda: settings.model_copy(
+        update={"MOVIE_COUNT_CACHE_TTL_SECONDS": 60}
+    )
+
+    first = (await client.get("/api/v1/theater/movies/")).json()
+    second = (await client.get("/api/v1/theater/movies/")).json()
+    assert first["count_type"] == "exact", "First request must compute the count."
+    assert second["count_type"] == "cached", "Second request must be served from the count cache."
+    assert second["total_items"] == first["total_items"], "Cached total differs from the exact one."
+
+    movie_data = {
+        "name": "Count Cache Movie",
+        "date": "2025-01-01",
+        "score": 80.0,
+        "overview": "A movie that changes the count.",
+        "status": "Released",
+        "budget": 1000000.00,
+        "revenue": 2000000.00,
+        "country": "US",
+        "genres": ["Drama"],
+        "actors": ["John Doe"],
+        "languages": ["English"]
+    }
+    create_response = await client.post("/api/v1/theater/movies/", json=movie_data)
+    assert create_response.status_code == 201, f"Expected status code 201, but got {create_response.status_code}"
+
+    after_create = (await client.get("/api/v1/theater/movies/")).json()
+    assert after_create["count_type"] == "exact", "Create must invalidate the cached count."
+    assert after_create["total_items"] == first["total_items"] + 1, "Total items not refreshed after create."
+
+    delete_response = await client.delete(f"/api/v1/theater/movies/{create_response.json()['id']}/")
+    assert delete_response.status_code == 204, f"Expected status code 204, but got {delete_response.status_code}"
+
+    after_delete = (await client.get("/api/v1/theater/movies/")).json()
+    assert after_delete["total_items"] == first["total_items"], "Total items not refreshed after delete."
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("strategy", ["joined", "selectin", "json"])
+async def test_get_movie_by_id_loading_strategies(client, db_session, seed_database, settings, strategy):
+    """
+    Test that every relationship loading strategy of the detail endpoint returns the same data.
+    """
+    stmt = (
+        select(MovieModel)
+        .options(
+            joinedload(MovieModel.country),
+            joinedload(MovieModel.genres),
+            joinedload(MovieModel.actors),
+            joinedload(MovieModel.languages),
+        )
+        .order_by(MovieModel.id)
+        .limit(1)
+    )
+    result = await db_session.execute(stmt)
+    movie = result.unique().scalars().first()
+
+    app.dependency_overrides[get_settings] = lambda: settings.model_copy(
+        update={"MOVIE_DETAIL_LOADING_STRATEGY": strategy}
+    )
+    response = await client.get(f"/api/v1/theater/movies/{movie.id}/")
+
+    assert response.status_code == 200, f"Expected status code 200, but got {response.status_code}"
+    response_data = response.json()
+
+    assert response_data["country"] == {
+        "id": movie.country.id, "code": movie.country.code, "name": movie.country.name
+    }, "Country mismatch."
+    for field, related in (("genres", movie.genres), ("actors", movie.actors), ("languages", movie.languages)):
+        expected = sorted((item.id, item.name) for item in related)
+        actual = sorted((item["id"], item["name"]) for item in response_data[field])
+        assert actual == expected, f"{field} mismatch for strategy '{strategy}'."
+
+
+@pytest.mark.asyncio
+async def test_get_movie_by_id_cache_hit_and_invalidation(client, db_session, seed_database, jwt_manager):
+    """
+    Test that movie details are served from the detail cache and refreshed after an update and a delete.
+    """
+    cache = InMemoryCache(max_size=10)
+    app.dependency_overrides[get_cache] = lambda: cache
+
+    stmt = select(MovieModel.id).order_by(MovieModel.id).limit(1)
+    result = await db_session.execute(stmt)
+    movie_id = result.scalar_one()
+
+    first = await client.get(f"/api/v1/theater/movies/{movie_id}/")
+    second = await client.get(f"/api/v1/theater/movies/{movie_id}/")
+    assert first.status_code == second.status_code == 200, "Expected status code 200 for both requests."
+    assert first.json() == second.json(), "Cached payload differs from the original one."
+
+    admin = UserModel.create(email="admin@mate.com", raw_password="AdminPass123!", group_id=3)  # 3 = Admin
+    admin.is_active = True
+    db_session.add(admin)
+    await db_session.commit()
+    admin_token = jwt_manager.create_access_token({"user_id": admin.id})
+
+    stats_url = "/api/v1/theater/movies/cache/stats/"
+    response = await client.get(stats_url)
+    assert response.status_code == 401, "Cache statistics must not be exposed without authentication."
+
+    stats = (await client.get(stats_url, headers={"Authorization": f"Bearer {admin_token}"})).json()
+    assert stats["hits"] == 1 and stats["misses"] == 1, f"Unexpected cache counters: {stats}"
+    assert stats["size"] == 1 and stats["max_size"] == 10, f"Unexpected cache size: {stats}"
+
+    update_response = await client.patch(f"/api/v1/theater/movies/{movie_id}/", json={"name": "Cached No More"})
+    assert update_response.status_code == 200, f"Expected status code 200, but got {update_response.status_code}"
+
+    updated = await client.get(f"/api/v1/theater/movies/{movie_id}/")
+    assert updated.json()["name"] == "Cached No More", "Update must invalidate the cached payload."
+
+    delete_response = await client.delete(f"/api/v1/theater/movies/{movie_id}/")
+    assert delete_response.status_code == 204, f"Expected status code 204, but got {delete_response.status_code}"
+
+    deleted = await client.get(f"/api/v1/theater/movies/{movie_id}/")
+    assert deleted.status_code == 404, "Delete must invalidate the cached payload."
+
+
+
+@pytest.mark.asyncio
+async def test_movie_caches_are_bypassed_for_own_writes_and_not_filled_from_replicas(
+        client, db_session, seed_database
+):
+    """
+    Test that a client reading its own writes skips the cached detail and count, and that
+    rows read from a replica are not stored in the shared cache.
+    """
+    cache = InMemoryCache(max_size=10)
+    app.dependency_overrides[get_cache] = lambda: cache
+
+    movie_id = (await db_session.execute(select(MovieModel.id).order_by(MovieModel.id).limit(1))).scalar_one()
+    await cache.set(movie_detail_cache_key(movie_id), b'{"name": "Stale"}')
+    await cache.set(f"counts:{MovieModel.__tablename__}", b"1")
+
+    cached = await client.get(f"/api/v1/theater/movies/{movie_id}/")
+    assert cached.json() == {"name": "Stale"}, "Other clients must be served from the cache."
+
+    client.cookies.set(READ_YOUR_WRITES_COOKIE, str(time.time() + 60))
+    fresh = await client.get(f"/api/v1/theater/movies/{movie_id}/")
+    assert fresh.json()["id"] == movie_id, "A client reading its own writes must bypass the detail cache."
+    fresh_list = await client.get("/api/v1/theater/movies/")
+    assert fresh_list.json()["total_items"] > 1, "A client reading its own writes must bypass the cached count."
+    client.cookies.clear()
+
+    async def get_replica_db():
+        async with get_db_contextmanager() as session:
+            session.info[READ_REPLICA_SESSION_INFO_KEY] = True
+            yield session
+
+    app.dependency_overrides[get_read_db] = get_replica_db
+    await cache.delete(movie_detail_cache_key(movie_id), f"counts:{MovieModel.__tablename__}")
+
+    assert (await client.get(f"/api/v1/theater/movies/{movie_id}/")).status_code == 200, "Expected status code 200."
+    assert (await client.get("/api/v1/theater/movies/")).status_code == 200, "Expected status code 200."
+    assert cache.stats()["size"] == 0, "Rows read from a replica must not be cached."
+
+
+def test_lru_ttl_cache_evicts_least_recently_used():
+    """
+    Test that the cache evicts the least recently used entry and counts the eviction.
+    """
+    cache = LRUTTLCache(max_size=2, ttl_seconds=0)
+    cache.set(1, b"one")
+    cache.set(2, b"two")
+    assert cache.get(1) == b"one", "Entry 1 should be cached."
+
+    cache.set(3, b"three")
+
+    assert cache.get(2) is None, "Entry 2 was least recently used and should be evicted."
+    assert cache.get(1) == b"one" and cache.get(3) == b"three", "Recently used entries must stay cached."
+    assert cache.stats()["evictions"] == 1, f"Unexpected counters: {cache.stats()}"
+
+
+async def _wait_until(condition, timeout_seconds: float = 2.0) -> bool:
+    deadline = asyncio.get_running_loop().time() + timeout_seconds
+    while not condition():
+        if asyncio.get_running_loop().time() > deadline:
+            return False
+        await asyncio.sleep(0.01)
+    return True
+
+
+@pytest.mark.asyncio(loop_scope="function")
+async def test_redis_cache_discards_connection_of_interrupted_command(redis_server_fake):
+    """
+    Test that a command cancelled or timed out while waiting for its reply does not leave the reply
+    on a pooled connection, so the next command reads its own reply.
+    """
+    redis_server_fake.data = {b"theater:a": b"A", b"theater:b": b"B"}
+    cache = RedisCache(
+        host=redis_server_fake.host,
+        port=redis_server_fake.port,
+        local_max_size=0,
+        command_timeout_seconds=0.2,
+        pool_max_size=1
+    )
+    try:
+        redis_server_fake.reply_delay_seconds = 0.1
+        pending = asyncio.create_task(cache.get("a"))
+        await asyncio.sleep(0.05)
+        pending.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await pending
+        assert await cache.get("b") == b"B", "A cancelled command must not leak its reply to the next one."
+
+        redis_server_fake.reply_delay_seconds = 0.3
+        assert await cache.get("a") is None, "A timed out command must be treated as a miss."
+        redis_server_fake.reply_delay_seconds = 0
+        await asyncio.sleep(0.3)
+        assert await cache.get("b") == b"B", "A timed out command must not leak its reply to the next one."
+    finally:
+        await cache.close()
+
+
+@pytest.mark.asyncio(loop_scope="function")
+async def test_redis_cache_pools_connections_for_concurrent_commands(redis_server_fake):
+    """
+    Test that concurrent commands run over separate pooled connections instead of waiting for each other,
+    and that the connections are reused afterwards.
+    """
+    redis_server_fake.data = {f"theater:{i}".encode(): str(i).encode() for i in range(4)}
+    redis_server_fake.reply_delay_seconds = 0.2
+    cache = RedisCache(host=redis_server_fake.host, port=redis_server_fake.port, local_max_size=0, pool_max_size=4)
+    try:
+        started = asyncio.get_running_loop().time()
+        values = await asyncio.gather(*(cache.get(str(i)) for i in range(4)))
+        elapsed = asyncio.get_running_loop().time() - started
+
+        assert values == [str(i).encode() for i in range(4)], "Every command must receive its own reply."
+        assert elapsed < 0.6, f"Concurrent commands must not be serialized, took {elapsed:.2f}s."
+
+        connections = redis_server_fake.connections
+        await asyncio.gather(*(cache.get(str(i)) for i in range(4)))
+        assert redis_server_fake.connections == connections, "Pooled connections must be reused."
+    finally:
+        await cache.close()
+
+
+@pytest.mark.asyncio(loop_scope="function")
+async def test_redis_cache_delete_purges_near_caches_of_other_workers(redis_server_fake):
+    """
+    Test that a delete removes the key on the server and publishes it, so the near cache of
+    another worker drops its copy instead of serving it until the near-cache TTL expires.
+    """
+    options = {"host": redis_server_fake.host, "port": redis_server_fake.port, "local_ttl_seconds": 60}
+    reader, writer = RedisCache(**options), RedisCache(**options)
+    try:
+        await writer.set("movie:1", b"payload")
+        assert await reader.get("movie:1") == b"payload", "The value must be read from the server."
+        assert await _wait_until(lambda: redis_server_fake.subscribers == 1), "The reader must subscribe."
+        await writer.get("movie:1")
+        assert await _wait_until(lambda: redis_server_fake.subscribers == 2), "The writer must subscribe."
+
+        redis_server_fake.data.clear()
+        assert await reader.get("movie:1") == b"payload", "The value must be served from the near cache."
+
+        await writer.delete("movie:1")
+
+        assert redis_server_fake.published == [b"movie:1"], "The deleted key must be published."
+        assert await _wait_until(lambda: reader.stats()["size"] == 0), "The near cache must be purged."
+        assert await reader.get("movie:1") is None, "A deleted key must not be served from the near cache."
+    finally:
+        await reader.close()
+        await writer.close()
+
+
+@pytest.mark.asyncio(loop_scope="function")
+async def test_redis_cache_reconnects_after_server_drops_connections(redis_server_fake):
+    """
+    Test that commands reconnect after the server dropped the pooled connections, and that the
+    invalidation listener resubscribes and clears the near cache, whose entries may have missed
+    an invalidation in the meantime.
+    """
+    cache = RedisCache(host=redis_server_fake.host, port=redis_server_fake.port, local_ttl_seconds=60)
+    try:
+        await cache.set("movie:1", b"payload")
+        assert await cache.get("movie:1") == b"payload", "The value must be served from the near cache."
+        assert await _wait_until(lambda: redis_server_fake.subscribers == 1), "The cache must subscribe."
+
+        redis_server_fake.drop_connections()
+        redis_server_fake.data[b"theater:movie:1"] = b"updated"
+
+        assert await _wait_until(lambda: redis_server_fake.subscribers == 1 and cache.stats()["size"] == 0), \
+            "The listener must resubscribe and clear the near cache."
+        assert await cache.get("movie:1") == b"updated", "A dropped pooled connection must be replaced."
+    finally:
+        await cache.close()
@@ -1,3 +1,5 @@
+import hashlib
+import re
 from datetime import datetime, timedelta
 from unittest.mock import patch
 
@@ -41,7 +43,6 @@ async def test_create_user_profile_with_fake_s3(
     img.save(img_bytes, format="JPEG")
     img_bytes.seek(0)
 
-    avatar_key = f"avatars/{user.id}_avatar.jpg"
     profile_url = f"/api/v1/profiles/users/{user.id}/profile/"
     headers = {"Authorization": f"Bearer {access_token}"}
     files = {
@@ -63,10 +64,17 @@ async def test_create_user_profile_with_fake_s3(
     assert profile_data["date_of_birth"] == "1990-01-01", "Date of birth does not match."
     assert "avatar" in profile_data, "Avatar URL is missing!"
 
+    avatar_key = profile_data["avatar"].removeprefix("http://fake-s3.local/")
+    assert re.fullmatch(rf"avatars/{user.id}_[0-9a-f]{{16}}\.jpg", avatar_key), f"Key is not content-addressed: {avatar_key}"
     assert avatar_key in s3_storage_fake.storage, "Avatar file was not uploaded to Fake S3 Storage!"
     expected_url = f"http://fake-s3.local/{avatar_key}"
     actual_url = await s3_storage_fake.get_file_url(avatar_key)
     assert actual_url == expected_url, "Avatar URL does not match expected URL."
+    assert hashlib.sha256(s3_storage_fake.storage[avatar_key]).hexdigest().startswith(avatar_key[-20:-4]), \
+        "Key does not match the hash of the stored avatar."
+    assert s3_storage_fake.content_types[avatar_key] == "image/jpeg", "Unexpected content type."
+    assert s3_storage_fake.cache_controls[avatar_key] == "public, max-age=31536000, immutable", \
+        "Avatar must be cacheable forever."
 
     stmt_profile = select(UserProfileModel).where(UserProfileModel.user_id == user.id)
     result_profile = await db_session.execute(stmt_profile)
@@ -191,7 +199,6 @@ async def test_admin_creates_user_profile(
     img.save(img_bytes, format="JPEG")
     img_bytes.seek(0)
 
-    avatar_key = f"avatars/{regular_user.id}_avatar.jpg"
     profile_url = f"/api/v1/profiles/users/{regular_user.id}/profile/"
     headers = {"Authorization": f"Bearer {admin_token}"}
     files = {
@@ -213,6 +220,9 @@ async def test_admin_creates_user_profile(
     assert profile_data["date_of_birth"] == "1990-01-01"
     assert "avatar" in profile_data, "Avatar URL is missing!"
 
+    avatar_key = profile_data["avatar"].removeprefix("http://fake-s3.local/")
+    assert re.fullmatch(rf"avatars/{regular_user.id}_[0-9a-f]{{16}}\.jpg", avatar_key), \
+        f"Key is not content-addressed: {avatar_key}"
     assert avatar_key in s3_storage_fake.storage, "Avatar file was not uploaded to Fake S3 Storage!"
     expected_url = f"http://fake-s3.local/{avatar_key}"
     actual_url = await s3_storage_fake.get_file_url(avatar_key)
@@ -409,7 +419,7 @@ async def test_profile_creation_fails_on_s3_upload_error(
 
     Steps:
     1. Create and activate a user.
-    2. Mock `s3_storage_fake.upload_file` to raise `S3FileUploadError`.
+    2. Mock `s3_storage_fake.upload_stream` to raise `S3FileUploadError`.
     3. Attempt to create a profile.
     4. Verify that the request fails with 500 Internal Server Error and no profile is created in the database.
     """
@@ -440,7 +450,7 @@ async def test_profile_creation_fails_on_s3_upload_error(
         "avatar": ("avatar.jpg", img_bytes, "image/jpeg"),
     }
 
-    with patch.object(s3_storage_fake, "upload_file", side_effect=S3FileUploadError("Simulated S3 failure")):
+    with patch.object(s3_storage_fake, "upload_stream", side_effect=S3FileUploadError("Simulated S3 failure")):
         response = await client.post(profile_url, headers=headers, files=files)
 
     assert response.status_code == 500, f"Expected 500, got {response.status_code}"
@@ -633,3 +643,201 @@ async def test_profile_creation_empty_info(client, jwt_manager, info_value):
     assert response.status_code == 422, f"Expected 422, got {response.status_code}"
     assert "Info field cannot be empty or contain only spaces." in str(response.json()), \
         f"Unexpected error message: {response.json()}"
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+async def test_get_and_update_user_profile(
+        db_session, seed_user_groups, reset_db, jwt_manager, s3_storage_fake, client
+):
+    """
+    Test reading and partially updating a profile.
+
+    Steps:
+    1. Create a user and a profile for them; verify the avatar variants were uploaded.
+    2. Read the profile back.
+    3. Update the info field and replace the avatar.
+    4. Verify that only the submitted fields changed and the new avatar was uploaded.
+    """
+    user = UserModel.create(email="test@mate.com", raw_password="TestPassword123!", group_id=1)
+    user.is_active = True
+    db_session.add(user)
+    await db_session.commit()
+    await db_session.refresh(user)
+
+    access_token = jwt_manager.create_access_token({"user_id": user.id})
+    profile_url = f"/api/v1/profiles/users/{user.id}/profile/"
+    headers = {"Authorization": f"Bearer {access_token}"}
+
+    response = await client.get(profile_url, headers=headers)
+    assert response.status_code == 404, f"Expected 404, got {response.status_code}"
+    assert response.json()["detail"] == "User profile not found."
+
+    img_bytes = BytesIO()
+    Image.new("RGB", (100, 100), color="blue").save(img_bytes, format="JPEG")
+    files = {
+        "first_name": (None, "John"),
+        "last_name": (None, "Doe"),
+        "gender": (None, "man"),
+        "date_of_birth": (None, "1990-01-01"),
+        "info": (None, "This is a test profile."),
+        "avatar": ("avatar.jpg", img_bytes.getvalue(), "image/jpeg"),
+    }
+    response = await client.post(profile_url, headers=headers, files=files)
+    assert response.status_code == 201, f"Expected 201, got {response.status_code}"
+    first_avatar_url = response.json()["avatar"]
+    first_avatar_key = first_avatar_url.removeprefix("http://fake-s3.local/")
+    thumbnail_key = first_avatar_key.replace(".jpg", "_thumbnail.jpg")
+    assert thumbnail_key in s3_storage_fake.storage, "Thumbnail was not uploaded!"
+
+    response = await client.get(profile_url, headers=headers)
+    assert response.status_code == 200, f"Expected 200, got {response.status_code}"
+    assert response.json()["first_name"] == "john", "First name does not match."
+    assert response.json()["avatar"] == first_avatar_url, "Unexpected avatar URL."
+
+    new_img_bytes = BytesIO()
+    Image.new("RGB", (2000, 1000), color="red").save(new_img_bytes, format="PNG")
+    files = {
+        "info": (None, "Updated info."),
+        "avatar": ("avatar.png", new_img_bytes.getvalue(), "image/png"),
+    }
+    response = await client.patch(profile_url, headers=headers, files=files)
+    assert response.status_code == 200, f"Expected 200, got {response.status_code}"
+    profile_data = response.json()
+    assert profile_data["info"] == "Updated info.", "Info was not updated."
+    assert profile_data["first_name"] == "john", "Fields that were not submitted must not change."
+
+    new_avatar_key = profile_data["avatar"].removeprefix("http://fake-s3.local/")
+    assert new_avatar_key != first_avatar_key, "A new avatar must get a new key."
+    assert first_avatar_key not in s3_storage_fake.storage and thumbnail_key not in s3_storage_fake.storage, \
+        "The previous avatar was not deleted."
+    with Image.open(BytesIO(s3_storage_fake.storage[new_avatar_key])) as image:
+        assert image.format == "JPEG" and image.size == (1024, 512), "New avatar was not normalized."
+
+    stmt_profile = select(UserProfileModel).where(UserProfileModel.user_id == user.id)
+    profile_in_db = (await db_session.execute(stmt_profile)).scalars().first()
+    await db_session.refresh(profile_in_db)
+    assert profile_in_db.info == "Updated info.", "Info is incorrect!"
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+async def test_user_cannot_read_another_user_profile(
+        db_session, seed_user_groups, reset_db, jwt_manager, client
+):
+    """
+    Test that a regular user cannot read another user's profile.
+    """
+    user_1 = UserModel.create(email="user1@mate.com", raw_password="User1Pass123!", group_id=1)
+    user_1.is_active = True
+    user_2 = UserModel.create(email="user2@mate.com", raw_password="User2Pass123!", group_id=1)
+    user_2.is_active = True
+    db_session.add_all([user_1, user_2])
+    await db_session.commit()
+
+    user_1_token = jwt_manager.create_access_token({"user_id": user_1.id})
+    response = await client.get(
+        f"/api/v1/profiles/users/{user_2.id}/profile/",
+        headers={"Authorization": f"Bearer {user_1_token}"}
+    )
+    assert response.status_code == 403, f"Expected 403, got {response.status_code}"
+    assert response.json()["detail"] == "You don't have permission to view this profile."
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+async def test_permission_is_checked_before_avatar_validation(
+        db_session, seed_user_groups, reset_db, jwt_manager, client
+):
+    """
+    Test that a regular user sending an invalid avatar for another user's profile gets 403 Forbidden,
+    not the avatar validation error, both on creation and on update.
+    """
+    user_1 = UserModel.create(email="user1@mate.com", raw_password="User1Pass123!", group_id=1)
+    user_1.is_active = True
+    user_2 = UserModel.create(email="user2@mate.com", raw_password="User2Pass123!", group_id=1)
+    user_2.is_active = True
+    db_session.add_all([user_1, user_2])
+    await db_session.commit()
+
+    user_1_token = jwt_manager.create_access_token({"user_id": user_1.id})
+    profile_url = f"/api/v1/profiles/users/{user_2.id}/profile/"
+    headers = {"Authorization": f"Bearer {user_1_token}"}
+    avatar = ("avatar.gif", b"fake_image", "image/gif")
+
+    files = {
+        "first_name": (None, "John"),
+        "last_name": (None, "Doe"),
+        "gender": (None, "man"),
+        "date_of_birth": (None, "1990-01-01"),
+        "info": (None, "Attempting unauthorized profile creation."),
+        "avatar": avatar,
+    }
+    response = await client.post(profile_url, headers=headers, files=files)
+    assert response.status_code == 403, f"Expected 403, got {response.status_code}"
+    assert response.json()["detail"] == "You don't have permission to edit this profile."
+
+    response = await client.patch(profile_url, headers=headers, files={"avatar": avatar})
+    assert response.status_code == 403, f"Expected 403, got {response.status_code}"
+    assert response.json()["detail"] == "You don't have permission to edit this profile."
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+async def test_direct_avatar_upload(
+        db_session, seed_user_groups, reset_db, jwt_manager, s3_storage_fake, client
+):
+    """
+    Test replacing an avatar through a presigned direct upload.
+
+    Steps:
+    1. Create a user with a profile and an avatar uploaded through the API.
+    2. Request a presigned upload and store a file under the returned key, as the client would.
+    3. Confirm the upload and verify that the profile points at the new avatar and the old one is deleted.
+    4. Verify that an oversized upload is rejected and deleted.
+    """
+    user = UserModel.create(email="test@mate.com", raw_password="TestPassword123!", group_id=1)
+    user.is_active = True
+    db_session.add(user)
+    await db_session.commit()
+    await db_session.refresh(user)
+    db_session.add(UserProfileModel(user_id=user.id, first_name="john", avatar=f"avatars/{user.id}_avatar.jpg"))
+    await db_session.commit()
+    s3_storage_fake.storage[f"avatars/{user.id}_avatar.jpg"] = b"old"
+    s3_storage_fake.storage[f"avatars/{user.id}_avatar_thumbnail.jpg"] = b"old"
+
+    access_token = jwt_manager.create_access_token({"user_id": user.id})
+    headers = {"Authorization": f"Bearer {access_token}"}
+    avatar_url = f"/api/v1/profiles/users/{user.id}/profile/avatar"
+
+    response = await client.post(f"{avatar_url}/upload/", headers=headers, json={"content_type": "image/png"})
+    assert response.status_code == 200, f"Expected 200, got {response.status_code}"
+    upload = response.json()
+    assert upload["method"] == "POST" and upload["fields"]["key"] == upload["key"], "Unexpected upload form."
+    assert upload["key"].startswith(f"avatars/uploads/{user.id}/") and upload["key"].endswith(".png")
+
+    async def chunks(data):
+        yield data
+
+    await s3_storage_fake.upload_stream(upload["key"], chunks(b"png-bytes"), content_type="image/png")
+    response = await client.post(f"{avatar_url}/confirm/", headers=headers, json={"key": upload["key"]})
+    assert response.status_code == 200, f"Expected 200, got {response.status_code}"
+    assert response.json()["avatar"] == f"http://fake-s3.local/{upload['key']}", "Avatar URL does not match."
+    assert set(s3_storage_fake.storage) == {upload["key"]}, "The previous avatar variants were not deleted."
+
+    response = await client.post(f"{avatar_url}/confirm/", headers=headers, json={"key": "avatars/2_avatar.jpg"})
+    assert response.status_code == 422, f"Expected 422, got {response.status_code}"
+    assert response.json()["detail"] == "Invalid avatar key."
+
+    response = await client.post(f"{avatar_url}/upload/", headers=headers, json={"content_type": "image/jpeg"})
+    large_key = response.json()["key"]
+    await s3_storage_fake.upload_stream(large_key, chunks(b"x" * (1024 * 1024 + 1)), content_type="image/jpeg")
+    response = await client.post(f"{avatar_url}/confirm/", headers=headers, json={"key": large_key})
+    assert response.status_code == 422, f"Expected 422, got {response.status_code}"
+    assert "Image size exceeds 1 MB" in str(response.json()), f"Unexpected error message: {response.json()}"
+    assert large_key not in s3_storage_fake.storage, "The rejected avatar was not deleted."
+
+    stmt_profile = select(UserProfileModel).where(UserProfileModel.user_id == user.id)
+    profile_in_db = (await db_session.execute(stmt_profile)).scalars().first()
+    await db_session.refresh(profile_in_db)
+    assert profile_in_db.avatar == upload["key"], "Avatar key in database does not match!"
@@ -0,0 +1,250 @@
+import hashlib
+from io import BytesIO
+
+import aiohttp
+import pytest
+import pytest_asyncio
+from PIL import Image
+
+from exceptions import S3FileUploadError
+from storages import AvatarPipeline, IMMUTABLE_CACHE_CONTROL, S3StorageClient, detect_content_type
+
+
+@pytest_asyncio.fixture(scope="function", loop_scope="function")
+async def s3_storage(s3_server_fake):
+    """
+    Provide an S3 storage client connected to the fake S3 server.
+    """
+    storage = S3StorageClient(
+        endpoint_url=s3_server_fake.endpoint_url,
+        access_key="access_key",
+        secret_key="secret_key",
+        bucket_name="theater-storage",
+        max_pool_connections=2
+    )
+    await storage.open()
+    yield storage
+    await storage.close()
+
+
+@pytest.mark.asyncio
+async def test_s3_storage_client_reuses_connection(s3_storage, s3_server_fake):
+    """
+    Test that consecutive uploads go through one long-lived client and one pooled connection.
+    """
+    for i in range(3):
+        await s3_storage.upload_file(f"avatars/{i}_avatar.jpg", f"image {i}".encode())
+
+    assert s3_server_fake.objects == {
+        f"theater-storage/avatars/{i}_avatar.jpg": f"image {i}".encode() for i in range(3)
+    }, "Uploaded objects do not match."
+    assert s3_server_fake.content_types["theater-storage/avatars/0_avatar.jpg"] == "image/jpeg", \
+        "Unexpected content type."
+    assert len(s3_server_fake.connections) == 1, \
+        f"Expected one reused connection, got {len(s3_server_fake.connections)}."
+    assert await s3_storage.get_file_url("avatars/0_avatar.jpg") == \
+        f"{s3_server_fake.endpoint_url}/theater-storage/avatars/0_avatar.jpg", "Unexpected file URL."
+
+
+@pytest.mark.asyncio
+async def test_s3_storage_client_reopens_after_close(s3_storage, s3_server_fake):
+    """
+    Test that the client can be closed and is recreated on the next upload.
+    """
+    await s3_storage.upload_file("avatars/1_avatar.jpg", b"first")
+    await s3_storage.close()
+    await s3_storage.upload_file("avatars/1_avatar.jpg", b"second")
+
+    assert s3_server_fake.objects["theater-storage/avatars/1_avatar.jpg"] == b"second", "Upload after reopen failed."
+    assert len(s3_server_fake.connections) == 2, "Closing must drop the pooled connection."
+
+
+@pytest.mark.asyncio
+async def test_s3_storage_client_wraps_client_errors(s3_storage, s3_server_fake):
+    """
+    Test that an S3 error response such as AccessDenied is raised as an upload error, not a raw ClientError.
+    """
+    s3_server_fake.deny_access = True
+
+    with pytest.raises(S3FileUploadError, match="AccessDenied"):
+        await s3_storage.upload_file("avatars/1_avatar.jpg", b"denied")
+    assert s3_server_fake.objects == {}, "A denied upload must not be stored."
+
+
+async def _chunks(data: bytes, chunk_size: int):
+    for start in range(0, len(data), chunk_size):
+        yield data[start:start + chunk_size]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "size, expected_parts",
+    [
+        (1024, 0),
+        (6 * 1024 * 1024, 0),
+        (12 * 1024 * 1024 + 3, 3),
+    ]
+)
+async def test_s3_storage_client_upload_stream(s3_server_fake, size, expected_parts):
+    """
+    Test that small streams are sent with a single PUT and large ones as a multipart upload.
+    """
+    storage = S3StorageClient(
+        endpoint_url=s3_server_fake.endpoint_url,
+        access_key="access_key",
+        secret_key="secret_key",
+        bucket_name="theater-storage",
+        multipart_threshold=6 * 1024 * 1024,
+        multipart_part_size=5 * 1024 * 1024
+    )
+    data = bytes(range(256)) * (size // 256) + b"x" * (size % 256)
+    try:
+        await storage.upload_stream("media/file.bin", _chunks(data, 64 * 1024), size_hint=size)
+    finally:
+        await storage.close()
+
+    key = "theater-storage/media/file.bin"
+    assert s3_server_fake.objects[key] == data, "Uploaded object does not match the stream."
+    assert s3_server_fake.completed_parts.get(key, 0) == expected_parts, "Unexpected number of parts."
+    assert s3_server_fake.content_types[key] == "application/octet-stream", "Unexpected content type."
+
+
+@pytest.mark.asyncio
+async def test_s3_storage_client_upload_stream_aborts_on_error(s3_storage, s3_server_fake):
+    """
+    Test that a multipart upload is aborted when the stream fails midway.
+    """
+    async def failing_chunks():
+        yield b"x" * (9 * 1024 * 1024)
+        raise RuntimeError("client disconnected")
+
+    with pytest.raises(RuntimeError):
+        await s3_storage.upload_stream("media/broken.bin", failing_chunks())
+
+    assert "theater-storage/media/broken.bin" not in s3_server_fake.objects, "Aborted upload must not be stored."
+    assert len(s3_server_fake.aborted) == 1 and not s3_server_fake.uploads, "Multipart upload was not aborted."
+
+
+def _encode_image(size, image_format="JPEG", mode="RGB") -> bytes:
+    output = BytesIO()
+    Image.new(mode, size, color=1 if mode == "1" else "blue").save(output, format=image_format)
+    return output.getvalue()
+
+
+@pytest.mark.asyncio
+async def test_avatar_pipeline_stores_normalized_variants(s3_storage_fake):
+    """
+    Test that the avatar pipeline re-encodes a PNG avatar as JPEG variants of the configured sizes.
+    """
+    pipeline = AvatarPipeline(variants=(("full", 256), ("thumbnail", 64)))
+    contents = _encode_image((800, 400), image_format="PNG")
+    try:
+        await pipeline.validate(contents)
+        keys = await pipeline.store(s3_storage_fake, "avatars/1_", contents)
+        assert await pipeline.store(s3_storage_fake, "avatars/1_", contents) == keys, \
+            "The same avatar must get the same keys."
+    finally:
+        pipeline.shutdown()
+
+    digest = hashlib.sha256(s3_storage_fake.storage[keys["full"]]).hexdigest()[:16]
+    assert keys == {"full": f"avatars/1_{digest}.jpg", "thumbnail": f"avatars/1_{digest}_thumbnail.jpg"}, \
+        f"Unexpected variant keys: {keys}"
+    for key, expected_size in ((keys["full"], (256, 128)), (keys["thumbnail"], (64, 32))):
+        assert s3_storage_fake.cache_controls[key] == IMMUTABLE_CACHE_CONTROL, f"{key} is not cacheable."
+        with Image.open(BytesIO(s3_storage_fake.storage[key])) as image:
+            assert image.format == "JPEG", f"{key} was not re-encoded as JPEG."
+            assert image.size == expected_size, f"{key} has size {image.size}, expected {expected_size}."
+
+
+@pytest.mark.asyncio
+async def test_avatar_pipeline_rejects_decompression_bomb(s3_storage_fake):
+    """
+    Test that an image whose dimensions exceed the pixel limit is rejected before it is decoded.
+    """
+    pipeline = AvatarPipeline(max_pixels=1000 * 1000)
+    contents = _encode_image((5000, 5000), image_format="PNG", mode="1")
+    assert len(contents) < 1024 * 1024, "The test image must be small on disk."
+    try:
+        with pytest.raises(ValueError, match="exceed the limit of 1000000 pixels"):
+            await pipeline.validate(contents)
+        with pytest.raises(ValueError, match="exceed the limit"):
+            await pipeline.store(s3_storage_fake, "avatars/1_", contents)
+    finally:
+        pipeline.shutdown()
+
+    assert not s3_storage_fake.storage, "Nothing must be uploaded for a rejected avatar."
+
+
+@pytest.mark.asyncio
+async def test_s3_storage_client_presigned_uploads(s3_storage, s3_server_fake):
+    """
+    Test that a client can upload with a presigned PUT URL and that the metadata is read back without a download.
+    """
+    url = await s3_storage.generate_presigned_put_url("avatars/uploads/1/abc.png", "image/png", 300)
+    assert url.startswith(f"{s3_server_fake.endpoint_url}/theater-storage/avatars/uploads/1/abc.png?"), \
+        f"Unexpected presigned URL: {url}"
+    assert "X-Amz-Signature=" in url and "X-Amz-Expires=300" in url, "URL is not presigned with SigV4."
+
+    async with aiohttp.ClientSession() as session:
+        async with session.put(url, data=b"png-bytes", headers={"Content-Type": "image/png"}) as response:
+            assert response.status == 200, f"Presigned PUT failed with {response.status}."
+
+    assert await s3_storage.get_file_metadata("avatars/uploads/1/abc.png") == {
+        "size": len(b"png-bytes"), "content_type": "image/png"
+    }, "Unexpected metadata."
+    assert await s3_storage.get_file_metadata("avatars/uploads/1/missing.png") is None, \
+        "Missing files must have no metadata."
+
+    form = await s3_storage.generate_presigned_post("avatars/uploads/1/def.jpg", "image/jpeg", 1024, 300)
+    assert form["url"] == f"{s3_server_fake.endpoint_url}/theater-storage", f"Unexpected form URL: {form['url']}"
+    assert form["fields"]["key"] == "avatars/uploads/1/def.jpg", "Form must carry the key."
+    assert {"policy", "x-amz-signature", "Content-Type"} <= set(form["fields"]), "Form is not presigned."
+
+    await s3_storage.delete_file("avatars/uploads/1/abc.png")
+    assert "theater-storage/avatars/uploads/1/abc.png" not in s3_server_fake.objects, "File was not deleted."
+
+
+@pytest.mark.parametrize(
+    "file_name, file_data, expected",
+    [
+        ("avatar.jpg", b"\x89PNG\r\n\x1a\n....", "image/png"),
+        ("avatar", b"\xff\xd8\xff\xe0....", "image/jpeg"),
+        ("avatar.webp", b"RIFF\x00\x00\x00\x00WEBPVP8 ", "image/webp"),
+        ("notes.txt", b"hello", "text/plain"),
+        ("blob", b"hello", "application/octet-stream"),
+    ]
+)
+def test_detect_content_type(file_name, file_data, expected):
+    """
+    Test that the content type is detected from the leading bytes before the file extension.
+    """
+    assert detect_content_type(file_name, file_data) == expected
+
+
+@pytest.mark.asyncio
+async def test_s3_storage_client_memoizes_presigned_get_urls(s3_server_fake):
+    """
+    Test that presigned GET URLs are signed once per file and that uploads carry the cache headers.
+    """
+    storage = S3StorageClient(
+        endpoint_url=s3_server_fake.endpoint_url,
+        access_key="access_key",
+        secret_key="secret_key",
+        bucket_name="theater-storage",
+        presigned_get_expires_in=600
+    )
+    try:
+        await storage.upload_file("avatars/1_abc.png", b"\x89PNG\r\n\x1a\n", cache_control=IMMUTABLE_CACHE_CONTROL)
+        first_url = await storage.get_file_url("avatars/1_abc.png")
+        second_url = await storage.get_file_url("avatars/1_abc.png")
+        other_url = await storage.get_file_url("avatars/2_abc.png")
+    finally:
+        await storage.close()
+
+    assert "X-Amz-Signature=" in first_url and "X-Amz-Expires=600" in first_url, "URL is not presigned."
+    assert second_url is first_url, "The presigned URL must be memoized."
+    assert other_url != first_url, "Every file needs its own signature."
+    assert s3_server_fake.content_types["theater-storage/avatars/1_abc.png"] == "image/png", \
+        "Content type was not detected."
+    assert s3_server_fake.cache_controls["theater-storage/avatars/1_abc.png"] == IMMUTABLE_CACHE_CONTROL, \
+        "Cache-Control was not stored."